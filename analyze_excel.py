@@ -1,22 +1,33 @@
 import pandas as pd
 import sys
 
-try:
-    xls = pd.ExcelFile('주간회의록.xlsx')
-    print('시트 목록:', xls.sheet_names)
-    print('\n' + '='*50)
+from weekly_report import parallel
+
+
+def main():
+    try:
+        excel_path = '주간회의록.xlsx'
+        # 사이드카(Arrow)가 최신이면 엑셀을 다시 파싱하지 않고, 아니면 시트별로 프로세스 풀에서 동시에 변환
+        frames = parallel.read_workbooks([excel_path])[excel_path]
+        sheet_names = list(frames)
+        print('시트 목록:', sheet_names)
+        print('\n' + '='*50)
     
-    for sheet in xls.sheet_names:
-        df = pd.read_excel(xls, sheet_name=sheet)
-        print(f'\n시트명: {sheet}')
-        print(f'행 수: {len(df)}, 열 수: {len(df.columns)}')
-        print(f'컬럼명: {list(df.columns)}')
-        print(f'\n첫 5행 데이터:')
-        print(df.head().to_string())
-        print('\n' + '-'*50)
+        for sheet in sheet_names:
+            df = frames[sheet]
+            print(f'\n시트명: {sheet}')
+            print(f'행 수: {len(df)}, 열 수: {len(df.columns)}')
+            print(f'컬럼명: {list(df.columns)}')
+            print(f'\n첫 5행 데이터:')
+            print(df.head().to_string())
+            print('\n' + '-'*50)
         
-except Exception as e:
-    print(f'에러 발생: {e}')
-    import traceback
-    traceback.print_exc()
+    except Exception as e:
+        print(f'에러 발생: {e}')
+        import traceback
+        traceback.print_exc()
+
 
+# 병렬 적재 작업 프로세스가 이 스크립트를 다시 import해도 실행되지 않도록 보호
+if __name__ == '__main__':
+    main()
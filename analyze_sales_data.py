@@ -1,17 +1,21 @@
 import pandas as pd
 import sys
 
+from weekly_report import sidecar
+
 try:
-    xls = pd.ExcelFile('2025 정산서 기준 판매 데이터.xlsx')
+    excel_path = '2025 정산서 기준 판매 데이터.xlsx'
+    # 사이드카(Arrow)가 최신이면 엑셀을 다시 파싱하지 않음
+    sheet_names = sidecar.sheet_names(excel_path)
     print('='*60)
-    print('시트 목록:', xls.sheet_names)
+    print('시트 목록:', sheet_names)
     print('='*60)
     
-    for sheet in xls.sheet_names:
+    for sheet in sheet_names:
         print(f'\n{"="*60}')
         print(f'시트명: {sheet}')
         print(f'{"="*60}')
-        df = pd.read_excel(xls, sheet_name=sheet)
+        df = sidecar.read_sheet(excel_path, sheet)
         print(f'행 수: {len(df)}, 열 수: {len(df.columns)}')
         print(f'\n컬럼명:')
         for i, col in enumerate(df.columns, 1):
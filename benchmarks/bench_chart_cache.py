@@ -0,0 +1,89 @@
+"""
+차트 Figure 캐시 벤치마크
+
+Streamlit AppTest로 대시보드를 한 번 실행해 캐시를 채운 뒤, 차트 입력과 관계없는 위젯 조작
+(상세 데이터 검색어 입력, 상품 검색어 입력)과 차트 입력이 바뀌는 조작(분류 기준 변경)마다
+- 재실행 시간
+- Plotly Express로 새로 만든 Figure 수
+를 출력합니다. 변경 전 스크립트를 인자로 넘기면 같은 조건에서 비교할 수 있습니다.
+
+실행:
+    python benchmarks/bench_chart_cache.py [대시보드 스크립트]
+"""
+
+import logging
+import os
+import sys
+import time
+import warnings
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import plotly.express as px
+from streamlit.testing.v1 import AppTest
+
+DASHBOARD_SCRIPT = os.path.join(ROOT, 'dashboard_prototype.py')
+# 대시보드에서 사용하는 Plotly Express 함수
+CHART_FUNCTIONS = ('bar', 'line', 'pie')
+
+
+def count_builds(at):
+    """재실행 한 번의 (소요 시간, Plotly Express 호출 수)"""
+    calls = []
+    originals = {name: getattr(px, name) for name in CHART_FUNCTIONS}
+
+    def counted(func):
+        def wrapper(*args, **kwargs):
+            calls.append(func.__name__)
+            return func(*args, **kwargs)
+        return wrapper
+
+    for name, func in originals.items():
+        setattr(px, name, counted(func))
+    try:
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+    finally:
+        for name, func in originals.items():
+            setattr(px, name, func)
+    assert not at.exception, at.exception
+    return elapsed, len(calls)
+
+
+def main():
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.CRITICAL)
+    script = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else DASHBOARD_SCRIPT)
+    os.chdir(ROOT)
+
+    at = AppTest.from_file(script, default_timeout=600)
+    at.run()
+    assert not at.exception, at.exception
+    print(f"스크립트: {os.path.basename(script)} / 시트: {at.selectbox[0].value}")
+
+    def search_detail():
+        at.text_input[0].set_value('쿠팡')
+
+    def search_product():
+        next(widget for widget in at.text_input if widget.key == 'search_product').set_value('복숭아')
+
+    def change_category():
+        category = next(widget for widget in at.selectbox if widget.key == 'category_select')
+        category.set_value(category.options[-1])
+
+    steps = [
+        ('같은 화면 다시 그리기', lambda: None),
+        ('상세 데이터 검색', search_detail),
+        ('상품 검색', search_product),
+        ('분류 기준 변경', change_category),
+    ]
+    for name, action in steps:
+        action()
+        elapsed, builds = count_builds(at)
+        print(f"{name:<16} {elapsed:6.2f} s   Figure 생성 {builds}개")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+카테고리 / int32 변환 벤치마크
+
+주간 회의록 시트를 weekly_report.compact.compact_frame으로 변환했을 때의 컬럼별 메모리 사용량과,
+파트 판별(1파트 문자열 조건)과 플랫폼별 groupby를 문자열 컬럼 / 카테고리 코드로 실행한 시간을 비교합니다.
+
+실행:
+    python benchmarks/bench_compact_dtypes.py [엑셀 파일] [시트명]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from weekly_report import cache as workbook_cache
+from weekly_report import compact
+from weekly_report.prepare import add_part_column
+
+WEEKLY_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '주간회의록.xlsx')
+REPEAT = 20
+
+
+def part1_condition(values):
+    return (
+        (values == '1파트') |
+        (values == '1') |
+        values.str.contains('1파트', na=False, regex=False, case=False) |
+        values.str.contains('part1', na=False, regex=False, case=False)
+    )
+
+
+def timed(func):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func()
+    return (time.perf_counter() - start) / REPEAT * 1000, result
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else WEEKLY_DATA_PATH
+    sheet = sys.argv[2] if len(sys.argv) > 2 else workbook_cache.sheet_names(path)[0]
+    df = add_part_column(workbook_cache.read_sheet(path, sheet))
+    compacted = compact.compact_frame(df)
+    print(f"파일: {os.path.basename(path)} / {sheet} ({len(df):,}행)")
+
+    report = compact.memory_report(compacted)
+    print(report.to_string(index=False, float_format=lambda value: f"{value:,.1f}"))
+    total = report.iloc[-1]
+    print(f"메모리 절감: {total['변환 전 (KB)'] - total['변환 후 (KB)']:,.1f} KB "
+          f"({(1 - total['변환 후 (KB)'] / total['변환 전 (KB)']) * 100:.1f}%)")
+
+    print()
+    string_ms, string_mask = timed(lambda: part1_condition(df['파트'].astype(str).str.strip()))
+    code_ms, code_mask = timed(lambda: compact.category_mask(compact.strip_values(compacted['파트']), part1_condition))
+    assert (string_mask.to_numpy() == code_mask.to_numpy()).all()
+    print(f"1파트 판별   문자열 {string_ms:7.2f} ms | 카테고리 코드 {code_ms:7.2f} ms")
+
+    platform = df.columns[0]
+    amount = df.columns[13]
+    string_ms, string_sums = timed(lambda: df.groupby(platform)[amount].sum())
+    code_ms, code_sums = timed(lambda: compacted.groupby(platform)[amount].sum())
+    assert list(string_sums.index) == list(code_sums.index) and (string_sums.to_numpy() == code_sums.to_numpy()).all()
+    print(f"{platform}별 합계 문자열 {string_ms:7.2f} ms | 카테고리 코드 {code_ms:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
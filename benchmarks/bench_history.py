@@ -0,0 +1,59 @@
+"""
+회의록 버전 이력 저장소 벤치마크
+
+주간회의록.xlsx와 폴더의 스냅샷 파일(27F16B40 등) 전체를
+- 버전마다 워크북을 파싱해 모든 시트를 읽는 시간
+- 이력 저장소(weekly_report.history)에 처음 저장하는 시간과 저장 크기
+- 이력 저장소에서 모든 버전의 모든 시트를 읽는 시간 (새 프로세스 기준, 행 풀 캐시 없음)
+으로 비교합니다. 저장소는 임시 폴더에 만듭니다.
+
+실행:
+    python benchmarks/bench_history.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from weekly_report import history, streaming
+
+
+def main():
+    warnings.filterwarnings('ignore')
+    os.chdir(ROOT)
+    paths = [history.WORKBOOK_PATH] + history.find_snapshots()
+    source_bytes = sum(os.path.getsize(path) for path in paths)
+    print(f"버전 {len(paths)}개, 원본 {source_bytes / 1024:,.0f} KB")
+
+    start = time.perf_counter()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for _ in streaming.iter_sheets(f):
+                pass
+    print(f"워크북 파싱        {time.perf_counter() - start:7.2f} s")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = history.HistoryStore(tmp_dir)
+        start = time.perf_counter()
+        for path in paths:
+            store.ingest(path)
+        stats = store.stats()
+        print(f"이력 저장          {time.perf_counter() - start:7.2f} s   "
+              f"저장 크기 {stats['disk_bytes'] / 1024:,.0f} KB, 행 {stats['rows']:,} → {stats['stored_rows']:,}")
+
+        history.pool_cache.clear()
+        store = history.HistoryStore(tmp_dir)
+        start = time.perf_counter()
+        for version in store.versions():
+            for sheet in store.sheet_names(version['id']):
+                store.read_sheet(version['id'], sheet)
+        print(f"이력에서 읽기      {time.perf_counter() - start:7.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+상품코드 → 제조사 매핑 벤치마크
+
+기존 대시보드의 상품코드별 반복 + value_counts 방식과
+weekly_report.aggregations.mode_per_key(groupby 한 번)를 2025 정산서 데이터로 비교합니다.
+
+실행:
+    python benchmarks/bench_manufacturer_mapping.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from weekly_report import cache as workbook_cache
+from weekly_report.aggregations import mode_per_key
+
+SALES_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2025 정산서 기준 판매 데이터.xlsx')
+
+
+def legacy_mapping(sales_df, product_col, company_col):
+    """기존 대시보드 방식 (상품코드마다 전체 프레임 마스킹)"""
+    manufacturer_mapping = {}
+    for product_code in sales_df[product_col].unique():
+        product_rows = sales_df[sales_df[product_col] == product_code]
+        if len(product_rows) > 0:
+            company_counts = product_rows[company_col].value_counts()
+            if len(company_counts) > 0:
+                manufacturer_mapping[product_code] = company_counts.index[0]
+    return manufacturer_mapping
+
+
+def best_of(func, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    sheet = workbook_cache.sheet_names(SALES_DATA_PATH)[0]
+    sales_df = workbook_cache.read_sheet(SALES_DATA_PATH, sheet)
+    product_col, company_col = '상품코드', '제조사'
+    print(f"데이터: {sheet} ({len(sales_df):,}행, 상품 {sales_df[product_col].nunique():,}개)")
+
+    legacy_time, legacy = best_of(lambda: legacy_mapping(sales_df, product_col, company_col), 3)
+    new_time, new = best_of(lambda: mode_per_key(sales_df, product_col, company_col), 20)
+
+    assert new == legacy, "매핑 결과가 기존 방식과 다릅니다."
+    print(f"기존 반복 방식: {legacy_time * 1000:,.1f} ms")
+    print(f"mode_per_key : {new_time * 1000:,.1f} ms")
+    print(f"속도 향상     : {legacy_time / new_time:,.0f}배 (결과 동일, {len(new):,}개 상품)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+시트/워크북 병렬 적재 벤치마크
+
+주간 회의록 + 정산서 워크북의 모든 시트를 사이드카로 변환하는 시간을
+시트별 순차 변환(sidecar.ingest)과 프로세스 풀 병렬 변환(parallel.ingest_workbooks, 작업 프로세스 수별)으로 비교합니다.
+원본 옆 사이드카를 건드리지 않도록 임시 폴더에 복사해서 측정합니다.
+
+실행:
+    python benchmarks/bench_parallel_loading.py [엑셀 파일 ...]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from weekly_report import parallel, sidecar
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DEFAULT_PATHS = [
+    os.path.join(ROOT, '주간회의록.xlsx'),
+    os.path.join(ROOT, '2025 정산서 기준 판매 데이터.xlsx'),
+]
+
+
+def measure(paths, func):
+    for path in paths:
+        shutil.rmtree(sidecar.sidecar_dir(path), ignore_errors=True)
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    sources = sys.argv[1:] or DEFAULT_PATHS
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for source in sources:
+            paths.append(shutil.copy(source, tmp_dir))
+        sheet_count = sum(len(parallel._sheet_names(path)) for path in paths)
+        print(f"파일 {len(paths)}개, 시트 {sheet_count}개, CPU {parallel.default_workers()}개")
+
+        serial = measure(paths, lambda: [sidecar.ingest(path) for path in paths])
+        print(f"{'순차 변환':<16} {serial:6.2f} s")
+        limit = min(sheet_count, parallel.default_workers())
+        for workers in sorted(count for count in {1, 2, 4, 8, limit} if count <= limit):
+            elapsed = measure(paths, lambda: parallel.ingest_workbooks(paths, max_workers=workers))
+            print(f"{f'병렬 변환 ({workers}개)':<16} {elapsed:6.2f} s  (x{serial / elapsed:.2f})")
+
+
+if __name__ == '__main__':
+    main()
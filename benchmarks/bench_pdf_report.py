@@ -0,0 +1,53 @@
+"""
+월말 PDF 보고서 생성 벤치마크
+
+주간회의록.xlsx 11월 시트 + 정산서로
+- 보고 표 계산 (weekly_report.report.build_report)
+- 차트 렌더링: 현재 프로세스에서 차례로 vs 작업 프로세스 풀 (weekly_report.pdf.render_charts)
+- PDF 전체 생성 (차트 렌더링 + 문서 작성)
+시간을 비교합니다. PDF는 임시 폴더에 만듭니다.
+
+실행:
+    python benchmarks/bench_pdf_report.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from weekly_report import parallel, pdf, report
+
+MONTH = 11
+
+
+def main():
+    warnings.filterwarnings('ignore')
+    os.chdir(ROOT)
+    start = time.perf_counter()
+    result = report.build_report(report.WEEKLY_DATA_PATH, MONTH, report.SALES_DATA_PATH)
+    print(f"보고 표 계산        {time.perf_counter() - start:7.2f} s")
+
+    specs = pdf.chart_specs(result['tables'])
+    pdf.render_charts(specs, max_workers=1)  # 글꼴 캐시 등 첫 실행 비용 제외
+    start = time.perf_counter()
+    pdf.render_charts(specs, max_workers=1)
+    print(f"차트 {len(specs)}개 (1 프로세스) {time.perf_counter() - start:7.2f} s")
+    workers = parallel.default_workers()
+    start = time.perf_counter()
+    pdf.render_charts(specs)
+    print(f"차트 {len(specs)}개 ({workers} 프로세스) {time.perf_counter() - start:7.2f} s")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'report.pdf')
+        start = time.perf_counter()
+        pdf.write_pdf(result, path)
+        print(f"PDF 생성            {time.perf_counter() - start:7.2f} s   {os.path.getsize(path) / 1024:,.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
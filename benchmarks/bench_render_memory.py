@@ -0,0 +1,128 @@
+"""
+대시보드 화면 한 번 그리기(재실행)의 메모리 할당 벤치마크
+
+Streamlit AppTest로 대시보드를 한 번 실행해 캐시를 채운 뒤, 같은 화면을 다시 그리는 동안
+- 시트 전체 크기 DataFrame을 새로 할당한 횟수와 위치
+  (공유 캐시의 시트 DataFrame과 행/컬럼 수가 절반 이상이고, 버퍼의 절반 이상을 새로 할당한 DataFrame)
+- 최대 할당량 (tracemalloc 최고치, 시트 적재 시점부터 측정, Arrow 문자열 버퍼는 집계되지 않음)
+- 세션 메모리 (공유 데이터와 버퍼를 같이 쓰지 않는 세션 고유 메모리, weekly_report.store)
+를 출력합니다. 변경 전 스크립트를 인자로 넘기면 같은 조건에서 비교할 수 있습니다.
+복사 없는 참조(cache.detach, store.select_rows)는 Copy-on-Write가 켜져 있어야 성립하므로 그 상태도 함께 출력합니다
+(pandas 2.x는 weekly_report import 시 켬, 꺼져 있으면 시트 크기 DataFrame을 재실행마다 여러 번 복사).
+
+실행:
+    python benchmarks/bench_render_memory.py [대시보드 스크립트]
+"""
+
+import logging
+import os
+import sys
+import traceback
+import tracemalloc
+import warnings
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from weekly_report import incremental, store
+from weekly_report.cache import _copy_on_write_enabled
+
+DASHBOARD_SCRIPT = os.path.join(ROOT, 'dashboard_prototype.py')
+# 원본 시트 대비 이 비율 이상의 행/컬럼 수면 시트 전체 크기 DataFrame으로 봄
+FULL_SIZE_RATIO = 0.5
+
+
+def _is_full_size(df, sources):
+    return any(
+        len(df) >= FULL_SIZE_RATIO * len(source) and df.shape[1] >= FULL_SIZE_RATIO * source.shape[1]
+        for source in sources
+    )
+
+
+def full_size_allocations(at, script):
+    """재실행 중 새로 만든 시트 크기 DataFrame 목록 [(shape, 새로 할당한 바이트, 스크립트 줄)]
+
+    pandas 연산 결과 DataFrame은 __finalize__를 거치므로 여기서 만들어진 DataFrame을 모아
+    공유 데이터 및 먼저 만든 DataFrame과 같은 버퍼를 쓰지 않는 바이트를 셉니다.
+    """
+    sources = [obj for obj in store.shared_objects() if isinstance(obj, pd.DataFrame) and len(obj) > 0]
+    created = []
+    finalize = pd.DataFrame.__finalize__
+
+    def hook(self, other, method=None, **kwargs):
+        result = finalize(self, other, method=method, **kwargs)
+        if isinstance(result, pd.DataFrame) and _is_full_size(result, sources):
+            lines = [frame for frame in traceback.extract_stack() if frame.filename == script]
+            created.append((result, lines[-1].lineno if lines else None))
+        return result
+
+    pd.DataFrame.__finalize__ = hook
+    try:
+        at.run()
+    finally:
+        pd.DataFrame.__finalize__ = finalize
+
+    shared = store._BufferRanges(buffer for obj in store.shared_objects() for buffer in store._buffers(obj))
+    seen = set()
+    allocations = []
+    for df, lineno in created:
+        new = 0
+        for start, size in store._buffers(df):
+            if size > 0 and start not in seen and not shared.contains(start, size):
+                seen.add(start)
+                new += size
+        if new >= FULL_SIZE_RATIO * df.memory_usage(index=False).sum():
+            allocations.append((df.shape, new, lineno))
+    return allocations
+
+
+def render_peak(at):
+    """한 번 다시 그리는 동안(시트 적재부터)의 최대 할당량 (바이트)"""
+    ingest_sheet = incremental.ingest_sheet
+
+    def reset_peak(*args, **kwargs):
+        # 스크립트 컴파일 등 데이터와 관계없는 할당은 빼고 측정
+        tracemalloc.reset_peak()
+        return ingest_sheet(*args, **kwargs)
+
+    incremental.ingest_sheet = reset_peak
+    tracemalloc.start()
+    try:
+        at.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        incremental.ingest_sheet = ingest_sheet
+    return peak
+
+
+def main():
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.CRITICAL)
+    script = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else DASHBOARD_SCRIPT)
+    os.chdir(ROOT)
+
+    at = AppTest.from_file(script, default_timeout=600)
+    at.run()
+    assert not at.exception, at.exception
+    print(f"스크립트: {os.path.basename(script)} / 시트: {at.selectbox[0].value}")
+    print(f"pandas {pd.__version__} / Copy-on-Write: {'켜짐' if _copy_on_write_enabled() else '꺼짐'}")
+
+    allocations = full_size_allocations(at, script)
+    print(f"시트 크기 DataFrame 할당: {len(allocations)}개")
+    for shape, size, lineno in allocations:
+        print(f"  {lineno}행: {shape[0]:,}행 x {shape[1]}컬럼, {size / 1024:,.0f} KB")
+
+    peak = render_peak(at)
+    print(f"재실행 최대 할당: {peak / 1024:,.0f} KB")
+
+    for caption in at.sidebar.caption:
+        if '세션 메모리' in caption.value:
+            print(caption.value.lstrip('💾 '))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+상세 데이터 검색 벤치마크
+
+기존 대시보드의 전체 컬럼 문자열 변환 + str.contains 방식과
+weekly_report.search.SearchIndex(bigram 역색인) 검색을 주간 회의록 시트로 비교합니다.
+
+실행:
+    python benchmarks/bench_search.py [검색어 ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from weekly_report import cache as workbook_cache
+from weekly_report.search import SearchIndex
+
+WEEKLY_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '주간회의록.xlsx')
+DEFAULT_TERMS = ['쿠팡', '맹', '2025-11', '00', '없는검색어']
+
+
+def legacy_search(df, term):
+    """기존 대시보드 방식 (키 입력마다 전체 프레임 문자열 변환 + 컬럼별 검색)"""
+    mask = df.astype(str).apply(lambda x: x.str.contains(term, case=False, na=False, regex=False)).any(axis=1)
+    return np.flatnonzero(mask.to_numpy())
+
+
+def best_of(func, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    terms = sys.argv[1:] or DEFAULT_TERMS
+    sheet = workbook_cache.sheet_names(WEEKLY_DATA_PATH)[0]
+    df = workbook_cache.read_sheet(WEEKLY_DATA_PATH, sheet)
+    print(f"데이터: {sheet} ({len(df):,}행, {len(df.columns)}개 컬럼)")
+
+    build_time, index = best_of(lambda: SearchIndex(df), 3)
+    print(f"색인 생성 (데이터 버전당 1회): {build_time * 1000:,.1f} ms")
+
+    for term in terms:
+        legacy_time, legacy = best_of(lambda: legacy_search(df, term), 5)
+        new_time, rows = best_of(lambda: index.search(term), 50)
+        assert np.array_equal(rows, legacy), f"'{term}' 검색 결과가 기존 방식과 다릅니다."
+        print(f"'{term}': {len(rows):,}행 | 기존 {legacy_time * 1000:,.2f} ms → 색인 {new_time * 1000:,.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+엑셀 스트리밍 리더 메모리 벤치마크
+
+pandas.read_excel과 weekly_report.streaming.read_sheet(전체 컬럼 / 대시보드 사용 컬럼만)의
+파싱 시간과 파싱 중 최대 메모리 사용량(tracemalloc 기준, 파이썬 객체)을 2025 정산서 데이터로 비교합니다.
+(pandas 문자열 컬럼의 Arrow 버퍼는 tracemalloc에 잡히지 않으므로 최종 DataFrame 크기는 따로 표시)
+
+실행:
+    python benchmarks/bench_streaming_reader.py [엑셀 파일]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from weekly_report import streaming
+
+SALES_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2025 정산서 기준 판매 데이터.xlsx')
+# 대시보드 판매 분석에서 사용하는 컬럼 (A열 제조사, I열 업체지급금액, 발주날짜, 상품코드/상품명, 수량)
+DASHBOARD_COLUMNS = [0, 8, '발주날짜', '상품코드', '상품명', '수량', '코드별 판매수량']
+
+CASES = {
+    'pandas.read_excel': lambda path, sheet: pd.read_excel(path, sheet_name=sheet),
+    'streaming (전체 컬럼)': lambda path, sheet: streaming.read_sheet(path, sheet),
+    'streaming (사용 컬럼만)': lambda path, sheet: streaming.read_sheet(path, sheet, columns=DASHBOARD_COLUMNS),
+}
+
+
+def measure(func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    # 시간 측정과 메모리 측정은 따로 실행 (tracemalloc이 실행 시간을 늘리므로)
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, result
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else SALES_DATA_PATH
+    sheet = pd.ExcelFile(path).sheet_names[0]
+    print(f"파일: {os.path.basename(path)} / {sheet}")
+
+    baseline = None
+    for label in CASES:
+        elapsed, peak, df = measure(lambda: CASES[label](path, sheet))
+        if baseline is None:
+            baseline = df
+        else:
+            pd.testing.assert_frame_equal(df, baseline[list(df.columns)])
+        size = df.memory_usage(deep=True).sum() / 1024 / 1024
+        print(f"{label:<22} {elapsed:6.2f} s | 파싱 중 최대 {peak:6.1f} MB | 결과 {size:5.1f} MB ({df.shape[0]:,}행 x {df.shape[1]}열)")
+
+
+if __name__ == '__main__':
+    main()
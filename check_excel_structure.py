@@ -1,36 +1,47 @@
 import pandas as pd
 import sys
 
-try:
-    xls = pd.ExcelFile('주간회의록.xlsx')
-    print('='*60)
-    print('시트 목록:', xls.sheet_names)
-    print('='*60)
+from weekly_report import parallel
+
+
+def main():
+    try:
+        excel_path = '주간회의록.xlsx'
+        # 사이드카(Arrow)가 최신이면 엑셀을 다시 파싱하지 않고, 아니면 시트별로 프로세스 풀에서 동시에 변환
+        frames = parallel.read_workbooks([excel_path])[excel_path]
+        sheet_names = list(frames)
+        print('='*60)
+        print('시트 목록:', sheet_names)
+        print('='*60)
     
-    for sheet in xls.sheet_names:
-        print(f'\n{"="*60}')
-        print(f'시트명: {sheet}')
-        print(f'{"="*60}')
-        df = pd.read_excel(xls, sheet_name=sheet)
-        print(f'행 수: {len(df)}, 열 수: {len(df.columns)}')
-        print(f'\n컬럼명:')
-        for i, col in enumerate(df.columns, 1):
-            print(f'  {i}. {col}')
+        for sheet in sheet_names:
+            print(f'\n{"="*60}')
+            print(f'시트명: {sheet}')
+            print(f'{"="*60}')
+            df = frames[sheet]
+            print(f'행 수: {len(df)}, 열 수: {len(df.columns)}')
+            print(f'\n컬럼명:')
+            for i, col in enumerate(df.columns, 1):
+                print(f'  {i}. {col}')
         
-        print(f'\n첫 10행 데이터:')
-        print(df.head(10).to_string())
+            print(f'\n첫 10행 데이터:')
+            print(df.head(10).to_string())
         
-        print(f'\n데이터 타입:')
-        print(df.dtypes)
+            print(f'\n데이터 타입:')
+            print(df.dtypes)
         
-        # 11월 관련 데이터 확인
-        if '11월' in sheet or '11' in sheet:
-            print(f'\n*** 11월 시트 발견! ***')
-            print(f'전체 데이터 샘플:')
-            print(df.to_string())
+            # 11월 관련 데이터 확인
+            if '11월' in sheet or '11' in sheet:
+                print(f'\n*** 11월 시트 발견! ***')
+                print(f'전체 데이터 샘플:')
+                print(df.to_string())
         
-except Exception as e:
-    print(f'에러 발생: {e}')
-    import traceback
-    traceback.print_exc()
+    except Exception as e:
+        print(f'에러 발생: {e}')
+        import traceback
+        traceback.print_exc()
+
 
+# 병렬 적재 작업 프로세스가 이 스크립트를 다시 import해도 실행되지 않도록 보호
+if __name__ == '__main__':
+    main()
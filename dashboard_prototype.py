@@ -3,13 +3,34 @@
 Streamlit 기반 웹 대시보드
 """
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from functools import partial
 import openpyxl
 
+from weekly_report import batch
+from weekly_report import cache as workbook_cache
+from weekly_report import compact
+from weekly_report import diff
+from weekly_report import exports
+from weekly_report import figures
+from weekly_report import formatting
+from weekly_report import history
+from weekly_report import incremental
+from weekly_report import paging
+from weekly_report import report
+from weekly_report import store
+from weekly_report import warmup
+from weekly_report.cube import get_cube
+from weekly_report.prepare import PART_TARGETS, default_sheet, is_month_sheet, month_sheets, part_mapping_key, part_membership
+from weekly_report.profile import read_profile
+from weekly_report.schema import SalesColumns
+from weekly_report.search import get_index as get_search_index
+
 # 페이지 설정
 st.set_page_config(
     page_title="주간 회의록 대시보드",
@@ -23,10 +44,240 @@ st.markdown("---")
 # 로컬 파일 또는 업로드 파일 사용
 import os
 
+def number_columns(formats):
+    """표시 형식 {컬럼: 형식 문자열}(weekly_report.formatting)을 st.dataframe의 column_config로 변환"""
+    return {col: st.column_config.NumberColumn(format=fmt) for col, fmt in formats.items()}
+
+
+def growth_metrics(monthly):
+    """월별 집계(weekly_report.report.add_growth 결과)의 성장한 달/급감한 달/최고 매출 월/부진 월 지표 카드"""
+    highlights = report.growth_highlights(monthly)
+    col_analysis1, col_analysis2, col_analysis3, col_analysis4 = st.columns(4)
+    
+    with col_analysis1:
+        # 성장한 달
+        max_growth = highlights['성장한 달']
+        if max_growth is not None:
+            st.metric(
+                "📈 성장한 달",
+                f"{max_growth['년월_표시']}",
+                delta=f"{max_growth['성장률']:.1f}%",
+                help=f"매출: {max_growth['매출총이익']:,.0f}원"
+            )
+        else:
+            st.metric("📈 성장한 달", "없음")
+    
+    with col_analysis2:
+        # 급감한 달
+        max_decline = highlights['급감한 달']
+        if max_decline is not None:
+            st.metric(
+                "📉 급감한 달",
+                f"{max_decline['년월_표시']}",
+                delta=f"{max_decline['성장률']:.1f}%",
+                help=f"매출: {max_decline['매출총이익']:,.0f}원"
+            )
+        else:
+            st.metric("📉 급감한 달", "없음")
+    
+    with col_analysis3:
+        # 최고 매출 월
+        max_sales_month = highlights['최고 매출 월']
+        if max_sales_month is not None:
+            st.metric(
+                "🎯 최고 매출 월",
+                f"{max_sales_month['년월_표시']}",
+                delta=f"{max_sales_month['매출총이익']:,.0f}원",
+                help=f"전월 대비: {max_sales_month['성장률']:.1f}%"
+            )
+        else:
+            st.metric("🎯 최고 매출 월", "없음")
+    
+    with col_analysis4:
+        # 부진 월 (평균 대비 낮은 월)
+        weakest_month = highlights['부진 월']
+        if weakest_month is not None:
+            st.metric(
+                "⚠ 부진 월",
+                f"{weakest_month['년월_표시']}",
+                delta=f"{weakest_month['매출총이익']:,.0f}원",
+                help=f"평균 대비: {((weakest_month['매출총이익'] / highlights['평균'] - 1) * 100):.1f}%"
+            )
+        else:
+            st.metric("⚠ 부진 월", "없음")
+
+
+def paged_dataframe(df, data_key, rows=None, widget_key='table', unit='건', **dataframe_options):
+    """df의 현재 페이지 행만 st.dataframe으로 전송 (정렬/필터/페이지 나누기는 서버에서 처리)
+
+    data_key: 데이터 버전 + 필터 상태 (정렬 순서 캐시 키, weekly_report.paging)
+    rows: 필터(검색) 결과 행 위치 배열 (None이면 전체)
+    반환: (현재 페이지 DataFrame, 정렬/필터를 적용한 전체 행 위치 배열 또는 None, 정렬 상태)
+    """
+    original_order = "기본 순서"
+    col_sort, col_direction, col_size, col_page = st.columns([2, 1, 1, 1])
+    with col_sort:
+        sort_column = st.selectbox("정렬 기준", [original_order] + list(df.columns), key=f'{widget_key}_sort')
+    with col_direction:
+        ascending = st.selectbox("정렬 방향", ["오름차순", "내림차순"], key=f'{widget_key}_direction') == "오름차순"
+    with col_size:
+        page_size = st.selectbox(
+            "페이지당 행 수", paging.PAGE_SIZES,
+            index=paging.PAGE_SIZES.index(paging.DEFAULT_PAGE_SIZE), key=f'{widget_key}_page_size'
+        )
+
+    order = None
+    if sort_column != original_order:
+        order = paging.sort_order(data_key, df, sort_column, ascending=ascending)
+    positions = paging.arrange(len(df), rows=rows, order=order)
+    total = paging.count(positions, len(df))
+    pages = paging.page_count(total, page_size)
+    with col_page:
+        # 결과 행 수나 페이지 크기가 바뀌면 첫 페이지부터 다시 표시
+        page = st.number_input(
+            "페이지", min_value=1, max_value=pages, value=1, step=1,
+            key=f'{widget_key}_page_{total}_{page_size}'
+        )
+
+    page_df = paging.take(df, paging.page_rows(positions, len(df), page, page_size))
+    start = (min(page, pages) - 1) * page_size
+    st.dataframe(page_df, **dataframe_options)
+    if total > len(page_df):
+        st.caption(f"전체 {total:,}{unit} 중 {start + 1:,}~{start + len(page_df):,}번째 표시 (페이지 {min(page, pages)}/{pages})")
+    return page_df, positions, (sort_column, ascending)
+
+
+def render_batch_report(source, sheet_names):
+    """모든 월별 시트의 목표 달성/KPI/플랫폼별 분석을 월별 + 전체 기간으로 표시 (weekly_report.batch)"""
+    months = batch.load_months(source, sheet_names)
+    reports = batch.month_reports(source, months)
+    st.subheader(f"📚 전체 월 일괄 보고 ({', '.join(batch.month_label(month) for month in months)})")
+    st.caption(" / ".join(f"{batch.month_label(month)}: '{sheet}'" for month, (sheet, _) in months.items()))
+
+    # 월별 + 전체 기간 목표 달성 현황
+    st.subheader("🎯 월별 목표 달성 현황 (발주서 기준)")
+    targets = batch.target_table(reports)
+    total = targets.iloc[-1]
+    metric_cols = st.columns(len(PART_TARGETS) + 1)
+    for metric_col, part in zip(metric_cols, [*PART_TARGETS, '전체']):
+        with metric_col:
+            st.metric(
+                f"{part} 달성율 ({batch.TOTAL_LABEL} 기간)",
+                f"{total[f'{part} 달성율']:.1f}%",
+                delta=f"{total[f'{part} 달성'] - total[f'{part} 목표']:,.0f}원",
+                help=f"목표: {total[f'{part} 목표']:,.0f}원, 달성: {total[f'{part} 달성']:,.0f}원"
+            )
+    rate_columns = [col for col in targets.columns if col.endswith('달성율')]
+    st.dataframe(
+        targets, use_container_width=True, hide_index=True,
+        column_config=number_columns({
+            **formatting.number_formats(targets, [col for col in targets.columns if col not in rate_columns], formatting.WON),
+            **formatting.number_formats(targets, rate_columns, formatting.PERCENT),
+        })
+    )
+
+    # 월별 파트별 달성 금액 (전체 행 제외)
+    part_achieved = targets.iloc[:-1].melt(
+        id_vars=batch.MONTH_COLUMN, value_vars=[f'{part} 달성' for part in PART_TARGETS], var_name='파트', value_name='달성'
+    )
+    part_achieved['파트'] = part_achieved['파트'].str.replace(' 달성', '')
+    def build_batch_target_chart(part_achieved):
+        fig_targets = px.bar(
+            part_achieved,
+            x=batch.MONTH_COLUMN,
+            y='달성',
+            color='파트',
+            barmode='group',
+            title='월별 파트별 달성 금액',
+            labels={'달성': '달성 금액 (원)'}
+        )
+        fig_targets.update_layout(yaxis=dict(tickformat=','))
+        fig_targets.update_traces(hovertemplate='<b>%{x}</b><br>달성 금액: %{y:,.0f}원<extra></extra>')
+        return fig_targets
+
+    fig_targets = figures.get_figure('batch_target_chart', part_achieved, build_batch_target_chart)
+    st.plotly_chart(fig_targets, use_container_width=True)
+
+    st.markdown("---")
+    st.subheader("📈 월별 핵심 지표 (KPI)")
+    kpis = batch.kpi_table(reports)
+    st.dataframe(kpis, use_container_width=True, hide_index=True, column_config=number_columns(formatting.number_formats(kpis)))
+
+    platform_totals = batch.platform_totals(reports)
+    if len(platform_totals) > 0:
+        st.markdown("---")
+        st.subheader("📋 플랫폼별 분석 (월별 + 전체 기간)")
+        platform_months = batch.platform_by_month(reports)
+        # 전체 기간 매출총이익 상위 10개 플랫폼의 월별 매출총이익
+        top_platforms = platform_months.head(10).drop(columns=batch.TOTAL_LABEL)
+        top_platforms = top_platforms.reset_index().melt(
+            id_vars=top_platforms.index.name, var_name=batch.MONTH_COLUMN, value_name='매출총이익'
+        )
+        def build_batch_platform_chart(top_platforms):
+            platform_col = top_platforms.columns[0]
+            fig_platforms = px.bar(
+                top_platforms,
+                x=platform_col,
+                y='매출총이익',
+                color=batch.MONTH_COLUMN,
+                title=f'{platform_col}별 월별 매출이익금 (전체 기간 상위 10개)',
+                labels={'매출총이익': '매출이익금 (원)'}
+            )
+            fig_platforms.update_layout(yaxis=dict(tickformat=','))
+            fig_platforms.update_traces(hovertemplate='<b>%{x}</b><br>매출이익금: %{y:,.0f}원<extra></extra>')
+            return fig_platforms
+
+        fig_platforms = figures.get_figure('batch_platform_chart', top_platforms, build_batch_platform_chart)
+        st.plotly_chart(fig_platforms, use_container_width=True)
+
+        col_total, col_months = st.columns(2)
+        with col_total:
+            st.markdown("**전체 기간 합계**")
+            platform_totals = platform_totals.reset_index()
+            st.dataframe(platform_totals, use_container_width=True, hide_index=True,
+                         column_config=number_columns(formatting.number_formats(platform_totals)))
+        with col_months:
+            st.markdown("**월별 매출총이익**")
+            platform_months = platform_months.reset_index()
+            st.dataframe(platform_months, use_container_width=True, hide_index=True,
+                         column_config=number_columns(formatting.number_formats(platform_months, fmt=formatting.WON)))
+
+    # 월 시트를 합친 데이터 다운로드 (버튼을 눌렀을 때만 생성)
+    st.markdown("---")
+    export_key = (
+        'batch', workbook_cache.data_version(source), tuple(sheet for sheet, _ in months.values()),
+        part_mapping_key(next(iter(months.values()))[1].part_mapping),
+    )
+    export_df = partial(batch.combined_frame, source, months)
+    col_dl1, col_dl2 = st.columns(2)
+    with col_dl1:
+        st.download_button(
+            label="📥 전체 월 데이터 CSV 다운로드",
+            data=exports.lazy_csv(export_key, export_df),
+            file_name=f"주간회의록_전체월_{datetime.now().strftime('%Y%m%d')}.csv",
+            mime=exports.CSV_MIME
+        )
+    with col_dl2:
+        st.download_button(
+            label="📥 Excel 다운로드",
+            data=exports.lazy_excel(export_key, {'전체월': export_df, '목표달성': targets, 'KPI': kpis}),
+            file_name=f"주간회의록_전체월_{datetime.now().strftime('%Y%m%d')}.xlsx",
+            mime=exports.EXCEL_MIME
+        )
+
+
 excel_file_path = '주간회의록.xlsx'
 sales_data_path = '2025 정산서 기준 판매 데이터.xlsx'
 uploaded_file = None
 
+# 서버 시작 시 미리 적재 중이면 끝날 때까지 기다렸다가 캐시를 그대로 사용 (python -m weekly_report.warmup --serve)
+warmup.wait()
+
+# 로컬 엑셀 파일(회의록/정산서)의 모든 시트를 하위 프로세스에서 동시에 사이드카로 변환
+# (파일 버전마다 한 번만 변환, 재실행 때는 파일 수정시각/크기만 확인,
+#  이미 사이드카가 있는 파일이 바뀌었으면 백그라운드에서 갱신하고 추가된 행은 incremental이 바로 읽음)
+warmup.ensure_sidecars([excel_file_path, sales_data_path], background=True)
+
 # 로컬 파일이 있으면 사용, 없으면 업로드 받기
 if os.path.exists(excel_file_path):
     # 로컬 파일 자동 사용 (체크박스 숨김)
@@ -36,72 +287,42 @@ else:
 
 if uploaded_file is not None:
     try:
-        # 엑셀 파일 읽기
-        if isinstance(uploaded_file, str):
-            # 로컬 파일
-            xls = pd.ExcelFile(uploaded_file)
-        else:
-            # 업로드된 파일
-            xls = pd.ExcelFile(uploaded_file)
-        
+        # 엑셀 파일 읽기 (로컬/업로드 파일 모두 내용 해시 기준으로 캐시)
         # 시트 목록 확인
-        sheet_names = xls.sheet_names
+        sheet_names = workbook_cache.sheet_names(uploaded_file)
         
-        # 11월 시트 자동 찾기
-        november_sheet = None
-        for sheet in sheet_names:
-            if '11월' in sheet or '11' in sheet or 'november' in sheet.lower() or 'nov' in sheet.lower():
-                november_sheet = sheet
-                break
+        # 월별 시트가 여러 개면 전체 월 일괄 보기 선택 가능 (선택하면 시트 하나 대신 모든 월을 표시)
+        if len(month_sheets(sheet_names)) > 1 and st.sidebar.checkbox(
+            "📚 전체 월 일괄 보기", key='batch_mode', help="모든 월별 시트를 한 번에 적재해 월별 + 전체 기간 지표를 표시합니다."
+        ):
+            render_batch_report(uploaded_file, sheet_names)
+            st.stop()
         
-        # 12월 시트 자동 찾기 (11월 시트가 없을 경우)
-        december_sheet = None
-        if not november_sheet:
-            for sheet in sheet_names:
-                if '12월' in sheet or '12' in sheet or 'december' in sheet.lower() or 'dec' in sheet.lower():
-                    december_sheet = sheet
-                    break
+        # 11월 시트 자동 찾기 (11월 시트가 없으면 12월 시트, 서버 시작 시 미리 적재하는 시트와 같음)
+        report_sheet = default_sheet(sheet_names)
         
         # 시트 선택 (11월 또는 12월 시트가 있으면 기본값으로 설정)
-        if november_sheet:
-            # st.success(f"✅ 11월 데이터 시트 발견: **{november_sheet}**")  # 숨김
-            selected_sheet = st.selectbox("시트 선택", sheet_names, index=sheet_names.index(november_sheet))
-        elif december_sheet:
-            # st.success(f"✅ 12월 데이터 시트 발견: **{december_sheet}**")  # 숨김
-            selected_sheet = st.selectbox("시트 선택", sheet_names, index=sheet_names.index(december_sheet))
+        if report_sheet:
+            selected_sheet = st.selectbox("시트 선택", sheet_names, index=sheet_names.index(report_sheet))
         else:
             selected_sheet = st.selectbox("시트 선택", sheet_names)
             st.info("💡 11월 또는 12월 시트를 찾지 못했습니다. 시트 이름에 '11월', '12월' 또는 '11', '12'가 포함되어 있는지 확인하세요.")
         
-        df = pd.read_excel(xls, sheet_name=selected_sheet)
-        
-        # P열(16번째 컬럼, 인덱스 15)의 담당자 컬럼을 파트 컬럼으로 변환
-        p_column_index = 15  # P열은 16번째 (0-based index: 15)
-        if len(df.columns) > p_column_index:
-            manager_col_p = df.columns[p_column_index]
-            
-            # 담당자 컬럼을 파트 컬럼으로 변환
-            if manager_col_p in df.columns:
-                # 담당자 이름에 따라 파트 매핑
-                # 맹기열만 2파트, 나머지는 모두 1파트
-                def map_to_part(manager_name):
-                    manager_name = str(manager_name).strip()
-                    # 맹기열인 경우 2파트
-                    if '맹기열' in manager_name:
-                        return '2파트'
-                    # 나머지는 모두 1파트 (빈 값이 아닌 경우)
-                    elif manager_name and manager_name != 'nan' and manager_name != '':
-                        return '1파트'
-                    # 빈 값은 그대로 반환
-                    return ''
-                
-                df['파트'] = df[manager_col_p].astype(str).apply(map_to_part)
+        # 시트 적재 (파트 컬럼/날짜 파생 컬럼/집계 큐브 포함, 같은 파일에 행만 추가되었으면 추가된 행만 처리)
+        sheet_state = incremental.ingest_sheet(uploaded_file, selected_sheet)
+        df = workbook_cache.detach(sheet_state.frame)
+        # 파트 매핑 표 (파트 컬럼에서 파생된 캐시의 키에 포함)
+        mapping_key = part_mapping_key(sheet_state.part_mapping)
+        # 컬럼 역할 (시트 헤더별로 한 번만 탐지해 column_profiles.json에 저장)
+        profile = sheet_state.profile
+        # 집계 큐브에 적용할 필터 조건 {차원: 허용 값 목록}
+        cube_filters = {}
         
         # 11월 시트인지 확인
-        is_november_sheet = '11월' in selected_sheet or '11' in selected_sheet or 'november' in selected_sheet.lower() or 'nov' in selected_sheet.lower()
+        is_november_sheet = is_month_sheet(selected_sheet, 11)
         
         # 12월 시트인지 확인
-        is_december_sheet = '12월' in selected_sheet or '12' in selected_sheet or 'december' in selected_sheet.lower() or 'dec' in selected_sheet.lower()
+        is_december_sheet = is_month_sheet(selected_sheet, 12)
         
         # 월 표시 텍스트 결정 (12월 시트면 "12월", 11월 시트면 "11월", 아니면 기본값 "11월")
         if is_december_sheet:
@@ -123,12 +344,10 @@ if uploaded_file is not None:
             st.subheader("🏭 스마트공장 업체별 상담내역 담당자")
             st.markdown("---")
             
-            # 업체 컬럼 찾기
-            company_columns = [col for col in df.columns if any(keyword in str(col).lower() for keyword in ['업체', 'company', '회사', '고객', 'customer', 'client'])]
-            # 담당자 컬럼 찾기
-            manager_columns = [col for col in df.columns if any(keyword in str(col).lower() for keyword in ['담당자', 'manager', '담당', '담당인', 'contact', '담당자명'])]
-            # 상담내역 컬럼 찾기
-            consultation_columns = [col for col in df.columns if any(keyword in str(col).lower() for keyword in ['상담', 'consultation', '내역', '내용', 'content', '상담내용', '상담내역'])]
+            # 업체/담당자/상담내역 컬럼 후보
+            company_columns = profile.candidates('company')
+            manager_columns = profile.candidates('manager')
+            consultation_columns = profile.candidates('consultation')
             
             # 컬럼 선택 옵션 제공
             col_select1, col_select2, col_select3 = st.columns(3)
@@ -158,11 +377,11 @@ if uploaded_file is not None:
             
             if company_col and manager_col:
                 # 업체별 담당자 집계
-                company_manager = df.groupby([company_col, manager_col]).size().reset_index(name='상담건수')
+                company_manager = df.groupby([company_col, manager_col], observed=True).size().reset_index(name='상담건수')
                 company_manager = company_manager.sort_values([company_col, '상담건수'], ascending=[True, False])
                 
                 # 업체별 요약
-                company_summary = df.groupby(company_col).agg({
+                company_summary = df.groupby(company_col, observed=True).agg({
                     manager_col: 'count',
                 }).reset_index()
                 company_summary.columns = [company_col, '총상담건수']
@@ -188,7 +407,9 @@ if uploaded_file is not None:
                 search_company = st.text_input("🔍 업체명 검색", "", placeholder="업체명을 입력하세요...")
                 
                 if search_company:
-                    filtered_data = company_manager[company_manager[company_col].astype(str).str.contains(search_company, case=False, na=False)]
+                    search_key = (workbook_cache.data_version(uploaded_file), selected_sheet, mapping_key, company_col, manager_col)
+                    company_index = get_search_index(search_key, company_manager, columns=[company_col])
+                    filtered_data = company_manager.iloc[company_index.search(search_company)]
                     st.info(f"검색 결과: {len(filtered_data)}건")
                 else:
                     filtered_data = company_manager
@@ -197,19 +418,17 @@ if uploaded_file is not None:
                 display_columns = [company_col, manager_col, '상담건수']
                 if consultation_col:
                     # 상담내역이 있으면 추가
-                    consultation_summary = df.groupby([company_col, manager_col])[consultation_col].apply(lambda x: ' | '.join(x.dropna().astype(str).unique()[:3])).reset_index()
+                    consultation_summary = df.groupby([company_col, manager_col], observed=True)[consultation_col].apply(lambda x: ' | '.join(x.dropna().astype(str).unique()[:3])).reset_index()
                     consultation_summary.columns = [company_col, manager_col, '상담내역_요약']
                     filtered_data = filtered_data.merge(consultation_summary, on=[company_col, manager_col], how='left')
                     display_columns.append('상담내역_요약')
                 
-                # 천단위 구분 기호 적용
-                filtered_data_display = filtered_data.copy()
-                filtered_data_display['상담건수'] = filtered_data_display['상담건수'].apply(lambda x: f"{x:,}건")
-                
+                # 천단위 구분 기호 + 건 단위는 표시 형식으로 적용 (숫자 그대로 정렬)
                 st.dataframe(
-                    filtered_data_display[display_columns],
+                    filtered_data[display_columns],
                     use_container_width=True,
-                    height=400
+                    height=400,
+                    column_config=number_columns(formatting.number_formats(filtered_data, ['상담건수'], formatting.COUNT))
                 )
                 
                 # 업체별 담당자 분포 차트
@@ -221,73 +440,83 @@ if uploaded_file is not None:
                 with col_chart1:
                     # 업체별 총 상담건수 (상위 10개)
                     top_companies = company_summary.head(10)
-                    fig_companies = px.bar(
-                        top_companies,
-                        x=company_col,
-                        y='총상담건수',
-                        title='업체별 총 상담건수 (상위 10개)',
-                        labels={company_col: '업체', '총상담건수': '상담건수'},
-                        color='총상담건수',
-                        color_continuous_scale='Blues'
-                    )
-                    fig_companies.update_layout(
-                        xaxis_title="업체",
-                        yaxis_title="상담건수",
-                        showlegend=False,
-                        xaxis_tickangle=-45
-                    )
-                    fig_companies.update_traces(
-                        hovertemplate='<b>%{x}</b><br>상담건수: %{y}건<extra></extra>'
-                    )
+                    def build_top_companies_chart(top_companies, company_col):
+                        fig_companies = px.bar(
+                            top_companies,
+                            x=company_col,
+                            y='총상담건수',
+                            title='업체별 총 상담건수 (상위 10개)',
+                            labels={company_col: '업체', '총상담건수': '상담건수'},
+                            color='총상담건수',
+                            color_continuous_scale='Blues'
+                        )
+                        fig_companies.update_layout(
+                            xaxis_title="업체",
+                            yaxis_title="상담건수",
+                            showlegend=False,
+                            xaxis_tickangle=-45
+                        )
+                        fig_companies.update_traces(
+                            hovertemplate='<b>%{x}</b><br>상담건수: %{y}건<extra></extra>'
+                        )
+                        return fig_companies
+                    
+                    fig_companies = figures.get_figure('top_companies_chart', top_companies, build_top_companies_chart, company_col)
                     st.plotly_chart(fig_companies, use_container_width=True)
                 
                 with col_chart2:
                     # 담당자별 상담건수 (상위 10개)
-                    manager_summary = df.groupby(manager_col).size().reset_index(name='상담건수')
+                    manager_summary = df.groupby(manager_col, observed=True).size().reset_index(name='상담건수')
                     manager_summary = manager_summary.sort_values('상담건수', ascending=False).head(10)
-                    fig_managers = px.bar(
-                        manager_summary,
-                        x=manager_col,
-                        y='상담건수',
-                        title='담당자별 상담건수 (상위 10개)',
-                        labels={manager_col: '담당자', '상담건수': '상담건수'},
-                        color='상담건수',
-                        color_continuous_scale='Greens'
-                    )
-                    fig_managers.update_layout(
-                        xaxis_title="담당자",
-                        yaxis_title="상담건수",
-                        showlegend=False,
-                        xaxis_tickangle=-45
-                    )
-                    fig_managers.update_traces(
-                        hovertemplate='<b>%{x}</b><br>상담건수: %{y}건<extra></extra>'
-                    )
+                    def build_top_managers_chart(manager_summary, manager_col):
+                        fig_managers = px.bar(
+                            manager_summary,
+                            x=manager_col,
+                            y='상담건수',
+                            title='담당자별 상담건수 (상위 10개)',
+                            labels={manager_col: '담당자', '상담건수': '상담건수'},
+                            color='상담건수',
+                            color_continuous_scale='Greens'
+                        )
+                        fig_managers.update_layout(
+                            xaxis_title="담당자",
+                            yaxis_title="상담건수",
+                            showlegend=False,
+                            xaxis_tickangle=-45
+                        )
+                        fig_managers.update_traces(
+                            hovertemplate='<b>%{x}</b><br>상담건수: %{y}건<extra></extra>'
+                        )
+                        return fig_managers
+                    
+                    fig_managers = figures.get_figure('top_managers_chart', manager_summary, build_top_managers_chart, manager_col)
                     st.plotly_chart(fig_managers, use_container_width=True)
                 
                 # 다운로드 버튼
                 st.markdown("---")
                 col_dl1, col_dl2 = st.columns(2)
                 
+                # 다운로드 파일은 버튼을 눌렀을 때만 생성 (데이터 버전 + 선택 컬럼 + 검색어별 캐시)
+                export_key = (
+                    workbook_cache.data_version(uploaded_file), selected_sheet, mapping_key,
+                    company_col, manager_col, consultation_col, search_company,
+                )
+                export_data = filtered_data[display_columns]
+                
                 with col_dl1:
-                    csv = filtered_data[display_columns].to_csv(index=False).encode('utf-8-sig')
                     st.download_button(
                         label="📥 CSV 다운로드",
-                        data=csv,
+                        data=exports.lazy_csv(export_key, export_data),
                         file_name=f"스마트공장_업체별상담내역_{datetime.now().strftime('%Y%m%d')}.csv",
-                        mime="text/csv"
+                        mime=exports.CSV_MIME
                     )
                 
                 with col_dl2:
-                    from io import BytesIO
-                    output = BytesIO()
-                    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                        filtered_data[display_columns].to_excel(writer, index=False, sheet_name='업체별상담내역')
                     st.download_button(
                         label="📥 Excel 다운로드",
-                        data=output.getvalue(),
+                        data=exports.lazy_excel(export_key, {'업체별상담내역': export_data}),
                         file_name=f"스마트공장_업체별상담내역_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        mime=exports.EXCEL_MIME
                     )
             
             else:
@@ -296,56 +525,52 @@ if uploaded_file is not None:
         # 일반 시트인 경우 기존 로직 실행
         if not is_smart_factory:
             # 11월 데이터 필터링 (날짜 컬럼이 있는 경우)
-            original_df = df.copy()
-            
-            # 데이터 전처리 (날짜 컬럼 찾기)
-            date_columns = df.select_dtypes(include=['datetime64']).columns.tolist()
+            # 월별 분석용 전체 데이터 (공유 데이터를 복사하지 않고 참조, 컬럼을 바꾸면 그 컬럼만 새로 만듦)
+            original_df = workbook_cache.detach(df)
             
-            # 날짜 형식의 문자열 컬럼도 찾기
-            for col in df.columns:
-                if df[col].dtype == 'object':
-                    try:
-                        test_date = pd.to_datetime(df[col].dropna().iloc[0], errors='coerce')
-                        if pd.notna(test_date):
-                            date_columns.append(col)
-                    except:
-                        pass
+            # 데이터 전처리 (날짜 컬럼은 적재 시 한 번만 탐지/변환)
+            date_columns = list(sheet_state.date_columns)
             
             # 날짜 컬럼이 있으면 처리
             if len(date_columns) > 0:
                 date_col = date_columns[0]
-                df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-                df['년'] = df[date_col].dt.year
-                df['월'] = df[date_col].dt.month
-                df['년월'] = df[date_col].dt.to_period('M')
+                df[date_col] = sheet_state.dates
+                df['년'] = sheet_state.date_parts['년']
+                df['월'] = sheet_state.date_parts['월']
+                df['년월'] = sheet_state.date_parts['년월']
                 
                 # 선택된 월 데이터만 필터링 (11월 또는 12월)
                 if '월' in df.columns:
-                    df_month = df[df['월'] == month_number].copy()
+                    df_month = store.select_rows(df, df['월'] == month_number)
                     if len(df_month) > 0:
                         st.info(f"📅 {month_display} 총판매 건수 {len(df_month)}건")
                         df = df_month
+                        cube_filters['월'] = [month_number]
                     else:
                         st.warning(f"⚠️ 날짜 컬럼에서 {month_display} 데이터를 찾지 못했습니다. 전체 데이터를 표시합니다.")
             else:
                 # 날짜 컬럼이 없으면 시트 이름으로 판단
-                if november_sheet or is_december_sheet:
+                if (report_sheet and is_month_sheet(report_sheet, 11)) or is_december_sheet:
                     st.info(f"📊 '{selected_sheet}' 시트의 전체 데이터를 표시합니다.")
             
             # 사이드바 필터
             st.sidebar.header("필터 옵션")
         
+        selected_years = None
+        selected_months = None
         if '년' in df.columns:
             years = sorted(df['년'].dropna().unique())
             selected_years = st.sidebar.multiselect("년도 선택", years, default=years)
-            df = df[df['년'].isin(selected_years)]
+            df = store.select_rows(df, df['년'].isin(selected_years))
+            cube_filters['년'] = selected_years
         
         # 선택된 월 데이터만 표시 중이면 월 필터는 숨김
         if '월' in df.columns:
             months = sorted(df['월'].dropna().unique())
             if month_number not in months or len(months) > 1:
                 selected_months = st.sidebar.multiselect("월 선택", months, default=months)
-                df = df[df['월'].isin(selected_months)]
+                df = store.select_rows(df, df['월'].isin(selected_months))
+                cube_filters['월'] = selected_months
             else:
                 st.sidebar.info(f"📅 {month_display} 데이터만 표시 중")
             
@@ -353,59 +578,72 @@ if uploaded_file is not None:
             st.subheader(f"🎯 {month_display} 목표 달성 현황 (발주서 기준)")
             
             # 목표 설정
-            target_part1 = 17000000  # 1파트 목표: 17,000,000원
-            target_part2 = 1000000   # 2파트 목표: 1,000,000원
+            target_part1 = PART_TARGETS['1파트']  # 1파트 목표: 17,000,000원
+            target_part2 = PART_TARGETS['2파트']  # 2파트 목표: 1,000,000원
             
             # N열 찾기 (엑셀의 N열 = 14번째 컬럼, 인덱스 13)
-        # 방법 1: 컬럼 인덱스로 N열 찾기 (14번째 컬럼)
-        n_column_index = 13  # N열은 14번째 (0-based index: 13)
-        amount_col = None
+        # 컬럼 프로파일: N열(14번째 컬럼) 우선, 없으면 컬럼 이름으로 찾은 결과
+        amount_col = profile.column('amount')
         
-        if len(df.columns) > n_column_index:
-            amount_col = df.columns[n_column_index]
-        else:
-            # 방법 2: 컬럼 이름으로 찾기
-            amount_columns = [col for col in df.columns if any(keyword in str(col).lower() for keyword in ['금액', 'amount', '매출', '매출액', '수익', 'revenue', '매출총이익'])]
-            if len(amount_columns) > 0:
-                amount_col = amount_columns[0]
-            else:
-                with st.expander("⚠️ N열을 찾지 못했습니다. 수동으로 선택해주세요."):
-                    amount_col = st.selectbox("금액 컬럼 선택 (N열)", [""] + list(df.columns), key='amount_col')
-                    if amount_col == "":
-                        amount_col = None
+        if amount_col is None:
+            with st.expander("⚠️ N열을 찾지 못했습니다. 수동으로 선택해주세요."):
+                amount_col = st.selectbox("금액 컬럼 선택 (N열)", [""] + list(df.columns), key='amount_col')
+                if amount_col == "":
+                    amount_col = None
         
-        # I열 찾기 (엑셀의 I열 = 9번째 컬럼, 인덱스 8)
-        i_column_index = 8  # I열은 9번째 (0-based index: 8)
-        i_col = None
-        
-        if len(df.columns) > i_column_index:
-            i_col = df.columns[i_column_index]
-        else:
-            # 방법 2: 컬럼 이름으로 찾기
-            i_columns = [col for col in df.columns if any(keyword in str(col).lower() for keyword in ['업체지급금액', '지급금액', '정산금액', 'payment', 'i열'])]
-            if len(i_columns) > 0:
-                i_col = i_columns[0]
+        # I열 찾기 (엑셀의 I열 = 9번째 컬럼 우선, 없으면 컬럼 이름으로 찾은 결과)
+        i_col = profile.column('payment')
         
         # 파트 컬럼 찾기 (P열에서 생성한 '파트' 컬럼 우선 사용)
-        part_columns = [col for col in df.columns if any(keyword in str(col).lower() for keyword in ['파트', 'part'])]
         part_col = None
         
         # 새로 생성한 '파트' 컬럼이 있으면 우선 사용
         if '파트' in df.columns:
             part_col = '파트'
-        elif len(part_columns) > 0:
-            part_col = part_columns[0]
+        elif profile.column('part') is not None:
+            part_col = profile.column('part')
         else:
             with st.expander("⚠️ 파트 컬럼을 자동으로 찾지 못했습니다. 수동으로 선택해주세요."):
                 part_col = st.selectbox("파트 컬럼 선택", [""] + list(df.columns), key='part_col')
                 if part_col == "":
                     part_col = None
         
+        # 수량 / 매출기준액 / 플랫폼(집계 큐브 차원) 컬럼
+        quantity_col = profile.column('quantity')
+        sales_base_col = profile.column('sales_base')
+        platform_col = profile.column('platform')
+        
+        def get_report_cube():
+            """(년, 월, 주차, 일, 파트, 플랫폼)별 건수/합계 큐브 (데이터 버전 + 필터 상태별로 한 번만 생성)"""
+            cube_date_col = date_columns[0] if 'date_columns' in globals() and len(date_columns) > 0 else None
+            cube_measures = {}
+            if quantity_col:
+                cube_measures['수량'] = quantity_col
+            if sales_base_col:
+                cube_measures['매출기준액'] = sales_base_col
+            if amount_col:
+                cube_measures['매출총이익'] = amount_col
+            if (cube_date_col, part_col, platform_col, cube_measures) == sheet_state.cube_spec:
+                # 적재 시 만든 시트 전체 큐브를 필터 조건으로 잘라서 사용
+                return sheet_state.cube.filter(cube_filters)
+            cube_key = (
+                workbook_cache.data_version(uploaded_file), selected_sheet, mapping_key,
+                tuple(selected_years) if selected_years is not None else None,
+                tuple(selected_months) if selected_months is not None else None,
+                cube_date_col, part_col, platform_col, tuple(cube_measures.items()),
+            )
+            return get_cube(cube_key, df, cube_measures, date_col=cube_date_col, part_col=part_col, platform_col=platform_col)
+        
+        # 파트 소속(1파트/2파트)은 한 번만 판별해서 아래 집계에서 함께 사용
+        part_masks = {}
+        if part_col is not None and part_col in df.columns:
+            # 파트 컬럼의 값을 문자열로 변환하고 공백 제거 (카테고리 컬럼은 고유값에만 적용)
+            df[part_col] = compact.strip_values(df[part_col])
+            part_masks = part_membership(df[part_col])
+        
         # 파트별 금액 집계
         part1_achieved = 0
         part2_achieved = 0
-        part1_mask = None
-        part2_mask = None
         part1_count = 0
         part2_count = 0
         
@@ -414,57 +652,14 @@ if uploaded_file is not None:
             if df[amount_col].dtype == 'object':
                 df[amount_col] = pd.to_numeric(df[amount_col], errors='coerce')
             
-            # 파트 컬럼이 있으면 파트별로 매출총이익 집계
-            if part_col is not None and part_col in df.columns:
-                # 파트 컬럼의 값을 문자열로 변환하고 공백 제거
-                df[part_col] = df[part_col].astype(str).str.strip()
-                
-                # NaN이나 빈 값, 'nan' 문자열 제거 후 파트별로 매출총이익 집계
-                # 파트가 비어있지 않은 데이터만 사용
-                df_with_part = df[(df[part_col] != '') & (df[part_col] != 'nan') & (df[part_col].notna())].copy()
-                
-                if len(df_with_part) > 0:
-                    # 파트별로 매출총이익 집계 (groupby 사용)
-                    part_summary = df_with_part.groupby(part_col)[amount_col].agg(['sum', 'count']).reset_index()
-                    part_summary.columns = ['파트', '매출총이익', '건수']
-                    
-                    # 1파트 데이터 찾기 (1파트, part1, 1 등) - 정확한 매칭 우선
-                    part1_mask_filter = (
-                        (part_summary['파트'] == '1파트') |
-                        (part_summary['파트'] == '1') |
-                        part_summary['파트'].str.contains('1파트', na=False, regex=False, case=False) |
-                        part_summary['파트'].str.contains('part1', na=False, regex=False, case=False)
-                    )
-                    part1_rows = part_summary[part1_mask_filter]
-                    
-                    if len(part1_rows) > 0:
-                        part1_achieved = part1_rows['매출총이익'].sum()
-                        part1_count = part1_rows['건수'].sum()
-                        part1_mask = (
-                            (df[part_col] == '1파트') |
-                            (df[part_col] == '1') |
-                            df[part_col].str.contains('1파트', na=False, regex=False, case=False) |
-                            df[part_col].str.contains('part1', na=False, regex=False, case=False)
-                        )
-                    
-                    # 2파트 데이터 찾기 (2파트, part2, 2 등) - 정확한 매칭 우선
-                    part2_mask_filter = (
-                        (part_summary['파트'] == '2파트') |
-                        (part_summary['파트'] == '2') |
-                        part_summary['파트'].str.contains('2파트', na=False, regex=False, case=False) |
-                        part_summary['파트'].str.contains('part2', na=False, regex=False, case=False)
-                    )
-                    part2_rows = part_summary[part2_mask_filter]
-                    
-                    if len(part2_rows) > 0:
-                        part2_achieved = part2_rows['매출총이익'].sum()
-                        part2_count = part2_rows['건수'].sum()
-                        part2_mask = (
-                            (df[part_col] == '2파트') |
-                            (df[part_col] == '2') |
-                            df[part_col].str.contains('2파트', na=False, regex=False, case=False) |
-                            df[part_col].str.contains('part2', na=False, regex=False, case=False)
-                        )
+            # 파트 컬럼이 있으면 파트별로 매출총이익 집계 (1파트, part1, 1 등 표기 포함)
+            if part_masks:
+                part1_amounts = df.loc[part_masks['1파트'], amount_col]
+                part1_achieved = part1_amounts.sum()
+                part1_count = part1_amounts.count()
+                part2_amounts = df.loc[part_masks['2파트'], amount_col]
+                part2_achieved = part2_amounts.sum()
+                part2_count = part2_amounts.count()
             else:
                 # 파트 컬럼이 없는 경우, 전체 데이터를 확인
                 # 사용자가 직접 입력하거나, 다른 방법으로 구분
@@ -566,7 +761,11 @@ if uploaded_file is not None:
         
         with col3:
             # 숫자형 컬럼이 있으면 평균 계산
-            numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
+            # (시트 원본 컬럼 기준, int32로 줄인 정수 컬럼 포함)
+            numeric_cols = [
+                col for col in sheet_state.raw_columns
+                if col in df.columns and str(compact.source_dtype(df[col])) in ('int64', 'float64')
+            ]
             if len(numeric_cols) > 0:
                 avg_value = df[numeric_cols[0]].mean()
                 st.metric(f"{numeric_cols[0]} 평균", f"{avg_value:,.2f}")
@@ -589,10 +788,10 @@ if uploaded_file is not None:
             
             # 전체 원본 데이터에서 월별 집계 (필터링 전)
             if 'original_df' in locals() and len(original_df) > 0:
-                original_df[amount_col] = pd.to_numeric(original_df[amount_col], errors='coerce')
-                if '년월' in original_df.columns:
-                    # N열(매출총이익)을 숫자형으로 변환
+                # N열(매출총이익)을 숫자형으로 변환
+                if original_df[amount_col].dtype == 'object':
                     original_df[amount_col] = pd.to_numeric(original_df[amount_col], errors='coerce')
+                if '년월' in original_df.columns:
                     
                     # 년월 컬럼이 없으면 다시 생성
                     if '년월' not in original_df.columns and len(date_columns) > 0:
@@ -603,166 +802,12 @@ if uploaded_file is not None:
                             original_df['월'] = original_df[date_col].dt.month
                             original_df['년월'] = original_df[date_col].dt.to_period('M')
                     
-                    # N열(매출총이익)이 있는 데이터만 사용 (NaN과 0 제외)
-                    original_df_with_amount = original_df[
-                        original_df[amount_col].notna() & 
-                        (original_df[amount_col] != 0) &
-                        (original_df[amount_col].abs() > 0.01)  # 매우 작은 값도 제외
-                    ].copy()
-                    
-                    # 12월 제외 (월 컬럼 사용)
-                    if '월' in original_df_with_amount.columns:
-                        original_df_filtered = original_df_with_amount[original_df_with_amount['월'] != 12].copy()
-                    elif '년월' in original_df_with_amount.columns:
-                        # 년월 문자열로 확인
-                        original_df_with_amount['년월_str'] = original_df_with_amount['년월'].astype(str)
-                        original_df_filtered = original_df_with_amount[~original_df_with_amount['년월_str'].str.contains('2024-12|2025-12|12월', na=False, regex=True)].copy()
-                    else:
-                        original_df_filtered = original_df_with_amount.copy()
+                    # N열 기준 월별 집계 (N열이 비었거나 0인 행 제외, 12월 제외, 월별 확정 금액 반영, I열 합계 포함)
+                    # 전월 대비 성장률까지 weekly_report.report에서 계산 (python -m weekly_report build와 같은 계산)
+                    monthly_sales = report.monthly_sales(original_df, amount_col, i_col)
                     
-                    # N열 기준으로 월별 집계 (정확한 집계)
-                    # I열도 함께 집계
-                    if '년월' in original_df_filtered.columns and len(original_df_filtered) > 0:
-                        # I열이 있으면 숫자형으로 변환
-                        if i_col and i_col in original_df_filtered.columns:
-                            if original_df_filtered[i_col].dtype == 'object':
-                                original_df_filtered[i_col] = pd.to_numeric(original_df_filtered[i_col], errors='coerce')
-                        
-                        # 년과 월 컬럼을 사용하여 정확하게 월별 집계
-                        if '월' in original_df_filtered.columns and '년' in original_df_filtered.columns:
-                            # 년과 월을 조합하여 정확한 월별 집계
-                            monthly_sales_list = []
-                            for year in sorted(original_df_filtered['년'].dropna().unique()):
-                                for month in range(1, 12):  # 12월 제외
-                                    month_mask = (original_df_filtered['년'] == year) & (original_df_filtered['월'] == month)
-                                    month_data = original_df_filtered[month_mask]
-                                    if len(month_data) > 0:
-                                        # N열 합계
-                                        month_total_n = month_data[amount_col].sum()
-                                        # I열 합계 (I열이 있는 경우)
-                                        month_total_i = 0
-                                        if i_col and i_col in month_data.columns:
-                                            month_total_i = month_data[i_col].sum()
-                                        
-                                        month_period = pd.Period(f'{int(year)}-{month:02d}', freq='M')
-                                        monthly_sales_list.append({
-                                            '년월': month_period, 
-                                            '매출총이익': month_total_n,
-                                            'I열합계': month_total_i if i_col else 0
-                                        })
-                            
-                            if len(monthly_sales_list) > 0:
-                                monthly_sales = pd.DataFrame(monthly_sales_list)
-                                monthly_sales = monthly_sales.sort_values('년월')
-                            else:
-                                monthly_sales = pd.DataFrame(columns=['년월', '매출총이익', 'I열합계'])
-                        else:
-                            # 년월 컬럼만 있는 경우
-                            agg_dict = {amount_col: 'sum'}
-                            if i_col and i_col in original_df_filtered.columns:
-                                agg_dict[i_col] = 'sum'
-                            
-                            monthly_sales = original_df_filtered.groupby('년월', as_index=False).agg(agg_dict)
-                            monthly_sales.columns = ['년월', '매출총이익', 'I열합계'] if i_col else ['년월', '매출총이익']
-                            monthly_sales = monthly_sales.sort_values('년월')
-                            
-                            # I열이 없는 경우 0으로 채우기
-                            if 'I열합계' not in monthly_sales.columns:
-                                monthly_sales['I열합계'] = 0
-                        
-                        # 각 월별 정확한 값으로 업데이트 (2025년 기준)
-                        monthly_amounts = {
-                            '2025-01': 23290017,
-                            '2025-02': 20003838,
-                            '2025-03': 18924280,
-                            '2025-04': 23528759,
-                            '2025-05': 24544760,
-                            '2025-06': 22182939,
-                            '2025-07': 90013289,
-                            '2025-08': 38355057,
-                            '2025-09': 68243253,
-                            '2025-10': 61020050,
-                            '2025-11': 45450249,
-                        }
-                        
-                        # 각 월별로 정확한 값 설정 (N열만 업데이트, I열 합계는 유지)
-                        for month_str, amount in monthly_amounts.items():
-                            month_period = pd.Period(month_str, freq='M')
-                            if month_period in monthly_sales['년월'].values:
-                                # I열 합계는 유지하고 N열만 업데이트
-                                i_sum = monthly_sales.loc[monthly_sales['년월'] == month_period, 'I열합계'].values[0] if 'I열합계' in monthly_sales.columns else 0
-                                monthly_sales.loc[monthly_sales['년월'] == month_period, '매출총이익'] = amount
-                                if 'I열합계' in monthly_sales.columns:
-                                    monthly_sales.loc[monthly_sales['년월'] == month_period, 'I열합계'] = i_sum
-                            else:
-                                # 해당 월 데이터가 없으면 추가
-                                new_row = pd.DataFrame({'년월': [month_period], '매출총이익': [amount], 'I열합계': [0]})
-                                monthly_sales = pd.concat([monthly_sales, new_row], ignore_index=True)
-                        
-                        # 정렬 다시 수행
-                        monthly_sales = monthly_sales.sort_values('년월')
-                    else:
-                        monthly_sales = pd.DataFrame(columns=['년월', '매출총이익'])
-                    
-                    # 전월 대비 성장률 계산
-                    monthly_sales['전월매출'] = monthly_sales['매출총이익'].shift(1)
-                    monthly_sales['성장률'] = ((monthly_sales['매출총이익'] - monthly_sales['전월매출']) / monthly_sales['전월매출'] * 100).round(2)
-                    monthly_sales['년월_표시'] = monthly_sales['년월'].astype(str)
-                    
-                    col_analysis1, col_analysis2, col_analysis3, col_analysis4 = st.columns(4)
-                    
-                    with col_analysis1:
-                        # 성장한 달
-                        growth_months = monthly_sales[monthly_sales['성장률'] > 0].copy()
-                        if len(growth_months) > 0:
-                            max_growth = growth_months.loc[growth_months['성장률'].idxmax()]
-                            st.metric(
-                                "📈 성장한 달",
-                                f"{max_growth['년월_표시']}",
-                                delta=f"{max_growth['성장률']:.1f}%",
-                                help=f"매출: {max_growth['매출총이익']:,.0f}원"
-                            )
-                        else:
-                            st.metric("📈 성장한 달", "없음")
-                    
-                    with col_analysis2:
-                        # 급감한 달
-                        decline_months = monthly_sales[monthly_sales['성장률'] < 0].copy()
-                        if len(decline_months) > 0:
-                            max_decline = decline_months.loc[decline_months['성장률'].idxmin()]
-                            st.metric(
-                                "📉 급감한 달",
-                                f"{max_decline['년월_표시']}",
-                                delta=f"{max_decline['성장률']:.1f}%",
-                                help=f"매출: {max_decline['매출총이익']:,.0f}원"
-                            )
-                        else:
-                            st.metric("📉 급감한 달", "없음")
-                    
-                    with col_analysis3:
-                        # 최고 매출 월
-                        max_sales_month = monthly_sales.loc[monthly_sales['매출총이익'].idxmax()]
-                        st.metric(
-                            "🎯 최고 매출 월",
-                            f"{max_sales_month['년월_표시']}",
-                            delta=f"{max_sales_month['매출총이익']:,.0f}원",
-                            help=f"전월 대비: {max_sales_month['성장률']:.1f}%"
-                        )
-                    
-                    with col_analysis4:
-                        # 부진 월 (평균 대비 낮은 월)
-                        avg_sales = monthly_sales['매출총이익'].mean()
-                        weak_months = monthly_sales[monthly_sales['매출총이익'] < avg_sales * 0.8].copy()
-                        if len(weak_months) > 0:
-                            weakest_month = weak_months.loc[weak_months['매출총이익'].idxmin()]
-                            st.metric(
-                                "⚠ 부진 월",
-                                f"{weakest_month['년월_표시']}",
-                                delta=f"{weakest_month['매출총이익']:,.0f}원",
-                                help=f"평균 대비: {((weakest_month['매출총이익'] / avg_sales - 1) * 100):.1f}%"
-                            )
-                        else:
-                            st.metric("⚠ 부진 월", "없음")
+                    # 성장한 달 / 급감한 달 / 최고 매출 월 / 부진 월
+                    growth_metrics(monthly_sales)
                     
                     # 월별 매출총이익 그래프
                     st.markdown("---")
@@ -773,45 +818,53 @@ if uploaded_file is not None:
                     
                     with col_chart1:
                         # 월별 매출총이익 바 차트
-                        fig_bar_main = px.bar(
-                            monthly_sales,
-                            x='년월_표시',
-                            y='매출총이익',
-                            title='월별 매출총이익 (바 차트)',
-                            labels={'매출총이익': '매출총이익 (원)', '년월_표시': '년월'},
-                            color='매출총이익',
-                            color_continuous_scale='Greens'
-                        )
-                        fig_bar_main.update_layout(
-                            xaxis_title="년월",
-                            yaxis_title="매출총이익 (원)",
-                            yaxis=dict(tickformat=','),
-                            showlegend=False
-                        )
-                        fig_bar_main.update_traces(
-                            hovertemplate='<b>%{x}</b><br>매출총이익: %{y:,.0f}원<extra></extra>'
-                        )
+                        def build_monthly_sales_bar(monthly_sales):
+                            fig_bar_main = px.bar(
+                                monthly_sales,
+                                x='년월_표시',
+                                y='매출총이익',
+                                title='월별 매출총이익 (바 차트)',
+                                labels={'매출총이익': '매출총이익 (원)', '년월_표시': '년월'},
+                                color='매출총이익',
+                                color_continuous_scale='Greens'
+                            )
+                            fig_bar_main.update_layout(
+                                xaxis_title="년월",
+                                yaxis_title="매출총이익 (원)",
+                                yaxis=dict(tickformat=','),
+                                showlegend=False
+                            )
+                            fig_bar_main.update_traces(
+                                hovertemplate='<b>%{x}</b><br>매출총이익: %{y:,.0f}원<extra></extra>'
+                            )
+                            return fig_bar_main
+                        
+                        fig_bar_main = figures.get_figure('monthly_sales_bar', monthly_sales, build_monthly_sales_bar)
                         st.plotly_chart(fig_bar_main, use_container_width=True, key="monthly_sales_bar_main")
                     
                     with col_chart2:
                         # 월별 매출총이익 라인 차트
-                        fig_line_main = px.line(
-                            monthly_sales,
-                            x='년월_표시',
-                            y='매출총이익',
-                            title='월별 매출총이익 (라인 차트)',
-                            labels={'매출총이익': '매출총이익 (원)', '년월_표시': '년월'},
-                            markers=True
-                        )
-                        fig_line_main.update_layout(
-                            xaxis_title="년월",
-                            yaxis_title="매출총이익 (원)",
-                            yaxis=dict(tickformat=','),
-                            hovermode='x unified'
-                        )
-                        fig_line_main.update_traces(
-                            hovertemplate='<b>%{x}</b><br>매출총이익: %{y:,.0f}원<extra></extra>'
-                        )
+                        def build_monthly_sales_line(monthly_sales):
+                            fig_line_main = px.line(
+                                monthly_sales,
+                                x='년월_표시',
+                                y='매출총이익',
+                                title='월별 매출총이익 (라인 차트)',
+                                labels={'매출총이익': '매출총이익 (원)', '년월_표시': '년월'},
+                                markers=True
+                            )
+                            fig_line_main.update_layout(
+                                xaxis_title="년월",
+                                yaxis_title="매출총이익 (원)",
+                                yaxis=dict(tickformat=','),
+                                hovermode='x unified'
+                            )
+                            fig_line_main.update_traces(
+                                hovertemplate='<b>%{x}</b><br>매출총이익: %{y:,.0f}원<extra></extra>'
+                            )
+                            return fig_line_main
+                        
+                        fig_line_main = figures.get_figure('monthly_sales_line', monthly_sales, build_monthly_sales_line)
                         st.plotly_chart(fig_line_main, use_container_width=True, key="monthly_sales_line_main")
                     
                     # 월별 집계 테이블 (N열과 I열 합계 함께 표시)
@@ -835,12 +888,15 @@ if uploaded_file is not None:
                         })
                         display_columns = ['년월_표시', 'N열 합계 (매출총이익)']
                     
-                    # 천단위 구분 기호 적용
-                    for col in ['N열 합계 (매출총이익)', 'I열 합계']:
-                        if col in monthly_display.columns:
-                            monthly_display[col] = monthly_display[col].apply(lambda x: f"{int(x):,}" if pd.notna(x) else "0")
-                    
-                    st.dataframe(monthly_display[display_columns], use_container_width=True, height=400)
+                    # 천단위 구분 기호는 표시 형식으로 적용 (숫자 그대로 정렬)
+                    amount_columns = ['N열 합계 (매출총이익)', 'I열 합계']
+                    monthly_display = formatting.fill_missing(monthly_display, amount_columns)
+                    st.dataframe(
+                        monthly_display[display_columns],
+                        use_container_width=True,
+                        height=400,
+                        column_config=number_columns(formatting.number_formats(monthly_display, amount_columns))
+                    )
                     
         
         st.markdown("---")
@@ -864,57 +920,70 @@ if uploaded_file is not None:
             if len(date_columns) > 0:
                 date_col = date_columns[0]
                 # 주간별 집계
-                df['주차'] = df[date_col].dt.isocalendar().week
-                df['일'] = df[date_col].dt.day
+                df['주차'] = sheet_state.date_parts['주차']
+                df['일'] = sheet_state.date_parts['일']
                 
                 # 선택된 월의 최소 주차 번호 찾기 (첫째주 기준)
                 min_week = df['주차'].min() if len(df) > 0 else None
                 
                 # 주차를 한국어로 변환
-                df['주차_한글'] = df['주차'].apply(lambda x: week_to_korean(x, min_week))
+                df['주차_한글'] = df['주차'].map({week: week_to_korean(week, min_week) for week in df['주차'].unique()})
                 
                 col1, col2 = st.columns(2)
                 
+                # 주차별/일별 집계는 큐브에서 잘라서 사용
+                report_cube = get_report_cube()
+                weekly_cube = report_cube.slice(['주차'], sort=True)  # 주차 번호로 정렬
+                weekly_cube['주차_한글'] = weekly_cube['주차'].apply(lambda x: week_to_korean(x, min_week))
+                daily_cube = report_cube.slice(['일'], sort=True)
+                
                 with col1:
                     # 주차별 데이터 (한국어 주차명 사용)
                     # 주차 번호와 한글명을 함께 유지하여 정렬
-                    weekly_data = df.groupby(['주차', '주차_한글']).size().reset_index(name='건수')
-                    weekly_data = weekly_data.sort_values('주차')  # 주차 번호로 정렬
-                    fig_weekly = px.bar(
-                        weekly_data,
-                        x='주차_한글',
-                        y='건수',
-                        title=f'{month_display} 주차별 데이터 건수',
-                        labels={'주차_한글': '주차', '건수': '건수'},
-                        color='건수',
-                        color_continuous_scale='Blues',
-                        category_orders={'주차_한글': weekly_data['주차_한글'].tolist()}  # 정렬 순서 유지
-                    )
-                    fig_weekly.update_layout(
-                        xaxis_title="주차",
-                        yaxis_title="건수"
-                    )
-                    # 툴팁에서 컬러 정보 숨기기
-                    fig_weekly.update_traces(
-                        hovertemplate='<b>%{x}</b><br>건수: %{y}<extra></extra>'
-                    )
+                    weekly_data = weekly_cube[['주차', '주차_한글', '건수']]
+                    def build_weekly_count_chart(weekly_data, month_display):
+                        fig_weekly = px.bar(
+                            weekly_data,
+                            x='주차_한글',
+                            y='건수',
+                            title=f'{month_display} 주차별 데이터 건수',
+                            labels={'주차_한글': '주차', '건수': '건수'},
+                            color='건수',
+                            color_continuous_scale='Blues',
+                            category_orders={'주차_한글': weekly_data['주차_한글'].tolist()}  # 정렬 순서 유지
+                        )
+                        fig_weekly.update_layout(
+                            xaxis_title="주차",
+                            yaxis_title="건수"
+                        )
+                        # 툴팁에서 컬러 정보 숨기기
+                        fig_weekly.update_traces(
+                            hovertemplate='<b>%{x}</b><br>건수: %{y}<extra></extra>'
+                        )
+                        return fig_weekly
+                    
+                    fig_weekly = figures.get_figure('weekly_count_chart', weekly_data, build_weekly_count_chart, month_display)
                     st.plotly_chart(fig_weekly, use_container_width=True)
                 
                 with col2:
                     # 일별 데이터
-                    daily_data = df.groupby('일').size().reset_index(name='건수')
-                    fig_daily = px.line(
-                        daily_data,
-                        x='일',
-                        y='건수',
-                        title=f'{month_display} 일별 데이터 추이',
-                        markers=True
-                    )
-                    fig_daily.update_layout(
-                        xaxis_title="일",
-                        yaxis_title="건수",
-                        hovermode='x unified'
-                    )
+                    daily_data = daily_cube[['일', '건수']]
+                    def build_daily_count_chart(daily_data, month_display):
+                        fig_daily = px.line(
+                            daily_data,
+                            x='일',
+                            y='건수',
+                            title=f'{month_display} 일별 데이터 추이',
+                            markers=True
+                        )
+                        fig_daily.update_layout(
+                            xaxis_title="일",
+                            yaxis_title="건수",
+                            hovermode='x unified'
+                        )
+                        return fig_daily
+                    
+                    fig_daily = figures.get_figure('daily_count_chart', daily_data, build_daily_count_chart, month_display)
                     st.plotly_chart(fig_daily, use_container_width=True)
                 
                 # 매출총이익 그래프 추가 (주차별/일별)
@@ -930,47 +999,54 @@ if uploaded_file is not None:
                     
                     with col_profit_weekly:
                         # 주차별 매출이익금 (한국어 주차명 사용)
-                        weekly_profit = df.groupby(['주차', '주차_한글'])[amount_col].sum().reset_index()
+                        weekly_profit = weekly_cube[['주차', '주차_한글', '매출총이익']]
                         weekly_profit.columns = ['주차', '주차_한글', '매출이익금']
-                        weekly_profit = weekly_profit.sort_values('주차')  # 주차 번호로 정렬
-                        fig_weekly_profit = px.bar(
-                            weekly_profit,
-                            x='주차_한글',
-                            y='매출이익금',
-                            title=f'{month_display} 주차별 매출이익금',
-                            labels={'주차_한글': '주차', '매출이익금': '매출이익금 (원)'},
-                            color='매출이익금',
-                            color_continuous_scale='Greens',
-                            category_orders={'주차_한글': weekly_profit['주차_한글'].tolist()}  # 정렬 순서 유지
-                        )
-                        fig_weekly_profit.update_layout(
-                            xaxis_title="주차",
-                            yaxis_title="매출이익금 (원)",
-                            yaxis=dict(tickformat=',')
-                        )
-                        # 툴팁에서 컬러 정보 숨기기
-                        fig_weekly_profit.update_traces(
-                            hovertemplate='<b>%{x}</b><br>매출이익금: %{y:,.0f}원<extra></extra>'
-                        )
+                        def build_weekly_profit_chart(weekly_profit, month_display):
+                            fig_weekly_profit = px.bar(
+                                weekly_profit,
+                                x='주차_한글',
+                                y='매출이익금',
+                                title=f'{month_display} 주차별 매출이익금',
+                                labels={'주차_한글': '주차', '매출이익금': '매출이익금 (원)'},
+                                color='매출이익금',
+                                color_continuous_scale='Greens',
+                                category_orders={'주차_한글': weekly_profit['주차_한글'].tolist()}  # 정렬 순서 유지
+                            )
+                            fig_weekly_profit.update_layout(
+                                xaxis_title="주차",
+                                yaxis_title="매출이익금 (원)",
+                                yaxis=dict(tickformat=',')
+                            )
+                            # 툴팁에서 컬러 정보 숨기기
+                            fig_weekly_profit.update_traces(
+                                hovertemplate='<b>%{x}</b><br>매출이익금: %{y:,.0f}원<extra></extra>'
+                            )
+                            return fig_weekly_profit
+                        
+                        fig_weekly_profit = figures.get_figure('weekly_profit_chart', weekly_profit, build_weekly_profit_chart, month_display)
                         st.plotly_chart(fig_weekly_profit, use_container_width=True)
                     
                     with col_profit_daily:
                         # 일별 매출이익금
-                        daily_profit = df.groupby('일')[amount_col].sum().reset_index()
+                        daily_profit = daily_cube[['일', '매출총이익']]
                         daily_profit.columns = ['일', '매출이익금']
-                        fig_daily_profit = px.line(
-                            daily_profit,
-                            x='일',
-                            y='매출이익금',
-                            title=f'{month_display} 일별 매출이익금 추이',
-                            markers=True
-                        )
-                        fig_daily_profit.update_layout(
-                            xaxis_title="일",
-                            yaxis_title="매출이익금 (원)",
-                            hovermode='x unified',
-                            yaxis=dict(tickformat=',')
-                        )
+                        def build_daily_profit_chart(daily_profit, month_display):
+                            fig_daily_profit = px.line(
+                                daily_profit,
+                                x='일',
+                                y='매출이익금',
+                                title=f'{month_display} 일별 매출이익금 추이',
+                                markers=True
+                            )
+                            fig_daily_profit.update_layout(
+                                xaxis_title="일",
+                                yaxis_title="매출이익금 (원)",
+                                hovermode='x unified',
+                                yaxis=dict(tickformat=',')
+                            )
+                            return fig_daily_profit
+                        
+                        fig_daily_profit = figures.get_figure('daily_profit_chart', daily_profit, build_daily_profit_chart, month_display)
                         st.plotly_chart(fig_daily_profit, use_container_width=True)
         else:
             # 날짜 정보가 없으면 전체 데이터 건수 표시
@@ -980,7 +1056,7 @@ if uploaded_file is not None:
         st.subheader(f"📋 플랫폼별 분석 ({month_display})")
         
         # 텍스트/카테고리 컬럼 찾기
-        category_columns = df.select_dtypes(include=['object']).columns.tolist()
+        category_columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
         # 너무 많은 고유값을 가진 컬럼 제외 (ID나 설명 컬럼 제외)
         category_columns = [col for col in category_columns 
                            if df[col].nunique() <= 50 and df[col].nunique() > 1]
@@ -988,42 +1064,55 @@ if uploaded_file is not None:
         if len(category_columns) > 0:
             category_col = st.selectbox("분류 기준 선택", category_columns, key='category_select')
             
+            # 플랫폼 기준이면 큐브에서, 그 외 분류 기준은 원본에서 집계
+            report_cube = get_report_cube()
+            use_cube = report_cube.has_dimension(category_col)
+            category_counts = report_cube.value_counts(category_col) if use_cube else compact.value_counts(df[category_col])
+            
             col1, col2 = st.columns(2)
             
             with col1:
                 # 바 차트 (상위 10개)
-                category_data = df[category_col].value_counts().head(10)
-                fig_bar = px.bar(
-                    x=category_data.values,
-                    y=category_data.index,
-                    orientation='h',
-                    title=f'{category_col}별 분포 (상위 10개)',
-                    labels={'x': '건수', 'y': category_col},
-                    color=category_data.values,
-                    color_continuous_scale='Viridis'
-                )
-                fig_bar.update_layout(showlegend=False)
-                # 툴팁에서 컬러 정보 숨기기
-                fig_bar.update_traces(
-                    hovertemplate=f'<b>%{{y}}</b><br>건수: %{{x}}<extra></extra>'
-                )
+                category_data = category_counts.head(10)
+                def build_category_count_bar(category_data, category_col):
+                    fig_bar = px.bar(
+                        x=category_data.values,
+                        y=category_data.index,
+                        orientation='h',
+                        title=f'{category_col}별 분포 (상위 10개)',
+                        labels={'x': '건수', 'y': category_col},
+                        color=category_data.values,
+                        color_continuous_scale='Viridis'
+                    )
+                    fig_bar.update_layout(showlegend=False)
+                    # 툴팁에서 컬러 정보 숨기기
+                    fig_bar.update_traces(
+                        hovertemplate=f'<b>%{{y}}</b><br>건수: %{{x}}<extra></extra>'
+                    )
+                    return fig_bar
+                
+                fig_bar = figures.get_figure('category_count_bar', category_data, build_category_count_bar, category_col)
                 st.plotly_chart(fig_bar, use_container_width=True)
             
             with col2:
                 # 파이 차트 (상위 8개)
-                top_data = df[category_col].value_counts().head(8)
-                others_count = df[category_col].value_counts().iloc[8:].sum() if len(df[category_col].value_counts()) > 8 else 0
+                top_data = category_counts.head(8)
+                others_count = category_counts.iloc[8:].sum() if len(category_counts) > 8 else 0
                 
                 if others_count > 0:
                     top_data['기타'] = others_count
                 
-                fig_pie = px.pie(
-                    values=top_data.values,
-                    names=top_data.index,
-                    title=f'{category_col}별 비율',
-                    hole=0.4  # 도넛 차트 스타일
-                )
-                fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+                def build_category_count_pie(top_data, category_col):
+                    fig_pie = px.pie(
+                        values=top_data.values,
+                        names=top_data.index,
+                        title=f'{category_col}별 비율',
+                        hole=0.4  # 도넛 차트 스타일
+                    )
+                    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+                    return fig_pie
+                
+                fig_pie = figures.get_figure('category_count_pie', top_data, build_category_count_pie, category_col)
                 st.plotly_chart(fig_pie, use_container_width=True)
             
             # 매출총이익 그래프 추가
@@ -1036,32 +1125,40 @@ if uploaded_file is not None:
                     df[amount_col] = pd.to_numeric(df[amount_col], errors='coerce')
                 
                 # 플랫폼별 매출총이익 집계
-                platform_profit = df.groupby(category_col)[amount_col].sum().sort_values(ascending=False).head(10)
+                if use_cube and '매출총이익' in report_cube.measures:
+                    platform_profit = report_cube.sums(category_col, '매출총이익')
+                else:
+                    platform_profit = df.groupby(category_col, observed=True)[amount_col].sum()
+                platform_profit = platform_profit.sort_values(ascending=False).head(10)
                 
                 col_profit1, col_profit2 = st.columns(2)
                 
                 with col_profit1:
                     # 플랫폼별 매출이익금 바 차트 (세로)
-                    fig_profit_bar = px.bar(
-                        x=platform_profit.index,
-                        y=platform_profit.values,
-                        title=f'{category_col}별 매출이익금 (상위 10개)',
-                        labels={'x': category_col, 'y': '매출이익금 (원)'},
-                        color=platform_profit.values,
-                        color_continuous_scale='Greens'
-                    )
-                    fig_profit_bar.update_layout(
-                        xaxis_title=category_col,
-                        yaxis_title="매출이익금 (원)",
-                        showlegend=False,
-                        yaxis=dict(tickformat=',')
-                    )
-                    # Y축 값에 천단위 구분 기호 적용
-                    fig_profit_bar.update_yaxes(tickformat=',')
-                    # 툴팁에서 컬러 정보 숨기기
-                    fig_profit_bar.update_traces(
-                        hovertemplate=f'<b>%{{x}}</b><br>매출이익금: %{{y:,.0f}}원<extra></extra>'
-                    )
+                    def build_category_profit_bar(platform_profit, category_col):
+                        fig_profit_bar = px.bar(
+                            x=platform_profit.index,
+                            y=platform_profit.values,
+                            title=f'{category_col}별 매출이익금 (상위 10개)',
+                            labels={'x': category_col, 'y': '매출이익금 (원)'},
+                            color=platform_profit.values,
+                            color_continuous_scale='Greens'
+                        )
+                        fig_profit_bar.update_layout(
+                            xaxis_title=category_col,
+                            yaxis_title="매출이익금 (원)",
+                            showlegend=False,
+                            yaxis=dict(tickformat=',')
+                        )
+                        # Y축 값에 천단위 구분 기호 적용
+                        fig_profit_bar.update_yaxes(tickformat=',')
+                        # 툴팁에서 컬러 정보 숨기기
+                        fig_profit_bar.update_traces(
+                            hovertemplate=f'<b>%{{x}}</b><br>매출이익금: %{{y:,.0f}}원<extra></extra>'
+                        )
+                        return fig_profit_bar
+                    
+                    fig_profit_bar = figures.get_figure('category_profit_bar', platform_profit, build_category_profit_bar, category_col)
                     st.plotly_chart(fig_profit_bar, use_container_width=True)
                 
                 with col_profit2:
@@ -1073,31 +1170,27 @@ if uploaded_file is not None:
                         top_profit = top_profit.copy()
                         top_profit['기타'] = others_profit
                     
-                    fig_profit_pie = px.pie(
-                        values=top_profit.values,
-                        names=top_profit.index,
-                        title=f'{category_col}별 매출이익금 비율',
-                        hole=0.4
-                    )
-                    fig_profit_pie.update_traces(
-                        textposition='inside',
-                        textinfo='percent+label',
-                        hovertemplate='<b>%{label}</b><br>매출이익금: %{value:,.0f}원<br>비율: %{percent}<extra></extra>'
-                    )
+                    def build_category_profit_pie(top_profit, category_col):
+                        fig_profit_pie = px.pie(
+                            values=top_profit.values,
+                            names=top_profit.index,
+                            title=f'{category_col}별 매출이익금 비율',
+                            hole=0.4
+                        )
+                        fig_profit_pie.update_traces(
+                            textposition='inside',
+                            textinfo='percent+label',
+                            hovertemplate='<b>%{label}</b><br>매출이익금: %{value:,.0f}원<br>비율: %{percent}<extra></extra>'
+                        )
+                        return fig_profit_pie
+                    
+                    fig_profit_pie = figures.get_figure('category_profit_pie', top_profit, build_category_profit_pie, category_col)
                     st.plotly_chart(fig_profit_pie, use_container_width=True)
             
             # 플랫폼별 상세 통계 테이블
             st.markdown("#### 📊 플랫폼별 상세 통계")
             
-            # 수량 컬럼 찾기
-            quantity_cols = [col for col in df.columns if any(keyword in str(col).lower() for keyword in ['수량', 'quantity', 'qty'])]
-            quantity_col = quantity_cols[0] if len(quantity_cols) > 0 else None
-            
-            # 매출기준액 컬럼 찾기
-            sales_base_cols = [col for col in df.columns if any(keyword in str(col).lower() for keyword in ['매출기준액', '매출기준', 'sales base', '기준액'])]
-            sales_base_col = sales_base_cols[0] if len(sales_base_cols) > 0 else None
-            
-            # 집계할 컬럼 준비
+            # 집계할 컬럼 준비 (수량/매출기준액 컬럼은 위에서 찾은 컬럼 사용)
             agg_dict = {}
             
             # 수량 컬럼이 있으면 합계 계산
@@ -1124,7 +1217,10 @@ if uploaded_file is not None:
                 groupby_dict = {v[0]: v[1] for v in agg_dict.values()}
                 rename_dict = {v[0]: k for k, v in agg_dict.items()}
                 
-                category_stats = df.groupby(category_col).agg(groupby_dict).rename(columns=rename_dict)
+                if use_cube:
+                    category_stats = report_cube.slice([category_col], sort=True).set_index(category_col)[list(agg_dict)]
+                else:
+                    category_stats = df.groupby(category_col, observed=True).agg(groupby_dict).rename(columns=rename_dict)
                 
                 # 매출총이익 높은 순으로 정렬
                 if '매출총이익' in category_stats.columns:
@@ -1133,11 +1229,9 @@ if uploaded_file is not None:
                     # 매출총이익이 없으면 첫 번째 컬럼으로 정렬
                     category_stats = category_stats.sort_values(category_stats.columns[0], ascending=False)
                 
-                # 천단위 구분 기호(콤마) 적용
-                category_stats_formatted = category_stats.copy()
-                for col in category_stats_formatted.columns:
-                    if category_stats_formatted[col].dtype in ['int64', 'float64', 'int32', 'float32']:
-                        category_stats_formatted[col] = category_stats_formatted[col].apply(lambda x: f"{int(x):,}" if pd.notna(x) else "0")
+                # 천단위 구분 기호(콤마)는 표시 형식으로 적용 (숫자 그대로 정렬)
+                category_formats = formatting.number_formats(category_stats)
+                category_stats_formatted = formatting.fill_missing(category_stats, category_formats)
                 
                 # 플랫폼 컬럼을 인덱스에서 컬럼으로 변환
                 category_stats_formatted = category_stats_formatted.reset_index()
@@ -1159,7 +1253,7 @@ if uploaded_file is not None:
                 
                 category_stats_formatted = category_stats_formatted[column_order]
                 
-                st.dataframe(category_stats_formatted, use_container_width=True)
+                st.dataframe(category_stats_formatted, use_container_width=True, column_config=number_columns(category_formats))
             else:
                 st.info("수량, 매출기준액, 매출총이익 컬럼을 찾을 수 없습니다.")
         else:
@@ -1172,7 +1266,10 @@ if uploaded_file is not None:
                 st.markdown("**기본 정보**")
                 st.write(f"- 총 행 수: {len(df):,}건")
                 st.write(f"- 총 컬럼 수: {len(df.columns)}개")
-                st.write(f"- 결측치: {df.isnull().sum().sum()}개")
+                # 컬럼별로 세어서 시트 크기의 bool DataFrame을 만들지 않음
+                st.write(f"- 결측치: {sum(int(df[col].isna().sum()) for col in df.columns)}개")
+                memory_total = sheet_state.memory_report.iloc[-1]
+                st.write(f"- 메모리: {memory_total['변환 전 (KB)']:,.0f} KB → {memory_total['변환 후 (KB)']:,.0f} KB (카테고리/정수 타입 변환)")
             with col2:
                 st.markdown("**컬럼 목록**")
                 for i, col in enumerate(df.columns, 1):
@@ -1183,87 +1280,137 @@ if uploaded_file is not None:
         # 상세 데이터 테이블
         st.subheader(f"📋 {month_display} 상세 데이터")
         
-        # 검색 및 필터 기능
-        col_search, col_filter = st.columns([3, 1])
-        with col_search:
-            search_term = st.text_input("🔍 검색", "", placeholder="모든 컬럼에서 검색...")
-        with col_filter:
-            show_rows = st.selectbox("표시 행 수", [50, 100, 200, 500, "전체"], index=1)
+        # 검색 기능
+        search_term = st.text_input("🔍 검색", "", placeholder="모든 컬럼에서 검색...")
         
+        # 데이터 버전 + 필터 상태 (검색 색인/정렬 순서 캐시 키)
+        detail_key = (
+            workbook_cache.data_version(uploaded_file), selected_sheet, mapping_key,
+            tuple(selected_years) if selected_years is not None else None,
+            tuple(selected_months) if selected_months is not None else None,
+            tuple(df.columns),
+        )
+        search_rows = None
         if search_term:
-            # 모든 컬럼에서 검색
-            mask = df.astype(str).apply(lambda x: x.str.contains(search_term, case=False, na=False)).any(axis=1)
-            display_df = df[mask]
-            st.info(f"검색 결과: {len(display_df)}건 발견")
-        else:
-            display_df = df
+            # 모든 컬럼에서 검색 (데이터 버전 + 필터 상태별로 한 번 만든 역색인 사용)
+            search_rows = get_search_index(detail_key, df).search(search_term)
+            st.info(f"검색 결과: {len(search_rows)}건 발견")
         
-        # 행 수 제한
-        if isinstance(show_rows, int) and len(display_df) > show_rows:
-            display_df = display_df.head(show_rows)
-            st.caption(f"상위 {show_rows}건만 표시 중 (전체: {len(df)}건)")
-        
-        st.dataframe(display_df, use_container_width=True, height=400)
+        # 정렬/검색 결과 중 현재 페이지 행만 브라우저로 전송
+        display_df, detail_positions, detail_sort = paged_dataframe(
+            df, detail_key, rows=search_rows, widget_key='detail', use_container_width=True, height=400
+        )
         
         # 다운로드 버튼
         st.markdown("---")
         col1, col2 = st.columns(2)
         
+        # 다운로드 파일은 버튼을 눌렀을 때만 생성 (데이터 버전 + 필터/검색/정렬별 캐시, 페이지와 관계없이 전체 결과)
+        export_key = (*detail_key, search_term, detail_sort)
+        export_df = partial(paging.take, df, detail_positions)
+        
         with col1:
             # CSV 다운로드
-            csv = display_df.to_csv(index=False).encode('utf-8-sig')
             st.download_button(
                 label="📥 CSV 다운로드",
-                data=csv,
+                data=exports.lazy_csv(export_key, export_df),
                 file_name=f"주간회의록_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv"
+                mime=exports.CSV_MIME
             )
         
         with col2:
             # Excel 다운로드
-            from io import BytesIO
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                display_df.to_excel(writer, index=False, sheet_name='데이터')
             st.download_button(
                 label="📥 Excel 다운로드",
-                data=output.getvalue(),
+                data=exports.lazy_excel(export_key, {'데이터': export_df}),
                 file_name=f"주간회의록_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                mime=exports.EXCEL_MIME
             )
-        
+
+        # 회의록 버전 비교 (이력 저장소의 두 버전을 행 단위로 비교, 체크했을 때만 계산)
+        st.markdown("---")
+        if st.checkbox("🔄 버전 비교 (이전 회의록 대비 추가/삭제/수정 행)", key='version_diff'):
+            if not history.is_available():
+                st.info("💡 버전 비교에는 pyarrow가 필요합니다: pip install pyarrow")
+            else:
+                history_store = history.HistoryStore()
+                # 현재 회의록도 이력에 저장 (내용이 같은 버전은 다시 파싱하지 않음)
+                current_version = history_store.ingest(uploaded_file) if isinstance(uploaded_file, str) else None
+                versions = history_store.versions()
+                if len(versions) < 2:
+                    st.info("💡 비교할 이전 버전이 없습니다. `python -m weekly_report.history ingest`로 스냅샷 파일을 이력에 저장하세요.")
+                else:
+                    # 선택 상자 옵션은 버전 id (같은 분에 저장한 버전도 구분), 표시 이름은 파일 이름 + 수정 시각
+                    version_labels = {
+                        version['id']: f"{version['label']} ({datetime.fromtimestamp(version['source_mtime']):%Y-%m-%d %H:%M})"
+                        for version in versions
+                    }
+                    version_ids = [version['id'] for version in versions]
+                    new_index = version_ids.index(current_version['id']) if current_version else len(version_ids) - 1
+                    col_old, col_new = st.columns(2)
+                    with col_new:
+                        new_id = st.selectbox("현재 버전", version_ids, index=new_index, format_func=version_labels.get, key='diff_new')
+                    # 이전 버전은 현재 버전보다 먼저 저장된 버전 중에서 선택 (기본값: 바로 앞 버전)
+                    earlier_ids = version_ids[:version_ids.index(new_id)]
+                    with col_old:
+                        if earlier_ids:
+                            old_id = st.selectbox(
+                                "이전 버전", earlier_ids, index=len(earlier_ids) - 1, format_func=version_labels.get, key='diff_old'
+                            )
+                        else:
+                            old_id = None
+                            st.info("💡 선택한 버전보다 이전에 저장된 버전이 없습니다.")
+                    if old_id is not None:
+                        new_sheet = diff.match_sheet(history_store.sheet_names(new_id), selected_sheet)
+                        old_sheet = diff.match_sheet(history_store.sheet_names(old_id), new_sheet) if new_sheet else None
+                        if old_sheet is None:
+                            st.info(f"💡 두 버전에 '{selected_sheet}'와 같은 월의 시트가 없습니다.")
+                        else:
+                            _, _, sheet_diff = diff.diff_versions(history_store, old_id, new_id, new_sheet)
+                            st.caption(f"{old_sheet} → {new_sheet} (키 컬럼: {', '.join(map(str, sheet_diff.key_columns))})")
+                            summary = sheet_diff.summary()
+                            metric_cols = st.columns(4)
+                            metric_cols[0].metric("현재 행 수", f"{summary['현재 행 수']:,}", f"{summary['현재 행 수'] - summary['이전 행 수']:+,}")
+                            metric_cols[1].metric("추가", f"{summary['추가']:,}")
+                            metric_cols[2].metric("삭제", f"{summary['삭제']:,}")
+                            metric_cols[3].metric("수정", f"{summary['수정']:,}")
+                            if sheet_diff.added_columns or sheet_diff.removed_columns:
+                                st.caption(f"추가된 컬럼: {sheet_diff.added_columns}, 삭제된 컬럼: {sheet_diff.removed_columns}")
+                            if len(sheet_diff.parts):
+                                st.markdown(f"**파트별 {sheet_diff.amount_col} 합계 변화**")
+                                st.dataframe(
+                                    sheet_diff.parts, use_container_width=True, hide_index=True,
+                                    column_config=number_columns(formatting.number_formats(sheet_diff.parts, fmt=formatting.WON))
+                                )
+                            for title, changed_rows in (("추가된 행", sheet_diff.added), ("삭제된 행", sheet_diff.removed),
+                                                        ("수정된 행", sheet_diff.modified)):
+                                if len(changed_rows):
+                                    with st.expander(f"{title} {len(changed_rows):,}건"):
+                                        st.dataframe(changed_rows.head(paging.DEFAULT_PAGE_SIZE * 10),
+                                                     use_container_width=True, hide_index=True)
+
         # 판매 데이터 분석 섹션 추가 (11월 상세 데이터 하단)
         if os.path.exists(sales_data_path):
             st.markdown("---")
             st.subheader(f"📦 상품 판매 분석 (2025 정산서 기준 {month_display}까지)")
             
             try:
-                sales_xls = pd.ExcelFile(sales_data_path)
-                sales_sheet = st.selectbox("판매 데이터 시트 선택", sales_xls.sheet_names, key='sales_sheet')
-                sales_df = pd.read_excel(sales_xls, sheet_name=sales_sheet)
+                sales_sheet = st.selectbox("판매 데이터 시트 선택", workbook_cache.sheet_names(sales_data_path), key='sales_sheet')
+                # 시트 데이터를 읽기 전에 스키마(컬럼명/타입)만 보고 이 화면에서 쓸 컬럼을 결정
+                sales_columns = SalesColumns(read_profile(sales_data_path, sales_sheet))
                 
                 # 컬럼 찾기
-                company_cols = [col for col in sales_df.columns 
-                               if any(kw in str(col).lower() for kw in ['업체', 'company', '회사', '고객', 'customer', '제조사', 'manufacturer', 'maker'])
-                               and '지급금액' not in str(col)
-                               and '금액' not in str(col)]
-                product_cols = [col for col in sales_df.columns 
-                               if any(kw in str(col).lower() for kw in ['상품', 'product', '코드', 'code', '상품코드'])
-                               and '상품명' not in str(col)
-                               and '코드별' not in str(col)]
-                product_name_cols = [col for col in sales_df.columns if any(kw in str(col).lower() for kw in ['상품명', 'product name', '품명', 'name', '제품명', '상품이름'])]
-                quantity_cols = [col for col in sales_df.columns 
-                                if any(kw in str(col).lower() for kw in ['수량', 'quantity', '판매', 'sales', 'qty']) 
-                                and '코드별' not in str(col)
-                                and '상품코드' not in str(col)
-                                and '상품명' not in str(col)]
+                company_cols = sales_columns.company_candidates
+                product_cols = sales_columns.product_candidates
+                product_name_cols = sales_columns.product_name_candidates
+                quantity_cols = sales_columns.quantity_candidates
                 
                 col_select1, col_select2, col_select3, col_select4 = st.columns(4)
                 with col_select1:
                     if company_cols:
                         company_col = st.selectbox("업체 컬럼", company_cols, key='sales_company')
                     else:
-                        company_col = st.selectbox("업체 컬럼", [""] + list(sales_df.columns), key='sales_company')
+                        company_col = st.selectbox("업체 컬럼", [""] + sales_columns.columns, key='sales_company')
                         if company_col == "":
                             company_col = None
                 
@@ -1271,7 +1418,7 @@ if uploaded_file is not None:
                     if product_cols:
                         product_col = st.selectbox("상품코드 컬럼", product_cols, key='sales_product')
                     else:
-                        product_col = st.selectbox("상품코드 컬럼", [""] + list(sales_df.columns), key='sales_product')
+                        product_col = st.selectbox("상품코드 컬럼", [""] + sales_columns.columns, key='sales_product')
                         if product_col == "":
                             product_col = None
                 
@@ -1279,7 +1426,7 @@ if uploaded_file is not None:
                     if product_name_cols:
                         product_name_col = st.selectbox("상품명 컬럼", product_name_cols, key='sales_product_name')
                     else:
-                        product_name_col = st.selectbox("상품명 컬럼", [""] + list(sales_df.columns), key='sales_product_name')
+                        product_name_col = st.selectbox("상품명 컬럼", [""] + sales_columns.columns, key='sales_product_name')
                         if product_name_col == "":
                             product_name_col = None
                 
@@ -1287,33 +1434,29 @@ if uploaded_file is not None:
                     if quantity_cols:
                         quantity_col = st.selectbox("판매 수량 컬럼", quantity_cols, key='sales_quantity')
                     else:
-                        quantity_col = st.selectbox("판매 수량 컬럼", [""] + list(sales_df.columns), key='sales_quantity')
+                        quantity_col = st.selectbox("판매 수량 컬럼", [""] + sales_columns.columns, key='sales_quantity')
                         if quantity_col == "":
                             quantity_col = None
                 
                 if company_col and product_col and quantity_col:
+                    # 선택된 컬럼과 이 화면에서 쓰는 컬럼(A열, I열, 날짜, 코드별 판매수량)만 읽음
+                    sales_df = workbook_cache.read_sheet(
+                        sales_data_path, sales_sheet,
+                        columns=sales_columns.projection(company_col, product_col, product_name_col, quantity_col),
+                    )
+                    
                     # 수량 컬럼이 숫자형이 아니면 변환
                     if sales_df[quantity_col].dtype == 'object':
                         sales_df[quantity_col] = pd.to_numeric(sales_df[quantity_col], errors='coerce')
                     
                     # 상품코드와 상품명 매핑 생성
-                    if product_name_col:
-                        product_mapping = sales_df[[product_col, product_name_col]].drop_duplicates()
-                        product_mapping = product_mapping.set_index(product_col)[product_name_col].to_dict()
-                    else:
-                        product_mapping = {}
+                    product_mapping = report.product_name_mapping(sales_df, product_col, product_name_col)
+                    if not product_name_col:
                         st.warning("⚠️ 상품명 컬럼이 없어 상품코드로 표시됩니다.")
                     
                     # 상품코드별 제조사 매핑 생성 (원본 업체 컬럼 사용)
                     # 같은 상품코드에 여러 업체가 있을 수 있으므로, 가장 많이 나타나는 업체를 사용
-                    manufacturer_mapping = {}
-                    for product_code in sales_df[product_col].unique():
-                        product_rows = sales_df[sales_df[product_col] == product_code]
-                        if len(product_rows) > 0:
-                            # 해당 상품코드에 가장 많이 나타나는 업체를 제조사로 사용
-                            company_counts = product_rows[company_col].value_counts()
-                            if len(company_counts) > 0:
-                                manufacturer_mapping[product_code] = company_counts.index[0]
+                    manufacturer_mapping = report.product_company_mapping(sales_df, product_col, company_col)
                     
                     # A열(제조사)별로 I열(업체지급금액) 집계
                     st.markdown("#### 업체별 정산금액")
@@ -1321,186 +1464,38 @@ if uploaded_file is not None:
                     # 다운로드를 위한 변수 초기화
                     company_top_product = None
                     
-                    # A열 찾기 (1번째 컬럼, 인덱스 0)
-                    manufacturer_col_index = 0
-                    manufacturer_col = None
-                    if len(sales_df.columns) > manufacturer_col_index:
-                        manufacturer_col = sales_df.columns[manufacturer_col_index]
-                    
-                    # I열 찾기 (9번째 컬럼, 인덱스 8)
-                    payment_col_index = 8
-                    payment_col = None
-                    if len(sales_df.columns) > payment_col_index:
-                        payment_col = sales_df.columns[payment_col_index]
-                    else:
-                        # I열을 찾지 못한 경우 업체지급금액 컬럼 찾기
-                        payment_cols = [col for col in sales_df.columns if any(keyword in str(col).lower() for keyword in ['업체지급금액', '지급금액', '정산금액', 'payment'])]
-                        if len(payment_cols) > 0:
-                            payment_col = payment_cols[0]
+                    # A열(1번째 컬럼) = 제조사, I열(9번째 컬럼, 없으면 업체지급금액 컬럼) = 업체지급금액
+                    manufacturer_col = sales_columns.manufacturer_col
+                    payment_col = sales_columns.payment_col
                     
                     if manufacturer_col and payment_col:
-                        # 숫자형 변환
-                        if sales_df[payment_col].dtype == 'object':
-                            sales_df[payment_col] = pd.to_numeric(sales_df[payment_col], errors='coerce')
-                        
-                        # 제조사별 업체지급금액 집계
-                        manufacturer_payment = sales_df.groupby(manufacturer_col)[payment_col].sum().reset_index()
-                        manufacturer_payment.columns = ['업체', '정산금액']
-                        
-                        # 정산금액 높은 순으로 정렬
-                        manufacturer_payment = manufacturer_payment.sort_values('정산금액', ascending=False)
-                        
-                        # 천단위 구분 기호 적용
-                        manufacturer_payment_display = manufacturer_payment.copy()
-                        manufacturer_payment_display['정산금액'] = manufacturer_payment_display['정산금액'].apply(lambda x: f"{int(x):,}" if pd.notna(x) else "0")
+                        # 제조사별 업체지급금액 집계 (정산금액 높은 순)
+                        manufacturer_payment = report.manufacturer_payments(sales_df, manufacturer_col, payment_col)
                         
-                        st.dataframe(manufacturer_payment_display, use_container_width=True, height=300)
+                        # 천단위 구분 기호는 표시 형식으로 적용 (숫자 그대로 정렬)
+                        st.dataframe(
+                            manufacturer_payment,
+                            use_container_width=True,
+                            height=300,
+                            column_config=number_columns(formatting.number_formats(manufacturer_payment, ['정산금액']))
+                        )
                         
-                        # 다운로드를 위해 원본 데이터 저장 (천단위 구분 기호 없는 버전)
-                        company_top_product = manufacturer_payment.copy()
+                        # 다운로드를 위해 원본 데이터 저장 (숫자 그대로)
+                        company_top_product = manufacturer_payment
                         
                         # 월별 매출 분석 추가
                         st.markdown("---")
                         st.markdown("#### 📊 월별 매출 분석")
                         
-                        # 날짜 컬럼 찾기
-                        sales_date_columns = sales_df.select_dtypes(include=['datetime64']).columns.tolist()
-                        for col in sales_df.columns:
-                            if sales_df[col].dtype == 'object':
-                                try:
-                                    test_date = pd.to_datetime(sales_df[col].dropna().iloc[0] if len(sales_df[col].dropna()) > 0 else None, errors='coerce')
-                                    if pd.notna(test_date):
-                                        sales_date_columns.append(col)
-                                except:
-                                    pass
+                        # 날짜 컬럼 (스키마에서 결정)
+                        sales_date_col = sales_columns.date_column(quantity_col)
                         
-                        if len(sales_date_columns) > 0:
-                            sales_date_col = sales_date_columns[0]
-                            sales_df[sales_date_col] = pd.to_datetime(sales_df[sales_date_col], errors='coerce')
-                            sales_df['년'] = sales_df[sales_date_col].dt.year
-                            sales_df['월'] = sales_df[sales_date_col].dt.month
-                            sales_df['년월'] = sales_df[sales_date_col].dt.to_period('M')
-                            
-                            # I열(업체지급금액)이 있는 데이터만 사용하고 12월 제외
-                            sales_df[payment_col] = pd.to_numeric(sales_df[payment_col], errors='coerce')
-                            sales_df_with_payment = sales_df[sales_df[payment_col].notna() & (sales_df[payment_col] != 0)].copy()
-                            
-                            # 12월 제외
-                            sales_df_with_payment['년월_str'] = sales_df_with_payment['년월'].astype(str)
-                            sales_df_filtered = sales_df_with_payment[~sales_df_with_payment['년월_str'].str.contains('2024-12|2025-12|12월', na=False, regex=True)].copy()
-                            
-                            # I열 기준으로 월별 집계 (정확한 집계)
-                            # 년과 월 컬럼을 사용하여 정확하게 월별 집계
-                            if '월' in sales_df_filtered.columns and '년' in sales_df_filtered.columns:
-                                # 년과 월을 조합하여 정확한 월별 집계
-                                monthly_payment_list = []
-                                for year in sorted(sales_df_filtered['년'].dropna().unique()):
-                                    for month in range(1, 12):  # 12월 제외
-                                        month_mask = (sales_df_filtered['년'] == year) & (sales_df_filtered['월'] == month)
-                                        month_data = sales_df_filtered[month_mask]
-                                        if len(month_data) > 0:
-                                            month_total = month_data[payment_col].sum()
-                                            month_period = pd.Period(f'{int(year)}-{month:02d}', freq='M')
-                                            monthly_payment_list.append({'년월': month_period, '매출총이익': month_total})
-                                
-                                if len(monthly_payment_list) > 0:
-                                    monthly_payment = pd.DataFrame(monthly_payment_list)
-                                    monthly_payment = monthly_payment.sort_values('년월')
-                                else:
-                                    monthly_payment = pd.DataFrame(columns=['년월', '매출총이익'])
-                            else:
-                                # 년월 컬럼만 있는 경우
-                                monthly_payment = sales_df_filtered.groupby('년월', as_index=False)[payment_col].sum()
-                                monthly_payment.columns = ['년월', '매출총이익']
-                                monthly_payment = monthly_payment.sort_values('년월')
-                            
-                            # 각 월별 정확한 값으로 업데이트 (2025년 기준)
-                            monthly_amounts = {
-                                '2025-01': 23290017,
-                                '2025-02': 20003838,
-                                '2025-03': 18924280,
-                                '2025-04': 23528759,
-                                '2025-05': 24544760,
-                                '2025-06': 22182939,
-                                '2025-07': 90013289,
-                                '2025-08': 38355057,
-                                '2025-09': 68243253,
-                                '2025-10': 61020050,
-                                '2025-11': 45450249,
-                            }
-                            
-                            # 각 월별로 정확한 값 설정
-                            for month_str, amount in monthly_amounts.items():
-                                month_period = pd.Period(month_str, freq='M')
-                                if month_period in monthly_payment['년월'].values:
-                                    monthly_payment.loc[monthly_payment['년월'] == month_period, '매출총이익'] = amount
-                                else:
-                                    # 해당 월 데이터가 없으면 추가
-                                    new_row = pd.DataFrame({'년월': [month_period], '매출총이익': [amount]})
-                                    monthly_payment = pd.concat([monthly_payment, new_row], ignore_index=True)
-                            
-                            # 정렬 다시 수행
-                            monthly_payment = monthly_payment.sort_values('년월')
-                            
-                            # 전월 대비 성장률 계산
-                            monthly_payment['전월매출'] = monthly_payment['매출총이익'].shift(1)
-                            monthly_payment['성장률'] = ((monthly_payment['매출총이익'] - monthly_payment['전월매출']) / monthly_payment['전월매출'] * 100).round(2)
-                            monthly_payment['년월_표시'] = monthly_payment['년월'].astype(str)
+                        if sales_date_col is not None:
+                            # I열(업체지급금액) 기준 월별 집계 (12월 제외, 월별 확정 금액 반영, 전월 대비 성장률)
+                            monthly_payment = report.monthly_payments(sales_df, payment_col, sales_date_col)
                             
-                            col_analysis1, col_analysis2, col_analysis3, col_analysis4 = st.columns(4)
-                            
-                            with col_analysis1:
-                                # 성장한 달
-                                growth_months = monthly_payment[monthly_payment['성장률'] > 0].copy()
-                                if len(growth_months) > 0:
-                                    max_growth = growth_months.loc[growth_months['성장률'].idxmax()]
-                                    st.metric(
-                                        "📈 성장한 달",
-                                        f"{max_growth['년월_표시']}",
-                                        delta=f"{max_growth['성장률']:.1f}%",
-                                        help=f"매출: {max_growth['매출총이익']:,.0f}원"
-                                    )
-                                else:
-                                    st.metric("📈 성장한 달", "없음")
-                            
-                            with col_analysis2:
-                                # 급감한 달
-                                decline_months = monthly_payment[monthly_payment['성장률'] < 0].copy()
-                                if len(decline_months) > 0:
-                                    max_decline = decline_months.loc[decline_months['성장률'].idxmin()]
-                                    st.metric(
-                                        "📉 급감한 달",
-                                        f"{max_decline['년월_표시']}",
-                                        delta=f"{max_decline['성장률']:.1f}%",
-                                        help=f"매출: {max_decline['매출총이익']:,.0f}원"
-                                    )
-                                else:
-                                    st.metric("📉 급감한 달", "없음")
-                            
-                            with col_analysis3:
-                                # 최고 매출 월
-                                max_sales_month = monthly_payment.loc[monthly_payment['매출총이익'].idxmax()]
-                                st.metric(
-                                    "🎯 최고 매출 월",
-                                    f"{max_sales_month['년월_표시']}",
-                                    delta=f"{max_sales_month['매출총이익']:,.0f}원",
-                                    help=f"전월 대비: {max_sales_month['성장률']:.1f}%"
-                                )
-                            
-                            with col_analysis4:
-                                # 부진 월 (평균 대비 낮은 월)
-                                avg_sales = monthly_payment['매출총이익'].mean()
-                                weak_months = monthly_payment[monthly_payment['매출총이익'] < avg_sales * 0.8].copy()
-                                if len(weak_months) > 0:
-                                    weakest_month = weak_months.loc[weak_months['매출총이익'].idxmin()]
-                                    st.metric(
-                                        "⚠ 부진 월",
-                                        f"{weakest_month['년월_표시']}",
-                                        delta=f"{weakest_month['매출총이익']:,.0f}원",
-                                        help=f"평균 대비: {((weakest_month['매출총이익'] / avg_sales - 1) * 100):.1f}%"
-                                    )
-                                else:
-                                    st.metric("⚠ 부진 월", "없음")
+                            # 성장한 달 / 급감한 달 / 최고 매출 월 / 부진 월
+                            growth_metrics(monthly_payment)
                             
                             # 월별 업체지급금액(정산금액) 그래프
                             st.markdown("---")
@@ -1511,45 +1506,53 @@ if uploaded_file is not None:
                             
                             with col_chart1:
                                 # 월별 정산금액 바 차트
-                                fig_bar = px.bar(
-                                    monthly_payment,
-                                    x='년월_표시',
-                                    y='매출총이익',
-                                    title='월별 정산금액 (바 차트)',
-                                    labels={'매출총이익': '정산금액 (원)', '년월_표시': '년월'},
-                                    color='매출총이익',
-                                    color_continuous_scale='Blues'
-                                )
-                                fig_bar.update_layout(
-                                    xaxis_title="년월",
-                                    yaxis_title="정산금액 (원)",
-                                    yaxis=dict(tickformat=','),
-                                    showlegend=False
-                                )
-                                fig_bar.update_traces(
-                                    hovertemplate='<b>%{x}</b><br>정산금액: %{y:,.0f}원<extra></extra>'
-                                )
+                                def build_monthly_payment_bar(monthly_payment):
+                                    fig_bar = px.bar(
+                                        monthly_payment,
+                                        x='년월_표시',
+                                        y='매출총이익',
+                                        title='월별 정산금액 (바 차트)',
+                                        labels={'매출총이익': '정산금액 (원)', '년월_표시': '년월'},
+                                        color='매출총이익',
+                                        color_continuous_scale='Blues'
+                                    )
+                                    fig_bar.update_layout(
+                                        xaxis_title="년월",
+                                        yaxis_title="정산금액 (원)",
+                                        yaxis=dict(tickformat=','),
+                                        showlegend=False
+                                    )
+                                    fig_bar.update_traces(
+                                        hovertemplate='<b>%{x}</b><br>정산금액: %{y:,.0f}원<extra></extra>'
+                                    )
+                                    return fig_bar
+                                
+                                fig_bar = figures.get_figure('monthly_payment_bar', monthly_payment, build_monthly_payment_bar)
                                 st.plotly_chart(fig_bar, use_container_width=True, key="monthly_payment_bar")
                             
                             with col_chart2:
                                 # 월별 정산금액 라인 차트
-                                fig_line = px.line(
-                                    monthly_payment,
-                                    x='년월_표시',
-                                    y='매출총이익',
-                                    title='월별 정산금액 (라인 차트)',
-                                    labels={'매출총이익': '정산금액 (원)', '년월_표시': '년월'},
-                                    markers=True
-                                )
-                                fig_line.update_layout(
-                                    xaxis_title="년월",
-                                    yaxis_title="정산금액 (원)",
-                                    yaxis=dict(tickformat=','),
-                                    hovermode='x unified'
-                                )
-                                fig_line.update_traces(
-                                    hovertemplate='<b>%{x}</b><br>정산금액: %{y:,.0f}원<extra></extra>'
-                                )
+                                def build_monthly_payment_line(monthly_payment):
+                                    fig_line = px.line(
+                                        monthly_payment,
+                                        x='년월_표시',
+                                        y='매출총이익',
+                                        title='월별 정산금액 (라인 차트)',
+                                        labels={'매출총이익': '정산금액 (원)', '년월_표시': '년월'},
+                                        markers=True
+                                    )
+                                    fig_line.update_layout(
+                                        xaxis_title="년월",
+                                        yaxis_title="정산금액 (원)",
+                                        yaxis=dict(tickformat=','),
+                                        hovermode='x unified'
+                                    )
+                                    fig_line.update_traces(
+                                        hovertemplate='<b>%{x}</b><br>정산금액: %{y:,.0f}원<extra></extra>'
+                                    )
+                                    return fig_line
+                                
+                                fig_line = figures.get_figure('monthly_payment_line', monthly_payment, build_monthly_payment_line)
                                 st.plotly_chart(fig_line, use_container_width=True, key="monthly_payment_line")
                             
                         else:
@@ -1563,56 +1566,20 @@ if uploaded_file is not None:
                     
                     # 상품코드별 총 판매 수량 집계 (상품코드로 집계하되 표시는 상품명)
                     # "코드별 판매수량" 컬럼이 이미 집계된 값인지 확인
-                    code_sales_col = None
-                    for col in sales_df.columns:
-                        if '코드별' in str(col) and '판매' in str(col) and '수량' in str(col):
-                            code_sales_col = col
-                            break
-                    
-                    # 상품코드와 제조사 매핑 생성 (원본 업체 컬럼 기반)
-                    # 같은 상품코드에 여러 업체가 있을 수 있으므로, 가장 많이 나타나는 업체를 사용
-                    company_mapping = {}
-                    for product_code in sales_df[product_col].unique():
-                        product_rows = sales_df[sales_df[product_col] == product_code]
-                        if len(product_rows) > 0:
-                            # 해당 상품코드에 가장 많이 나타나는 업체를 제조사로 사용
-                            company_counts = product_rows[company_col].value_counts()
-                            if len(company_counts) > 0:
-                                company_mapping[product_code] = company_counts.index[0]
-                    
-                    # 매핑이 비어있으면 fallback으로 원본 매핑 사용
-                    if len(company_mapping) == 0:
-                        fallback_mapping = sales_df[[product_col, company_col]].drop_duplicates()
-                        company_mapping = fallback_mapping.set_index(product_col)[company_col].to_dict()
+                    code_sales_col = sales_columns.code_sales_col
                     
                     if code_sales_col and code_sales_col != quantity_col:
-                        # "코드별 판매수량" 컬럼이 있으면 이를 우선 사용 (이미 집계된 값)
+                        # "코드별 판매수량" 컬럼이 있으면 이를 우선 사용 (이미 집계된 값, 상품코드별 첫 번째 값)
                         st.info(f"💡 '{code_sales_col}' 컬럼을 사용하여 집계합니다.")
-                        if sales_df[code_sales_col].dtype == 'object':
-                            sales_df[code_sales_col] = pd.to_numeric(sales_df[code_sales_col], errors='coerce')
-                        
-                        # 상품코드별로 첫 번째 값 사용 (중복 제거)
-                        product_sales = sales_df.groupby(product_col)[code_sales_col].first().reset_index()
-                        product_sales.columns = ['상품코드', '총판매수량']
-                    else:
-                        # 일반 수량 컬럼 사용 (합산)
-                        product_sales = sales_df.groupby(product_col)[quantity_col].sum().reset_index()
-                        product_sales.columns = ['상품코드', '총판매수량']
                     
-                    product_sales = product_sales.sort_values('총판매수량', ascending=False)
-                    
-                    # 제조사 추가
-                    product_sales['제조사'] = product_sales['상품코드'].map(company_mapping)
-                    product_sales['제조사'] = product_sales['제조사'].fillna('미확인')
-                    
-                    # 상품명 추가
-                    if product_mapping:
-                        product_sales['상품명'] = product_sales['상품코드'].map(product_mapping)
-                        product_sales['상품명'] = product_sales['상품명'].fillna(product_sales['상품코드'])
+                    # 판매 수량 많은 순 + 제조사(위에서 만든 상품코드별 최빈 업체 매핑 재사용) + 상품명
+                    product_sales = report.product_sales(
+                        sales_df, product_col, quantity_col, code_sales_col,
+                        company_mapping=manufacturer_mapping, product_mapping=product_mapping,
+                    )
                     
-                    # 표시용 데이터 준비
-                    product_sales_display = product_sales.copy()
-                    product_sales_display['총판매수량'] = product_sales_display['총판매수량'].apply(lambda x: f"{int(x):,}")
+                    # 총판매수량은 숫자 그대로 두고 천단위 구분 기호만 표시 형식으로 적용 (숫자 순서로 정렬)
+                    quantity_config = number_columns(formatting.number_formats(product_sales, ['총판매수량']))
                     
                     st.info(f"📊 총 {len(product_sales)}가지 상품 (중복 제거)")
                     
@@ -1629,90 +1596,73 @@ if uploaded_file is not None:
                         else:
                             mask = product_sales['상품코드'].astype(str).str.contains(search_product, case=False, na=False)
                         
-                        filtered_products = product_sales[mask]
-                        st.info(f"검색 결과: {len(filtered_products)}건")
-                        display_products = filtered_products.copy()
-                        display_products['총판매수량'] = display_products['총판매수량'].apply(lambda x: f"{int(x):,}")
-                        
-                        if product_mapping:
-                            display_cols = ['제조사', '상품명', '총판매수량']
-                        else:
-                            display_cols = ['제조사', '상품코드', '총판매수량']
-                        
-                        st.dataframe(display_products[display_cols], use_container_width=True, height=400)
+                        product_rows = np.flatnonzero(mask.to_numpy())
+                        st.info(f"검색 결과: {len(product_rows)}건")
                     else:
-                        # 상위 100개만 표시
-                        top_100 = product_sales.head(100)
-                        top_100_display = top_100.copy()
-                        top_100_display['총판매수량'] = top_100_display['총판매수량'].apply(lambda x: f"{int(x):,}")
-                        
-                        if product_mapping:
-                            display_cols = ['제조사', '상품명', '총판매수량']
-                        else:
-                            display_cols = ['제조사', '상품코드', '총판매수량']
-                        
-                        st.dataframe(top_100_display[display_cols], use_container_width=True, height=400)
-                        st.caption(f"상위 100개만 표시 (전체: {len(product_sales)}개)")
+                        product_rows = None
+                    
+                    if product_mapping:
+                        display_cols = ['제조사', '상품명', '총판매수량']
+                    else:
+                        display_cols = ['제조사', '상품코드', '총판매수량']
+                    
+                    # 판매수량 순 전체 상품 중 현재 페이지만 전송 (정렬 순서는 판매 데이터 버전 + 선택 컬럼별 캐시)
+                    product_key = (
+                        workbook_cache.data_version(sales_data_path), sales_sheet,
+                        company_col, product_col, product_name_col, quantity_col,
+                    )
+                    paged_dataframe(
+                        product_sales[display_cols], product_key, rows=product_rows, widget_key='product', unit='개',
+                        use_container_width=True, height=400, column_config=quantity_config
+                    )
                     
                     # 3. 가장 많이 판매된 상품
                     st.markdown("---")
                     st.markdown("#### 3️⃣ 가장 많이 판매된 상품 TOP 10")
                     
-                    top_10_products = product_sales.head(10).copy()
+                    top_10_products = product_sales.head(10)
                     
                     # TOP 10 테이블
                     top_10_display = top_10_products.copy()
                     top_10_display['순위'] = range(1, len(top_10_display) + 1)
-                    top_10_display['총판매수량'] = top_10_display['총판매수량'].apply(lambda x: f"{int(x):,}")
                     
                     if product_mapping:
                         display_cols = ['순위', '제조사', '상품명', '총판매수량']
                     else:
                         display_cols = ['순위', '제조사', '상품코드', '총판매수량']
                     
-                    st.dataframe(top_10_display[display_cols], use_container_width=True)
+                    st.dataframe(top_10_display[display_cols], use_container_width=True, column_config=quantity_config)
                     
                     # 다운로드 버튼
                     st.markdown("---")
                     col_dl1, col_dl2 = st.columns(2)
                     
+                    # 다운로드 파일은 버튼을 눌렀을 때만 생성 (판매 데이터 버전 + 선택 컬럼별 캐시)
+                    export_key = product_key
+                    # 다운로드용 데이터 (상품명 포함)
+                    if product_mapping:
+                        download_product = product_sales[['상품코드', '상품명', '총판매수량']]
+                    else:
+                        download_product = product_sales[['상품코드', '총판매수량']]
+                    download_sheets = {'상품별판매수량': download_product}
+                    # 업체별 정산금액 저장
+                    if company_top_product is not None:
+                        download_sheets['업체별정산금액'] = company_top_product
+                    
                     with col_dl1:
-                        # 다운로드용 데이터 준비 (상품명 포함)
-                        download_data = product_sales.copy()
-                        if product_mapping:
-                            download_data = download_data[['상품코드', '상품명', '총판매수량']]
-                        else:
-                            download_data = download_data[['상품코드', '총판매수량']]
-                        
-                        csv = download_data.to_csv(index=False).encode('utf-8-sig')
                         st.download_button(
                             label="📥 전체 상품 판매수량 CSV 다운로드",
-                            data=csv,
+                            data=exports.lazy_csv(export_key, download_product),
                             file_name=f"상품_판매수량_{datetime.now().strftime('%Y%m%d')}.csv",
-                            mime="text/csv"
+                            mime=exports.CSV_MIME
                         )
                     
                     with col_dl2:
-                        from io import BytesIO
-                        output = BytesIO()
-                        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                            # 상품명 포함하여 저장
-                            if product_mapping:
-                                download_product = product_sales[['상품코드', '상품명', '총판매수량']].copy()
-                            else:
-                                download_product = product_sales[['상품코드', '총판매수량']].copy()
-                            download_product.to_excel(writer, index=False, sheet_name='상품별판매수량')
-                            
-                            # 업체별 정산금액 저장
-                            if company_top_product is not None:
-                                download_company = company_top_product.copy()
-                                download_company.to_excel(writer, index=False, sheet_name='업체별정산금액')
-                        
                         st.download_button(
                             label="📥 Excel 다운로드",
-                            data=output.getvalue(),
+                            data=exports.lazy_excel(export_key, download_sheets),
                             file_name=f"상품_판매분석_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                            mime=exports.EXCEL_MIME
                         )
                 
                 else:
@@ -1722,6 +1672,15 @@ if uploaded_file is not None:
                 st.error(f"판매 데이터 처리 중 오류 발생: {str(e)}")
                 st.info("파일 구조를 확인하고 코드를 수정해주세요.")
         
+        # 세션 메모리 사용량 (적재한 시트/큐브는 모든 세션이 공유하고, 세션은 필터/변환으로 새로 만든 배열만 가짐)
+        # (월별 매출 분석의 N열 필터 결과는 weekly_report.report 안에서만 쓰고 보관하지 않음)
+        session_frames = [globals().get(name) for name in ('df', 'original_df', 'display_df', 'sales_df')]
+        session_usage = store.session_memory(session_frames)
+        st.sidebar.caption(
+            f"💾 세션 메모리 {session_usage['session'] / 1024:,.0f} KB "
+            f"(공유 데이터 {session_usage['shared'] / 1024:,.0f} KB는 모든 세션이 함께 사용)"
+        )
+        
     except Exception as e:
         st.error(f"파일 처리 중 오류 발생: {str(e)}")
         st.info("파일 구조를 확인하고 코드를 수정해주세요.")
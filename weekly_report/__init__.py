@@ -0,0 +1,14 @@
+"""
+주간 회의록 대시보드 데이터 처리 패키지
+
+대시보드(dashboard_prototype.py)와 분석 스크립트에서 공통으로 사용하는
+엑셀 로딩 및 집계 로직을 모아둔 패키지입니다.
+
+공유 캐시의 DataFrame을 세션마다 복사하지 않고 얕은 복사본(cache.detach)으로 넘기므로,
+pandas 2.x에서도 Copy-on-Write를 켭니다 (pandas 3.0부터는 항상 켜져 있음).
+"""
+
+import pandas as pd
+
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
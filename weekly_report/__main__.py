@@ -0,0 +1,13 @@
+"""
+python -m weekly_report build --month 11 [--format json csv pdf]
+
+브라우저 없이 월말 보고 지표와 표를 JSON/CSV로 저장합니다 (weekly_report.report).
+--format pdf를 지정하면 월말 보고 PDF도 만듭니다 (weekly_report.pdf, matplotlib/reportlab 필요).
+"""
+
+import sys
+
+from weekly_report import report
+
+if __name__ == '__main__':
+    sys.exit(report.main())
@@ -0,0 +1,54 @@
+"""
+대시보드 공통 집계 함수
+
+행 단위 반복문 대신 groupby 한 번으로 계산하는 집계 함수들을 모아둔 모듈입니다.
+"""
+
+import pandas as pd
+
+
+def mode_per_key(df, key_col, value_col):
+    """키별 최빈값 매핑 {키: 가장 많이 나타나는 값}
+
+    예: 상품코드별로 가장 많이 나타나는 업체(제조사)
+    키마다 `value_counts().index[0]`를 구하던 반복문과 같은 결과를 반환합니다.
+    (건수가 같으면 먼저 나타난 값 우선, 키나 값이 비어 있는 행은 제외)
+    """
+    counts = df.groupby([key_col, value_col], sort=False, observed=True).size()
+    # 안정 정렬이므로 건수가 같은 값은 처음 나타난 순서가 유지됨
+    counts = counts.sort_values(ascending=False, kind='stable')
+    top = counts[~counts.index.get_level_values(0).duplicated()]
+    return dict(zip(top.index.get_level_values(0), top.index.get_level_values(1)))
+
+
+def monthly_totals(df, measures, exclude_months=(), year_col='년', month_col='월', period_col='년월'):
+    """년-월 버킷별 합계를 groupby 한 번으로 계산
+
+    measures: {결과 컬럼명: 원본 컬럼명} (예: {'매출총이익': N열, 'I열합계': I열})
+    exclude_months: 집계에서 제외할 월 번호 (예: (12,) → 12월 제외)
+    년/월 컬럼이 없으면 년월(Period) 컬럼에서 년/월을 꺼내 사용합니다.
+    반환: '년월'(Period[M]) + 결과 컬럼, 년월 순 정렬, 데이터가 있는 월만 포함
+    """
+    columns = ['년월'] + list(measures)
+    if year_col in df.columns and month_col in df.columns:
+        years, months = df[year_col], df[month_col]
+    elif period_col in df.columns:
+        years, months = df[period_col].dt.year, df[period_col].dt.month
+    else:
+        return pd.DataFrame(columns=columns)
+
+    valid = years.notna() & months.notna() & ~months.isin(list(exclude_months))
+    data = df.loc[valid, list(dict.fromkeys(measures.values()))]
+    keys = [years[valid].astype(int).rename('년'), months[valid].astype(int).rename('월')]
+    grouped = data.groupby(keys, sort=True, observed=True).sum()
+    if len(grouped) == 0:
+        return pd.DataFrame(columns=columns)
+
+    result = pd.DataFrame({
+        '년월': pd.PeriodIndex(
+            [f'{year}-{month:02d}' for year, month in grouped.index], freq='M'
+        ),
+    })
+    for name, col in measures.items():
+        result[name] = grouped[col].to_numpy()
+    return result
@@ -0,0 +1,189 @@
+"""
+여러 월 시트 일괄 보고
+
+분기 말 회의처럼 한 달이 아니라 워크북의 모든 월별 시트를 한 번에 봐야 할 때 사용합니다.
+- 월별 시트 찾기: 시트 이름의 'N월' 표기 (weekly_report.prepare.month_sheets)
+- 적재: 모든 시트를 프로세스 풀에서 동시에 사이드카로 변환한 뒤(weekly_report.parallel)
+  월 시트마다 incremental.ingest_sheet로 적재 (시트별 파트/날짜 파생 컬럼과 집계 큐브는 시트 단위로 캐시)
+- 월별 보고 지표(MonthReport): 시트 집계 큐브에서 목표 달성/KPI/플랫폼별 통계를 계산해
+  (데이터 버전, 시트, 파트 매핑)별로 한 번만 만들고, 월을 추가/제외해도 다른 월은 다시 계산하지 않음
+- 전체 합계: 월별 결과를 합쳐서 계산 (원본 행을 다시 집계하지 않음)
+- 통합 DataFrame: 월 시트들을 컬럼 타입(카테고리/int32)을 유지한 채 합치고 보고월 컬럼을 붙인 것 (다운로드용)
+
+사용 예:
+    months = batch.load_months('주간회의록.xlsx')             # {월: (시트명, SheetState)}
+    reports = batch.month_reports('주간회의록.xlsx', months)   # [MonthReport]
+    batch.target_table(reports)                              # 월별 + 전체 목표 달성 현황
+"""
+
+import pandas as pd
+
+from weekly_report import cache as workbook_cache
+from weekly_report import compact, incremental, parallel
+from weekly_report.cache import LRUCache
+from weekly_report.cube import COUNT_COLUMN
+from weekly_report.prepare import PART_TARGETS, month_sheets, part_mapping_key, part_membership
+
+# 통합 DataFrame의 월 키 컬럼 / 합계 행 표시
+MONTH_COLUMN = '보고월'
+TOTAL_LABEL = '전체'
+# 보고 지표 측정값 (집계 큐브 측정값명)
+MEASURES = ('수량', '매출기준액', '매출총이익')
+
+# (데이터 버전, 시트, 월, 파트 매핑)별 월 보고 지표
+report_cache = LRUCache(max_entries=24)
+# (데이터 버전, 월 시트 목록, 파트 매핑)별 통합 DataFrame
+combined_cache = LRUCache(max_entries=4)
+
+
+def month_label(month):
+    return f"{month}월"
+
+
+def load_months(source, sheet_names=None):
+    """워크북의 월별 시트를 모두 적재 {월 번호: (시트명, SheetState)}
+
+    로컬 파일이면 모든 시트를 먼저 병렬로 사이드카 변환하므로 시트별 적재는 메모리 매핑 읽기 + 파생 컬럼 계산만 합니다.
+    모든 월 시트를 이미 적재한 적이 있으면 변환을 기다리지 않습니다 (행이 추가된 시트는 추가된 행만 읽음).
+    """
+    sheets = month_sheets(sheet_names if sheet_names is not None else workbook_cache.sheet_names(source))
+    if isinstance(source, str) and not all(incremental.is_loaded(source, sheet) for sheet in sheets.values()):
+        parallel.prepare_sidecars([source])
+    return {month: (sheet, incremental.ingest_sheet(source, sheet)) for month, sheet in sheets.items()}
+
+
+def _mapping_key(state):
+    return part_mapping_key(state.part_mapping)
+
+
+class MonthReport:
+    """월 시트 하나의 보고 지표 (목표 달성, KPI, 플랫폼별 통계)
+
+    대시보드 월 화면과 같은 기준: 날짜 컬럼이 있으면 해당 월 날짜의 행만(없으면 시트 전체),
+    파트는 1파트/2파트 표기를 part_membership으로 판별, 금액은 N열(매출총이익).
+    """
+
+    def __init__(self, month, sheet_name, state):
+        self.month = month
+        self.sheet_name = sheet_name
+        cube = state.cube
+        if cube.has_dimension('월'):
+            month_cube = cube.filter({'월': [month]})
+            if len(month_cube.table) > 0:
+                cube = month_cube
+        _, part_col, platform_col, _ = state.cube_spec
+        self.platform_col = platform_col if platform_col is not None and cube.has_dimension(platform_col) else None
+        self.measures = [measure for measure in MEASURES if measure in cube.measures]
+
+        self.kpis = {'총 데이터 수': int(cube.total())}
+        for measure in self.measures:
+            self.kpis[measure] = cube.total(measure)
+
+        self.parts = self._part_totals(cube, part_col)
+        self.platforms = None
+        if self.platform_col is not None:
+            self.platforms = cube.slice([self.platform_col], sort=True).set_index(self.platform_col)[
+                [COUNT_COLUMN, *self.measures]
+            ]
+
+    def _part_totals(self, cube, part_col):
+        """파트별 (달성 금액, 데이터 건수) DataFrame (파트 컬럼이나 금액이 없으면 빈 값)"""
+        parts = pd.DataFrame({'달성': 0.0, '건수': 0}, index=pd.Index(list(PART_TARGETS), name='파트'))
+        if part_col is None or not cube.has_dimension(part_col) or '매출총이익' not in self.measures:
+            return parts
+        by_part = cube.slice([part_col])
+        masks = part_membership(by_part[part_col])
+        for part, mask in masks.items():
+            parts.loc[part, '달성'] = by_part.loc[mask, '매출총이익'].sum()
+            parts.loc[part, '건수'] = by_part.loc[mask, '매출총이익_건수'].sum()
+        return parts
+
+
+def month_reports(source, months):
+    """load_months 결과의 월별 MonthReport 목록 (월 순서, 월마다 한 번만 계산)"""
+    version = workbook_cache.data_version(source)
+    reports = []
+    for month, (sheet, state) in months.items():
+        key = (version, sheet, month, _mapping_key(state))
+        reports.append(report_cache.get_or_build(key, lambda: MonthReport(month, sheet, state)))
+    return reports
+
+
+def combined_frame(source, months):
+    """월 시트들을 합친 DataFrame (컬럼 타입 유지, 첫 컬럼에 보고월)"""
+    if not months:
+        return pd.DataFrame()
+    states = [state for _, state in months.values()]
+    key = (
+        workbook_cache.data_version(source), tuple(sheet for sheet, _ in months.values()), _mapping_key(states[0]),
+    )
+
+    def build():
+        frames = [
+            state.frame.assign(**{MONTH_COLUMN: month_label(month)})
+            for month, (_, state) in months.items()
+        ]
+        combined = compact.concat_frames(frames)
+        combined[MONTH_COLUMN] = pd.Categorical(
+            combined[MONTH_COLUMN], categories=[month_label(month) for month in months]
+        )
+        return combined[[MONTH_COLUMN, *[col for col in combined.columns if col != MONTH_COLUMN]]]
+
+    return combined_cache.get_or_build(key, build)
+
+
+def target_table(reports, targets=PART_TARGETS):
+    """월별 + 전체 목표 달성 현황 (행: 보고월, 컬럼: 파트별 목표/달성/달성율 + 전체)
+
+    전체 행의 목표는 월 목표 × 월 수입니다.
+    """
+    periods = [(month_label(report.month), report.parts, 1) for report in reports]
+    if reports:
+        total_parts = pd.concat([report.parts for report in reports]).groupby(level=0, observed=True).sum()
+        periods.append((TOTAL_LABEL, total_parts, len(reports)))
+    rows = []
+    for label, parts, months in periods:
+        row = {MONTH_COLUMN: label}
+        for part, target in targets.items():
+            row[f'{part} 목표'] = target * months
+            row[f'{part} 달성'] = parts.loc[part, '달성']
+        row['전체 목표'] = sum(targets.values()) * months
+        row['전체 달성'] = sum(parts.loc[part, '달성'] for part in targets)
+        rows.append(row)
+    table = pd.DataFrame(rows)
+    for part in [*targets, '전체']:
+        if len(table) > 0:
+            table[f'{part} 달성율'] = (table[f'{part} 달성'] / table[f'{part} 목표'] * 100).round(1)
+    return table
+
+
+def kpi_table(reports):
+    """월별 + 전체 KPI (데이터 수, 수량/매출기준액/매출총이익 합계)"""
+    table = pd.DataFrame([{MONTH_COLUMN: month_label(report.month), **report.kpis} for report in reports])
+    if len(table) > 0:
+        total = table.drop(columns=MONTH_COLUMN).sum()
+        table = pd.concat([table, pd.DataFrame([{MONTH_COLUMN: TOTAL_LABEL, **total}])], ignore_index=True)
+    return table
+
+
+def platform_totals(reports):
+    """전체 기간 플랫폼별 건수/수량/매출기준액/매출총이익 (매출총이익 높은 순)"""
+    tables = [report.platforms for report in reports if report.platforms is not None]
+    if not tables:
+        return pd.DataFrame()
+    totals = pd.concat(tables).groupby(level=0, observed=True).sum()
+    sort_column = '매출총이익' if '매출총이익' in totals.columns else totals.columns[0]
+    return totals.sort_values(sort_column, ascending=False)
+
+
+def platform_by_month(reports, measure='매출총이익'):
+    """플랫폼 × 보고월 measure 합계 표 (전체 합계 높은 순, 없는 조합은 0)"""
+    columns = {
+        month_label(report.month): report.platforms[measure]
+        for report in reports if report.platforms is not None and measure in report.platforms.columns
+    }
+    if not columns:
+        return pd.DataFrame()
+    table = pd.DataFrame(columns).fillna(0)
+    table[TOTAL_LABEL] = table.sum(axis=1)
+    return table.sort_values(TOTAL_LABEL, ascending=False)
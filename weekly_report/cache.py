@@ -0,0 +1,265 @@
+"""
+엑셀 워크북 로딩 캐시
+
+파일 내용 해시 + 시트명을 키로 파싱된 DataFrame을 프로세스 메모리에 보관합니다.
+Streamlit은 위젯을 조작할 때마다 스크립트 전체를 다시 실행하므로,
+같은 파일이면 openpyxl 파싱을 건너뛰고 메모리에서 바로 돌려줍니다.
+파일 내용이 실제로 바뀐 경우에만 다시 파싱합니다.
+로컬 파일은 Arrow 사이드카(weekly_report.sidecar)가 있으면 그것을 읽습니다.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import pandas as pd
+
+from weekly_report import sidecar, streaming
+from weekly_report.schema import SheetSchema
+
+# 캐시에 보관할 최대 항목 수 (시트 단위, 초과 시 가장 오래 사용하지 않은 항목부터 제거)
+DEFAULT_MAX_ENTRIES = 16
+
+
+def _copy_on_write_enabled():
+    """pandas Copy-on-Write 활성 여부 (pandas 3.0부터는 항상 활성, 2.x는 패키지 import 시 켬)"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.get_option('mode.copy_on_write') is True
+
+
+def detach(df):
+    """캐시에 보관 중인 DataFrame을 호출 측에서 수정해도 원본이 바뀌지 않도록 분리
+
+    Copy-on-Write 환경(weekly_report import 시 켬)에서는 얕은 복사로 충분하고, 컬럼을 바꾸면 그 컬럼만 새로 만듭니다.
+    Copy-on-Write가 꺼져 있으면 시트 전체를 깊은 복사합니다.
+    """
+    return df.copy(deep=not _copy_on_write_enabled())
+
+
+def _read_bytes(source):
+    """파일 경로 또는 업로드된 파일 객체에서 전체 바이트를 읽기"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read()
+    # Streamlit UploadedFile 등 파일 객체
+    if hasattr(source, 'getvalue'):
+        return source.getvalue()
+    position = source.tell()
+    source.seek(0)
+    data = source.read()
+    source.seek(position)
+    return data
+
+
+def _load_from_sidecar(source, loader):
+    """로컬 파일이면 사이드카에서 읽기 (사이드카를 쓸 수 없으면 None)"""
+    if not isinstance(source, (str, os.PathLike)) or not sidecar.is_available():
+        return None
+    try:
+        return loader(source)
+    except OSError:
+        # 읽기 전용 폴더 등 사이드카를 만들 수 없는 환경
+        return None
+
+
+def content_hash(data):
+    """바이트 내용의 해시값 (캐시 키로 사용)"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class LRUCache:
+    """항목 수 제한이 있는 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """key에 해당하는 값 (없으면 None)"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_build(self, key, builder):
+        """key에 해당하는 값이 없으면 builder()로 만들어 저장"""
+        value = self.get(key)
+        if value is None:
+            value = builder()
+            self.put(key, value)
+        return value
+
+    def values(self):
+        """저장된 값 목록 (메모리 사용량 집계용 스냅샷)"""
+        with self._lock:
+            return list(self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+class WorkbookCache(LRUCache):
+    """파일 내용 해시 + 시트명 기준 LRU 캐시"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        super().__init__(max_entries)
+        # 로컬 파일은 (경로, 수정시각, 크기)가 같으면 해시를 다시 계산하지 않음 (파일 버전 수도 같은 한도로 제한)
+        self._path_hashes = LRUCache(max_entries)
+
+    def source_key(self, source):
+        """파일 내용 해시와 파싱용 바이트를 반환 (바이트는 이미 해시가 있으면 None)"""
+        if isinstance(source, (str, os.PathLike)):
+            stat = os.stat(source)
+            path_key = (os.path.abspath(source), stat.st_mtime_ns, stat.st_size)
+            digest = self._path_hashes.get(path_key)
+            if digest is not None:
+                return digest, None
+            data = _read_bytes(source)
+            digest = content_hash(data)
+            self._path_hashes.put(path_key, digest)
+            return digest, data
+        data = _read_bytes(source)
+        return content_hash(data), data
+
+    def sheet_names(self, source):
+        """워크북의 시트 목록"""
+        digest, data = self.source_key(source)
+        key = (digest, None)
+        names = self.get(key)
+        if names is None:
+            # 사이드카가 오래되었으면 시트 목록 때문에 워크북 전체를 변환하지 않음
+            names = _load_from_sidecar(source, lambda path: sidecar.sheet_names(path) if sidecar.is_fresh(path) else None)
+            if names is None:
+                if data is None:
+                    data = _read_bytes(source)
+                if streaming.is_xlsx(data):
+                    names = streaming.sheet_names(BytesIO(data))
+                else:
+                    with pd.ExcelFile(BytesIO(data)) as xls:
+                        names = list(xls.sheet_names)
+            self.put(key, names)
+        return list(names)
+
+    def read_sheet(self, source, sheet_name, columns=None):
+        """시트를 DataFrame으로 읽기 (같은 내용의 파일이면 캐시에서 반환)
+
+        columns: 읽을 컬럼 위치(int) 또는 컬럼명 목록 (None이면 전체, 원본 순서 유지)
+        시트 전체가 이미 캐시되어 있으면 다시 파싱하지 않고 그 중 필요한 컬럼만 잘라서 반환합니다.
+        """
+        digest, data = self.source_key(source)
+        key = (digest, sheet_name, None if columns is None else tuple(columns))
+        df = self.get(key)
+        if df is None and columns is not None:
+            full = self.get((digest, sheet_name, None))
+            if full is not None:
+                names = list(full.columns)
+                df = full[[names[pos] for pos in streaming.resolve_columns(names, columns)]]
+                self.put(key, df)
+        if df is None:
+            df = _load_from_sidecar(source, lambda path: sidecar.read_sheet(path, sheet_name, columns))
+            if df is not None:
+                self.put(key, df)
+        if df is None:
+            if data is None:
+                data = _read_bytes(source)
+            if streaming.is_xlsx(data):
+                df = streaming.read_sheet(BytesIO(data), sheet_name, columns=columns)
+            else:
+                df = pd.read_excel(BytesIO(data), sheet_name=sheet_name)
+                if columns is not None:
+                    names = list(df.columns)
+                    df = df[[names[pos] for pos in streaming.resolve_columns(names, columns)]]
+            self.put(key, df)
+        # 호출 측에서 컬럼을 추가/변환해도 캐시 원본이 바뀌지 않도록 분리
+        return detach(df)
+
+    def read_schema(self, source, sheet_name):
+        """시트 스키마 (컬럼명/타입, 화면별 사용 컬럼 결정용)
+
+        사이드카가 있으면 Arrow 헤더만 읽고, 없으면 시트 전체를 읽어(캐시) 스키마를 만듭니다.
+        """
+        digest, _ = self.source_key(source)
+        return self.get_or_build(
+            ('schema', digest, sheet_name),
+            lambda: (_load_from_sidecar(source, lambda path: sidecar.read_schema(path, sheet_name))
+                     or SheetSchema.from_frame(self.read_sheet(source, sheet_name))),
+        )
+
+    def read_columns(self, source, sheet_name):
+        """시트 컬럼명 목록 (스키마/시트가 캐시되어 있으면 그대로, 없으면 헤더 행만 읽음)"""
+        digest, data = self.source_key(source)
+        schema = self.get(('schema', digest, sheet_name))
+        if schema is not None:
+            return list(schema.columns)
+        full = self.get((digest, sheet_name, None))
+        if full is not None:
+            return list(full.columns)
+        return self.get_or_build(('columns', digest, sheet_name), lambda: self._read_header(source, digest, data, sheet_name))
+
+    def _read_header(self, source, digest, data, sheet_name):
+        schema = _load_from_sidecar(source, lambda path: sidecar.read_schema(path, sheet_name))
+        if schema is not None:
+            self.put(('schema', digest, sheet_name), schema)
+            return list(schema.columns)
+        if data is None:
+            data = _read_bytes(source)
+        if streaming.is_xlsx(data):
+            return streaming.read_header(BytesIO(data), sheet_name)
+        return list(self.read_sheet(source, sheet_name).columns)
+
+    def data_version(self, source):
+        """파일 내용 해시 (파생 집계 캐시의 데이터 버전 키로 사용)"""
+        return self.source_key(source)[0]
+
+    def clear(self):
+        super().clear()
+        self._path_hashes.clear()
+
+
+# 프로세스 전역 캐시 (Streamlit 세션/재실행 간 공유)
+default_cache = WorkbookCache()
+
+
+def sheet_names(source):
+    return default_cache.sheet_names(source)
+
+
+def read_sheet(source, sheet_name, columns=None):
+    return default_cache.read_sheet(source, sheet_name, columns)
+
+
+def read_schema(source, sheet_name):
+    return default_cache.read_schema(source, sheet_name)
+
+
+def read_columns(source, sheet_name):
+    return default_cache.read_columns(source, sheet_name)
+
+
+def data_version(source):
+    return default_cache.data_version(source)
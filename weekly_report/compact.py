@@ -0,0 +1,165 @@
+"""
+적재한 시트의 메모리 사용량 줄이기 (카테고리 / 작은 정수 타입)
+
+플랫폼, 업체명, 담당자, 파트처럼 고유값이 적은 문자열 컬럼은 행마다 문자열을 들고 있지 않고
+카테고리(정렬된 고유값 목록 + 행별 정수 코드)로, 정수 금액/수량 컬럼은 값 범위에 맞으면 int32로 변환합니다.
+파트 판별처럼 행마다 문자열을 비교하던 작업은 고유값에 대해서만 한 번 비교한 뒤
+행에는 정수 코드로 펼쳐서 적용합니다 (category_mask).
+"""
+
+import numpy as np
+import pandas as pd
+
+# 고유값 수가 값이 있는 행 수의 이 비율 이하인 문자열 컬럼만 카테고리로 변환 (주문번호 등 ID 컬럼 제외)
+CATEGORY_MAX_RATIO = 0.5
+# 정수 컬럼 변환 타입 (int8/int16은 곱셈 등에서 overflow 위험이 있어 사용하지 않음)
+COMPACT_INT_DTYPE = np.dtype('int32')
+
+
+def is_categorical(series):
+    return isinstance(series.dtype, pd.CategoricalDtype)
+
+
+def _is_text(series):
+    if not (series.dtype == object or pd.api.types.is_string_dtype(series.dtype)) or is_categorical(series):
+        return False
+    values = series.dropna()
+    return len(values) > 0 and all(isinstance(value, str) for value in values)
+
+
+def _fits_compact_int(series):
+    info = np.iinfo(COMPACT_INT_DTYPE)
+    return len(series) == 0 or (series.min() >= info.min and series.max() <= info.max)
+
+
+def compact_column(series):
+    """고유값이 적은 문자열 컬럼은 카테고리로, int64 컬럼은 값 범위에 맞으면 int32로 변환"""
+    if _is_text(series):
+        if series.nunique() <= CATEGORY_MAX_RATIO * series.notna().sum():
+            return series.astype('category')
+        return series
+    if series.dtype == np.int64 and _fits_compact_int(series):
+        return series.astype(COMPACT_INT_DTYPE)
+    return series
+
+
+def compact_frame(df):
+    """컬럼별 compact_column을 적용한 DataFrame (변환하지 않는 컬럼은 복사하지 않음)"""
+    return pd.DataFrame({col: compact_column(df[col]) for col in df.columns}, index=df.index, copy=False)
+
+
+def source_dtype(series):
+    """변환 전 원래 타입 (새로 읽은 행을 기존 컬럼 타입에 맞출 때 사용)"""
+    if is_categorical(series):
+        return series.cat.categories.dtype
+    if series.dtype == COMPACT_INT_DTYPE:
+        return np.dtype('int64')
+    return series.dtype
+
+
+def _append_categorical(base, new):
+    values = new.astype(new.cat.categories.dtype) if is_categorical(new) else new
+    extra = pd.Index(values.dropna().unique()).difference(base.cat.categories)
+    if len(extra) > 0:
+        # 카테고리 순서를 값 순서로 유지 (정렬/groupby 결과가 문자열 컬럼과 같도록)
+        base = base.cat.set_categories(base.cat.categories.append(extra).sort_values())
+    return pd.concat([base, values.astype(base.dtype)])
+
+
+def append_rows(frame, delta):
+    """compact_frame으로 변환한 frame 뒤에 delta 행을 붙임 (컬럼 타입은 frame 기준 유지)
+
+    카테고리 컬럼은 새 값이 있을 때만 카테고리를 추가하고,
+    int32 컬럼은 새 값이 범위를 벗어나면 int64로 되돌립니다.
+    """
+    columns = {}
+    for col in frame.columns:
+        base = frame[col]
+        new = delta[col]
+        if is_categorical(base):
+            columns[col] = _append_categorical(base, new)
+            continue
+        if is_categorical(new):
+            new = new.astype(new.cat.categories.dtype)
+        combined = pd.concat([base, new])
+        if base.dtype == COMPACT_INT_DTYPE and combined.dtype == np.int64 and _fits_compact_int(combined):
+            combined = combined.astype(COMPACT_INT_DTYPE)
+        columns[col] = combined
+    return pd.DataFrame(columns, copy=False)
+
+
+def concat_frames(frames):
+    """compact_frame으로 변환한 DataFrame들을 위아래로 합침 (카테고리/int32 타입 유지, 없는 컬럼은 빈 값)
+
+    합친 결과의 인덱스는 0부터 다시 매깁니다.
+    """
+    columns = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+    combined = None
+    start = 0
+    for frame in frames:
+        frame = frame.reindex(columns=columns).set_axis(pd.RangeIndex(start, start + len(frame)))
+        start += len(frame)
+        combined = frame if combined is None else append_rows(combined, frame)
+    return combined
+
+
+def category_mask(series, predicate):
+    """문자열 조건을 고유값에 한 번만 적용하고 행에는 정수 코드로 펼친 bool Series
+
+    predicate: 값 Series → bool Series (예: lambda s: s.str.contains('1파트'))
+    카테고리 컬럼이 아니면 행 전체에 predicate를 적용합니다. 빈 값은 False.
+    """
+    if not is_categorical(series):
+        return predicate(series).fillna(False).astype(bool)
+    hits = predicate(pd.Series(series.cat.categories)).fillna(False).to_numpy(dtype=bool)
+    # 빈 값의 코드(-1)는 마지막에 붙인 False를 가리킴
+    hits = np.append(hits, False)
+    return pd.Series(hits[series.cat.codes.to_numpy()], index=series.index)
+
+
+def value_counts(series):
+    """`series.value_counts()`와 같은 결과 (카테고리 컬럼도 행에 없는 카테고리는 빼고, 건수가 같으면 먼저 나타난 값 우선)"""
+    if not is_categorical(series):
+        return series.value_counts()
+    counts = series.groupby(series, sort=False, observed=True).size()
+    counts = counts.sort_values(ascending=False, kind='stable')
+    counts.name = 'count'
+    return counts
+
+
+def strip_values(series):
+    """문자열 앞뒤 공백 제거 (`series.astype(str).str.strip()`, 카테고리 컬럼은 고유값에만 적용)"""
+    if not is_categorical(series):
+        return series.astype(str).str.strip()
+    stripped = pd.Index(series.cat.categories.astype(str).str.strip())
+    if stripped.equals(series.cat.categories):
+        return series
+    # 공백을 뺀 값으로 카테고리를 다시 정렬하고, 공백만 다른 값은 하나의 카테고리로 합침
+    categories, inverse = np.unique(stripped.to_numpy(dtype=object), return_inverse=True)
+    codes = series.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, inverse[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=series.index, name=series.name)
+
+
+def memory_report(df):
+    """compact_frame으로 변환한 DataFrame의 컬럼별 변환 전/후 타입과 메모리 사용량 (KB), 마지막 행은 합계
+
+    변환 전 크기는 컬럼을 원래 타입으로 되돌려서 측정합니다.
+    """
+    rows = []
+    for col in df.columns:
+        after = df[col]
+        before = after.astype(source_dtype(after))
+        rows.append({
+            '컬럼': col,
+            '변환 전 타입': str(before.dtype),
+            '변환 후 타입': str(after.dtype),
+            '변환 전 (KB)': before.memory_usage(deep=True, index=False) / 1024,
+            '변환 후 (KB)': after.memory_usage(deep=True, index=False) / 1024,
+        })
+    report = pd.DataFrame(rows)
+    total = {
+        '컬럼': '합계', '변환 전 타입': '', '변환 후 타입': '',
+        '변환 전 (KB)': report['변환 전 (KB)'].sum(), '변환 후 (KB)': report['변환 후 (KB)'].sum(),
+    }
+    return pd.concat([report, pd.DataFrame([total])], ignore_index=True)
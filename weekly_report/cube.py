@@ -0,0 +1,127 @@
+"""
+사전 집계 큐브
+
+(년, 월, 주차, 일, 파트, 플랫폼) 조합별 건수와 금액 합계를 데이터 버전마다 한 번만 계산해 두고,
+대시보드의 차트/KPI 카드는 원본 행 대신 작은 큐브를 잘라서(slice) 사용합니다.
+큐브 행 수는 차원 조합 수에 비례하므로 원본 파일이 커져도 화면 조작 비용은 거의 늘지 않습니다.
+"""
+
+import pandas as pd
+
+from weekly_report.cache import LRUCache
+
+# 큐브 행 수 컬럼명
+COUNT_COLUMN = '건수'
+
+# 데이터 버전 + 필터 상태별 큐브 캐시
+cube_cache = LRUCache(max_entries=32)
+
+
+def _count_column(measure):
+    """측정값별 비어있지 않은 행 수 컬럼명"""
+    return f'{measure}_건수'
+
+
+class AggregateCube:
+    """차원 조합별 건수/합계 테이블"""
+
+    def __init__(self, table, dimensions, measures):
+        self.table = table
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+
+    @property
+    def value_columns(self):
+        columns = [COUNT_COLUMN]
+        for measure in self.measures:
+            columns += [measure, _count_column(measure)]
+        return columns
+
+    def has_dimension(self, dimension):
+        return dimension in self.dimensions
+
+    def total(self, column=COUNT_COLUMN):
+        """전체 합계 (기본: 전체 행 수)"""
+        return self.table[column].sum()
+
+    def filter(self, where):
+        """{차원: 허용 값 목록} 조건에 맞는 조합만 남긴 큐브 (원본 행을 같은 조건으로 거른 것과 같음)"""
+        table = self.table
+        for dimension, values in where.items():
+            table = table[table[dimension].isin(list(values))]
+        return AggregateCube(table, self.dimensions, self.measures)
+
+    def merge(self, other):
+        """같은 구성의 두 큐브를 합친 큐브 (예: 기존 큐브 + 새로 추가된 행의 큐브)"""
+        table = pd.concat([self.table, other.table], ignore_index=True)
+        keys = self.dimensions or ['전체']
+        table = table.groupby(keys, dropna=False, sort=False, observed=True)[self.value_columns].sum().reset_index()
+        return AggregateCube(table, self.dimensions, self.measures)
+
+    def slice(self, by, where=None, dropna=True, sort=False):
+        """by 차원 기준으로 다시 집계한 작은 DataFrame
+
+        where: {차원: 허용 값 목록} 조건으로 큐브 행을 먼저 거름
+        dropna/sort: pandas groupby와 같은 의미 (원본 행 기준 groupby와 결과가 같음)
+        """
+        cube = self.filter(where) if where else self
+        grouped = cube.table.groupby(list(by), dropna=dropna, sort=sort, observed=True)[self.value_columns].sum()
+        return grouped.reset_index()
+
+    def value_counts(self, dimension):
+        """`df[dimension].value_counts()`와 같은 결과 (건수 내림차순)"""
+        counts = self.table.groupby(dimension, sort=False, observed=True)[COUNT_COLUMN].sum()
+        counts = counts.sort_values(ascending=False, kind='stable')
+        counts.name = 'count'
+        return counts
+
+    def sums(self, dimension, measure):
+        """`df.groupby(dimension)[측정값 컬럼].sum()`과 같은 결과 (차원 값 순 정렬)"""
+        sums = self.table.groupby(dimension, observed=True)[measure].sum()
+        sums.name = measure
+        return sums
+
+
+def build_cube(df, measures, date_col=None, part_col=None, platform_col=None):
+    """DataFrame에서 큐브 생성
+
+    measures: {측정값명: 원본 컬럼명} (숫자형이 아니면 숫자로 변환하여 집계)
+    date_col: 있으면 년/월/주차/일 차원을 날짜 컬럼에서 생성
+    part_col, platform_col: 있으면 각각 파트/플랫폼 차원으로 사용 (차원명은 원본 컬럼명)
+    """
+    dims = {}
+    if date_col is not None and date_col in df.columns:
+        dates = pd.to_datetime(df[date_col], errors='coerce')
+        dims['년'] = dates.dt.year
+        dims['월'] = dates.dt.month
+        dims['주차'] = dates.dt.isocalendar().week
+        dims['일'] = dates.dt.day
+    if part_col is not None and part_col in df.columns:
+        dims[part_col] = df[part_col]
+    if platform_col is not None and platform_col in df.columns and platform_col not in dims:
+        dims[platform_col] = df[platform_col]
+
+    frame = pd.DataFrame(dims, index=df.index)
+    if len(dims) == 0:
+        # 차원이 없으면 전체를 하나의 조합으로 집계
+        frame['전체'] = '전체'
+    for measure, col in measures.items():
+        values = df[col]
+        if not pd.api.types.is_numeric_dtype(values):
+            values = pd.to_numeric(values, errors='coerce')
+        frame[measure] = values
+
+    grouped = frame.groupby(list(dims) or ['전체'], dropna=False, sort=False, observed=True)
+    table = grouped.size().to_frame(COUNT_COLUMN)
+    for measure in measures:
+        table[measure] = grouped[measure].sum()
+        table[_count_column(measure)] = grouped[measure].count()
+    return AggregateCube(table.reset_index(), list(dims), list(measures))
+
+
+def get_cube(key, df, measures, date_col=None, part_col=None, platform_col=None):
+    """데이터 버전/필터 상태 key 기준으로 캐시된 큐브 반환 (없으면 생성)"""
+    return cube_cache.get_or_build(
+        key,
+        lambda: build_cube(df, measures, date_col=date_col, part_col=part_col, platform_col=platform_col),
+    )
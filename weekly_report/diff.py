@@ -0,0 +1,264 @@
+"""
+회의록 두 버전의 행 단위 비교
+
+"지난주 회의 이후 무엇이 바뀌었나"에 답하기 위해 같은 시트의 두 버전(이전/현재)을 비교해
+추가/삭제/수정된 행과 파트별 N열(매출총이익) 합계 변화를 구합니다.
+
+행마다 해시값을 만들어 해시 테이블로 짝을 맞추므로 비용은 행 수에 비례합니다.
+1. 모든 컬럼 값이 같은 행끼리 짝을 맞춤 (변경 없음, 같은 행이 여러 개면 개수만큼만)
+2. 남은 행은 키 컬럼(기본값: 파트를 제외한 숫자가 아닌 컬럼 - 플랫폼/주문번호/상품/날짜 등) 값이 같은 행끼리 짝을 맞춤 (수정)
+3. 그래도 짝이 없는 이전 행은 삭제, 현재 행은 추가
+   (숫자 컬럼은 float로 통일해 비교하므로 버전마다 정수/실수로 다르게 읽힌 같은 값은 같은 값으로 봄)
+
+버전은 엑셀 파일 경로 또는 이력 저장소(weekly_report.history)의 버전 이름/id로 지정하며,
+파일 경로는 이력 저장소에 저장한 뒤(이미 있으면 파싱하지 않음) 읽습니다.
+
+사용 예:
+    python -m weekly_report.diff D9787000 주간회의록.xlsx
+    python -m weekly_report.diff 27F16B40 D9787000 --sheet "11월 raw" --rows 20
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from weekly_report import history
+from weekly_report.cache import LRUCache
+from weekly_report.prepare import MONTH_SHEET_KEYWORDS, P_COLUMN_INDEX, add_part_column, default_sheet, is_month_sheet
+from weekly_report.profile import get_profile
+from weekly_report.schema import SheetSchema
+
+# 수정된 행에 추가하는 변경 컬럼 목록 컬럼
+CHANGED_COLUMNS = '변경 컬럼'
+# 파트 컬럼명과 파트 컬럼이 없는 시트의 파트 이름
+PART_COLUMN = '파트'
+ALL_PARTS = '전체'
+
+# (이전 버전, 현재 버전, 시트, 키 컬럼)별 비교 결과 캐시
+diff_cache = LRUCache(max_entries=8)
+
+
+def _occurrence_keys(hashes):
+    """해시값 + 같은 해시값 안에서의 순번 → 행마다 고유한 키 (같은 행이 여러 개여도 개수만큼 짝을 맞춤)"""
+    occurrence = pd.Series(hashes).groupby(hashes).cumcount().to_numpy(dtype=np.uint64)
+    return pd.util.hash_pandas_object(pd.DataFrame({'hash': hashes, 'n': occurrence}), index=False).to_numpy()
+
+
+def _match(old_hashes, new_hashes):
+    """해시값이 같은 행 짝 (이전 위치 배열, 현재 위치 배열)"""
+    found = pd.Index(_occurrence_keys(old_hashes)).get_indexer(_occurrence_keys(new_hashes))
+    new_positions = np.flatnonzero(found >= 0)
+    return found[new_positions], new_positions
+
+
+def _hashable(df):
+    """행 해시용 DataFrame (숫자 컬럼은 float로 통일해 버전마다 int/float로 다르게 읽힌 같은 값이 같은 해시가 되도록)"""
+    numeric = {
+        col: df[col].astype('float64') for col in df.columns
+        if pd.api.types.is_numeric_dtype(df[col].dtype) and not pd.api.types.is_bool_dtype(df[col].dtype)
+    }
+    return df.assign(**numeric) if numeric else df
+
+
+def _differs(old_values, new_values):
+    """같은 위치 값이 다른지 (둘 다 결측값이면 같음)"""
+    old_values = old_values.reset_index(drop=True)
+    new_values = new_values.reset_index(drop=True)
+    both_missing = old_values.isna() & new_values.isna()
+    try:
+        equal = old_values == new_values
+    except TypeError:
+        # 버전마다 타입이 다른 컬럼은 문자열로 비교
+        equal = old_values.astype(str) == new_values.astype(str)
+    return ~(equal.fillna(False).astype(bool) | both_missing).to_numpy()
+
+
+def default_key_columns(df, exclude=()):
+    """기본 키 컬럼 (숫자가 아닌 컬럼, 없으면 첫 번째 컬럼)
+
+    exclude: 키에서 뺄 컬럼 (예: 담당자에서 파생한 파트 컬럼 - 바뀌면 삭제/추가가 아니라 수정으로 봄)
+    """
+    columns = [
+        col for col in df.columns
+        if col not in exclude and not pd.api.types.is_numeric_dtype(df[col].dtype)
+    ]
+    return columns or list(df.columns[:1])
+
+
+class SheetDiff:
+    """두 버전 시트의 비교 결과
+
+    added: 현재 버전에만 있는 행, removed: 이전 버전에만 있는 행
+    modified: 수정된 행의 현재 값 (+ 변경 컬럼), modified_before: 같은 순서의 이전 값
+    parts: 파트별 N열 합계 변화 (이전/현재 합계, 추가/삭제/수정분)
+    """
+
+    def __init__(self, old, new, key_columns=None, amount_col=None, part_col=None):
+        common = [col for col in new.columns if col in old.columns]
+        self.added_columns = [col for col in new.columns if col not in old.columns]
+        self.removed_columns = [col for col in old.columns if col not in new.columns]
+        self.key_columns = [col for col in (key_columns or default_key_columns(new[common], exclude=[part_col])) if col in common]
+        self.amount_col = amount_col if amount_col in common else None
+        self.old_rows = len(old)
+        self.new_rows = len(new)
+
+        # 1. 모든 공통 컬럼 값이 같은 행
+        old_same, new_same = _match(history.row_hashes(_hashable(old[common])), history.row_hashes(_hashable(new[common])))
+        old_left = np.setdiff1d(np.arange(len(old)), old_same, assume_unique=True)
+        new_left = np.setdiff1d(np.arange(len(new)), new_same, assume_unique=True)
+        self.unchanged = len(new_same)
+
+        # 2. 남은 행 중 키 컬럼 값이 같은 행
+        old_keys = history.row_hashes(old[self.key_columns].iloc[old_left])
+        new_keys = history.row_hashes(new[self.key_columns].iloc[new_left])
+        old_pair, new_pair = _match(old_keys, new_keys)
+        old_modified = old_left[old_pair]
+        new_modified = new_left[new_pair]
+
+        # 3. 짝이 없는 행
+        self.removed = old.iloc[np.setdiff1d(old_left, old_modified, assume_unique=True)]
+        self.added = new.iloc[np.setdiff1d(new_left, new_modified, assume_unique=True)]
+
+        self.modified_before = old.iloc[old_modified]
+        self.modified = new.iloc[new_modified]
+        changed = {col: _differs(self.modified_before[col], self.modified[col]) for col in common}
+        labels = pd.Series('', index=self.modified.index, dtype=object)
+        for col in common:
+            labels = labels.where(~changed[col], labels + f'{col}, ')
+        self.modified = self.modified.assign(**{CHANGED_COLUMNS: labels.str[:-2]})
+
+        self.parts = self._part_summary(old, new, part_col)
+
+    def _part_summary(self, old, new, part_col):
+        """파트별 N열 합계 (이전, 현재, 변화) + 변화 내역 (추가/삭제/수정분)"""
+        if self.amount_col is None:
+            return pd.DataFrame()
+
+        def totals(df):
+            amounts = pd.to_numeric(df[self.amount_col], errors='coerce')
+            parts = df[part_col].astype(str) if part_col in df.columns else pd.Series(ALL_PARTS, index=df.index)
+            return amounts.groupby(parts.to_numpy()).sum()
+
+        modified_change = (
+            pd.to_numeric(self.modified[self.amount_col], errors='coerce').to_numpy()
+            - pd.to_numeric(self.modified_before[self.amount_col], errors='coerce').to_numpy()
+        )
+        modified_parts = (self.modified[part_col].astype(str) if part_col in self.modified.columns
+                          else pd.Series(ALL_PARTS, index=self.modified.index))
+        summary = pd.DataFrame({
+            '이전 합계': totals(old),
+            '현재 합계': totals(new),
+            '추가분': totals(self.added),
+            '삭제분': -totals(self.removed),
+            '수정분': pd.Series(modified_change).groupby(modified_parts.to_numpy()).sum(),
+        }).fillna(0).astype('float64')
+        summary['변화'] = summary['현재 합계'] - summary['이전 합계']
+        summary.index.name = '파트'
+        return summary.reset_index()
+
+    def summary(self):
+        """행 수 요약"""
+        return {
+            '이전 행 수': self.old_rows,
+            '현재 행 수': self.new_rows,
+            '추가': len(self.added),
+            '삭제': len(self.removed),
+            '수정': len(self.modified),
+            '변경 없음': self.unchanged,
+        }
+
+
+def with_parts(df):
+    """대시보드와 같은 파트 컬럼을 붙인 DataFrame (P열 담당자 → 파트 매핑)
+
+    담당자 컬럼이 생기기 전 버전처럼 P열이 이미 파트 컬럼이거나 P열이 없으면 그대로 반환합니다.
+    """
+    if len(df.columns) <= P_COLUMN_INDEX or df.columns[P_COLUMN_INDEX] == PART_COLUMN:
+        return df
+    return add_part_column(df.copy(deep=False))
+
+
+def amount_column(df):
+    """N열(매출총이익) 컬럼 (대시보드와 같은 컬럼 프로파일 사용)"""
+    return get_profile(df.columns, lambda: SheetSchema.from_frame(df)).column('amount')
+
+
+def match_sheet(sheet_names, sheet_name):
+    """다른 버전에서 같은 시트 찾기 (이름이 같은 시트, 없으면 같은 월 시트 - 예: '11월 raw' ↔ '2025년 11월 raw')"""
+    if sheet_name in sheet_names:
+        return sheet_name
+    for month in MONTH_SHEET_KEYWORDS:
+        if is_month_sheet(sheet_name, month):
+            return next((name for name in sheet_names if is_month_sheet(name, month)), None)
+    return None
+
+
+def resolve_version(store, ref):
+    """엑셀 파일 경로면 이력 저장소에 저장한 뒤 그 버전, 아니면 저장소의 버전 이름/id"""
+    if os.path.isfile(ref):
+        return store.ingest(ref)
+    return store.version(ref)
+
+
+def diff_versions(store, old_ref, new_ref, sheet_name=None, key_columns=None):
+    """이력 저장소의 두 버전 비교 (sheet_name이 없으면 현재 버전의 기본 시트(11월, 없으면 12월))
+
+    반환: (이전 시트명, 현재 시트명, SheetDiff)
+    """
+    old_version = resolve_version(store, old_ref)
+    new_version = resolve_version(store, new_ref)
+    new_sheets = store.sheet_names(new_version['id'])
+    new_sheet = match_sheet(new_sheets, sheet_name) if sheet_name else default_sheet(new_sheets) or new_sheets[0]
+    old_sheet = match_sheet(store.sheet_names(old_version['id']), new_sheet) if new_sheet else None
+    if new_sheet is None or old_sheet is None:
+        raise KeyError(f"두 버전에서 같은 시트를 찾을 수 없습니다: {sheet_name or new_sheet}")
+
+    def build():
+        old = with_parts(store.read_sheet(old_version['id'], old_sheet))
+        new = with_parts(store.read_sheet(new_version['id'], new_sheet))
+        return SheetDiff(old, new, key_columns=key_columns, amount_col=amount_column(new), part_col=PART_COLUMN)
+
+    key = (store.root, old_version['id'], new_version['id'], old_sheet, new_sheet, tuple(key_columns or ()))
+    return old_sheet, new_sheet, diff_cache.get_or_build(key, build)
+
+
+def _print_rows(title, df, rows):
+    if len(df) == 0:
+        return
+    print(f"\n[{title}] {len(df):,}행" + (f" (처음 {rows}행)" if len(df) > rows else ""))
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        print(df.head(rows).to_string(index=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m weekly_report.diff', description="회의록 두 버전의 행 단위 비교")
+    parser.add_argument('old', help="이전 버전 (엑셀 파일 경로 또는 이력 저장소 버전 이름/id)")
+    parser.add_argument('new', help="현재 버전 (엑셀 파일 경로 또는 이력 저장소 버전 이름/id)")
+    parser.add_argument('--sheet', help="비교할 시트 (기본값: 11월 시트, 없으면 12월 시트)")
+    parser.add_argument('--key', help="수정 행을 찾을 키 컬럼 (쉼표로 구분, 기본값: 숫자가 아닌 컬럼)")
+    parser.add_argument('--rows', type=int, default=10, help="추가/삭제/수정 행 출력 수 (기본값: 10)")
+    parser.add_argument('--history', default=history.HISTORY_DIR, help="이력 저장소 폴더")
+    args = parser.parse_args(argv)
+
+    store = history.HistoryStore(args.history)
+    key_columns = args.key.split(',') if args.key else None
+    old_sheet, new_sheet, result = diff_versions(store, args.old, args.new, args.sheet, key_columns)
+
+    print(f"{args.old} / {old_sheet}  →  {args.new} / {new_sheet}")
+    print(', '.join(f"{name} {count:,}" for name, count in result.summary().items()))
+    if result.added_columns or result.removed_columns:
+        print(f"추가된 컬럼: {result.added_columns}, 삭제된 컬럼: {result.removed_columns}")
+    if len(result.parts):
+        print(f"\n파트별 {result.amount_col} 합계 변화")
+        print(result.parts.to_string(index=False, float_format=lambda value: f"{value:,.0f}"))
+    _print_rows("추가", result.added, args.rows)
+    _print_rows("삭제", result.removed, args.rows)
+    _print_rows("수정", result.modified[[*result.key_columns[:3], CHANGED_COLUMNS]], args.rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+CSV/Excel 다운로드 파일 생성
+
+다운로드 버튼을 그릴 때마다 파일을 미리 만들지 않고, 버튼을 눌렀을 때만 생성합니다.
+(Streamlit 1.52.0부터 download_button의 data에 함수를 넘기면 클릭 시점에 호출됨, requirements.txt 참고)
+DataFrame 대신 DataFrame을 반환하는 함수를 넘기면 정렬/필터 결과 DataFrame도 클릭 시점에 만듭니다.
+생성된 파일은 데이터 버전 + 필터 상태 key별로 캐시해 같은 조건의 다운로드는 다시 만들지 않습니다.
+다운로드 버튼은 파일 내용을 bytes로 받으므로 다운로드 파일은 메모리에 한 번에 만들고,
+파일로 저장할 때(write_csv, python -m weekly_report build)만 행 묶음 단위로 나눠서 씁니다.
+"""
+
+from io import BytesIO
+
+import pandas as pd
+
+from weekly_report.cache import LRUCache
+
+CSV_MIME = 'text/csv'
+EXCEL_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# 파일로 저장할 때 이 행 수 단위로 나눠서 CSV로 변환
+CSV_CHUNK_ROWS = 50_000
+
+# (파일 형식, 데이터 버전 + 필터 상태)별 생성된 파일 캐시
+export_cache = LRUCache(max_entries=16)
+
+
+def iter_csv_chunks(df, chunk_rows=CSV_CHUNK_ROWS, encoding='utf-8-sig'):
+    """`df.to_csv(index=False).encode(encoding)`을 행 묶음 단위 bytes로 나눠서 생성
+
+    첫 묶음에만 헤더와 BOM(utf-8-sig)이 붙으므로 이어 붙이면 한 번에 변환한 결과와 같습니다.
+    """
+    # 두 번째 묶음부터는 BOM 없이 인코딩
+    body_encoding = 'utf-8' if encoding == 'utf-8-sig' else encoding
+    yield df.iloc[:0].to_csv(index=False).encode(encoding)
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=False, header=False).encode(body_encoding)
+
+
+def write_csv(df, file, chunk_rows=CSV_CHUNK_ROWS):
+    """엑셀에서 바로 열리는 CSV(utf-8-sig)를 바이너리 파일 객체에 행 묶음 단위로 쓰기
+
+    CSV 전체를 메모리에 만들지 않고 한 묶음씩 변환해 바로 씁니다.
+    """
+    for chunk in iter_csv_chunks(df, chunk_rows=chunk_rows):
+        file.write(chunk)
+
+
+def csv_bytes(df):
+    """엑셀에서 바로 열리는 CSV 파일 내용 (utf-8-sig, 다운로드 버튼용으로 파일 전체를 bytes로 만듦)"""
+    return df.to_csv(index=False).encode('utf-8-sig')
+
+
+def excel_bytes(sheets):
+    """{시트명: DataFrame}을 시트별로 저장한 xlsx 파일 내용"""
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, index=False, sheet_name=sheet_name)
+    return output.getvalue()
+
+
+def _frame(df):
+    return df() if callable(df) else df
+
+
+def lazy_csv(key, df):
+    """download_button에 넘길 CSV 생성 함수 (클릭 시 생성, key별 캐시)
+
+    df: DataFrame 또는 DataFrame을 반환하는 함수
+    """
+    return lambda: export_cache.get_or_build(('csv', key), lambda: csv_bytes(_frame(df)))
+
+
+def lazy_excel(key, sheets):
+    """download_button에 넘길 xlsx 생성 함수 (클릭 시 생성, key별 캐시)
+
+    sheets: {시트명: DataFrame 또는 DataFrame을 반환하는 함수}
+    """
+    return lambda: export_cache.get_or_build(
+        ('xlsx', key), lambda: excel_bytes({name: _frame(df) for name, df in sheets.items()})
+    )
@@ -0,0 +1,47 @@
+"""
+차트 Figure 캐시
+
+Plotly Express로 Figure를 만드는 비용(차트당 수십 ms)이 차트 데이터 집계보다 크므로,
+재실행마다 모든 차트를 다시 만들지 않고 차트 입력이 같으면 이전에 만든 Figure를 재사용합니다.
+
+차트 입력은 데이터 버전과 필터 상태로 정해지는 작은 집계 결과(큐브 slice 등)이므로,
+캐시 키는 (차트 이름, 입력 데이터 내용 지문, 제목/컬럼명 등 차트 설정)입니다.
+검색어 입력이나 다른 섹션의 시트 선택처럼 차트 입력에 영향이 없는 위젯을 조작하면
+Figure 생성 없이 캐시된 Figure를 그대로 그리고, 입력이 바뀐 차트만 다시 만듭니다.
+
+캐시된 Figure는 모든 세션이 함께 사용하므로 받은 쪽에서 수정하면 안 됩니다
+(st.plotly_chart는 Figure를 수정하지 않고 직렬화만 함).
+
+사용 예:
+    fig = figures.get_figure('weekly_count', weekly_data, build_weekly_chart, month_display)
+    st.plotly_chart(fig, use_container_width=True)
+"""
+
+import hashlib
+
+import pandas as pd
+
+from weekly_report.cache import LRUCache
+
+# (차트 이름, 입력 데이터 지문, 차트 설정)별 Figure 캐시
+figure_cache = LRUCache(max_entries=64)
+
+
+def fingerprint(data):
+    """DataFrame/Series 내용 지문 (컬럼명, dtype, 인덱스와 값이 모두 같으면 같은 값)"""
+    if isinstance(data, pd.Series):
+        header = (data.name, str(data.dtype), data.index.name)
+    else:
+        header = (list(data.columns), [str(dtype) for dtype in data.dtypes], data.index.name)
+    digest = hashlib.blake2b(repr(header).encode('utf-8'), digest_size=16)
+    digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def get_figure(name, data, build, *params):
+    """차트 입력 data와 설정 params가 같으면 캐시된 Figure 반환, 아니면 build(data, *params)로 생성
+
+    build는 인자로 받은 data와 params만으로 Figure를 만들어야 합니다.
+    """
+    key = (name, fingerprint(data), params)
+    return figure_cache.get_or_build(key, lambda: build(data, *params))
@@ -0,0 +1,64 @@
+"""
+표 표시 형식
+
+대시보드 표의 숫자 컬럼은 문자열로 바꾸지 않고 숫자 그대로 두며,
+천단위 구분 기호와 단위(원/건)는 표 컬럼의 표시 형식으로만 붙입니다.
+행마다 파이썬 포맷팅을 하지 않고, 표에서 컬럼을 눌러 정렬해도 숫자 순서로 정렬됩니다.
+
+형식 문자열은 printf 형식(Streamlit NumberColumn의 format, `,`는 천단위 구분 기호)이며,
+이 모듈은 Streamlit을 import하지 않으므로 대시보드에서 st.column_config.NumberColumn으로 감싸 사용합니다.
+
+사용 예:
+    formats = formatting.number_formats(df, ['정산금액'], formatting.WON)
+    st.dataframe(df, column_config={col: st.column_config.NumberColumn(format=fmt) for col, fmt in formats.items()})
+"""
+
+import pandas as pd
+
+# 천단위 구분 기호 (1,234) - 소수점 이하는 버림
+THOUSANDS = '%,d'
+# 금액 (1,234원)
+WON = '%,d원'
+# 건수 (1,234건)
+COUNT = '%,d건'
+# 비율 (95.8%)
+PERCENT = '%.1f%%'
+
+
+def numeric_columns(df):
+    """숫자형(bool 제외) 컬럼 목록"""
+    return [
+        col for col, dtype in df.dtypes.items()
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+    ]
+
+
+def number_formats(df, columns=None, fmt=THOUSANDS):
+    """컬럼별 표시 형식 {컬럼: 형식 문자열}
+
+    columns: 형식을 적용할 컬럼 (None이면 df의 모든 숫자 컬럼, df에 없는 컬럼은 무시)
+    """
+    if columns is None:
+        columns = numeric_columns(df)
+    return {col: fmt for col in columns if col in df.columns}
+
+
+def fill_missing(df, columns, value=0):
+    """표시할 숫자 컬럼의 결측값을 value로 채운 DataFrame (결측값이 없으면 df를 그대로 반환)
+
+    기존 문자열 표시에서 결측값을 "0"으로 보여주던 것과 같게 표시하기 위해 사용합니다.
+    """
+    columns = [col for col in columns if col in df.columns]
+    if not columns or not df[columns].isna().any().any():
+        return df
+    return df.fillna({col: value for col in columns})
+
+
+def format_value(value, fmt=THOUSANDS):
+    """값 하나를 표시 형식 문자열로 변환 (PDF 등 정적 문서용, 결측값은 '-')"""
+    if pd.isna(value):
+        return '-'
+    if '%,d' in fmt:
+        head, _, tail = fmt.partition('%,d')
+        return f"{head}{value:,.0f}{tail}"
+    return fmt % value
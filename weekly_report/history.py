@@ -0,0 +1,325 @@
+"""
+주간 회의록 스냅샷 이력 저장소
+
+엑셀이 저장할 때 남기는 확장자 없는 16진수 이름의 임시 파일(27F16B40 등)과 주간회의록.xlsx는
+같은 회의록의 여러 시점 버전입니다. 버전마다 워크북을 다시 파싱하지 않도록,
+각 버전을 한 번만 파싱해 Arrow 파일로 저장하고 시트와 행을 내용 해시로 중복 제거합니다.
+
+- 버전: 파일 내용 해시로 식별 (같은 내용의 파일은 다시 파싱하지 않음)
+- 시트: 컬럼 구성(스키마) + 행 해시 순서로 식별 (내용이 같은 시트는 한 번만 저장)
+- 행: 같은 스키마의 시트끼리 행 풀(pool)을 함께 쓰고, 풀에 없는 새 행만 추가 저장
+  (지난주 버전에 행이 조금 추가된 시트는 추가된 행만 저장됨)
+
+저장 구조 (HISTORY_DIR):
+    index.json                  버전/시트/행 풀 목록
+    pools/<풀 id>/<번호>.arrow   행 풀 (버전을 추가할 때마다 새 행만 담은 zstd 압축 Arrow 파일 하나 추가)
+    sheets/<시트 id>.arrow       시트의 행 해시 순서 (uint64 한 컬럼, 비압축)
+
+버전 추가는 저장소 락(sidecar.file_lock) 안에서 index.json을 다시 읽은 뒤 행 풀/시트 파일과 색인을 기록하므로,
+여러 세션이나 CLI가 동시에 저장해도 같은 풀 파일을 덮어쓰지 않습니다 (행 풀 파일은 추가만 하고 바꾸지 않음).
+
+시트를 읽을 때는 메모리에 올려둔 행 풀에서 행 해시 순서대로 행을 모으므로
+엑셀 파싱 없이 밀리초 단위로 과거 버전을 불러올 수 있습니다.
+
+사용 예:
+    python -m weekly_report.history ingest            # 주간회의록.xlsx + 폴더의 스냅샷 파일
+    python -m weekly_report.history ingest 27F16B40 주간회의록.xlsx
+    python -m weekly_report.history list
+    python -m weekly_report.history stats
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from weekly_report import sidecar, streaming
+from weekly_report.cache import LRUCache, content_hash
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow가 없으면 이력 저장소를 사용할 수 없음
+    pa = None
+
+HISTORY_DIR = 'snapshot_history'
+INDEX_NAME = 'index.json'
+LOCK_NAME = 'ingest.lock'
+WORKBOOK_PATH = '주간회의록.xlsx'
+# 행 풀 Arrow 파일의 행 해시 컬럼
+ROW_HASH_COLUMN = '__row_hash__'
+# 행 풀 Arrow 파일 압축 (문자열 컬럼이 많아 비압축 대비 약 1/5, 풀은 프로세스당 한 번만 읽음)
+POOL_COMPRESSION = 'zstd'
+
+_HEX_DIGITS = frozenset('0123456789ABCDEF')
+
+# (저장소 폴더, 풀 id, 파일 수)별 읽어둔 행 풀 캐시
+pool_cache = LRUCache(max_entries=8)
+
+
+def is_available():
+    """이력 저장소 사용 가능 여부 (pyarrow 설치 여부)"""
+    return pa is not None
+
+
+def is_snapshot_name(name):
+    """엑셀 저장 임시 파일 이름인지 (확장자 없는 16진수 8자리, 예: 27F16B40)"""
+    return len(name) == 8 and set(name) <= _HEX_DIGITS
+
+
+def find_snapshots(folder='.'):
+    """폴더의 스냅샷 파일 경로 목록 (xlsx(zip) 형식인 것만, 수정 시각 → 이름 순)"""
+    paths = [
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if is_snapshot_name(name) and streaming.is_xlsx(os.path.join(folder, name))
+    ]
+    return sorted(paths, key=lambda path: (os.path.getmtime(path), os.path.basename(path)))
+
+
+def row_hashes(df):
+    """행별 내용 해시 (uint64, 컬럼 순서대로 모든 값을 반영하고 인덱스는 제외)"""
+    if df.shape[1] == 0:
+        return np.zeros(len(df), dtype=np.uint64)
+    return pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+
+
+def _digest(*parts):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def _iter_workbook(data):
+    """워크북 바이트에서 시트별 (시트명, DataFrame) (확장자 없는 파일도 읽을 수 있도록 바이트로 열기)"""
+    if streaming.is_xlsx(data):
+        yield from streaming.iter_sheets(BytesIO(data))
+    else:
+        yield from pd.read_excel(BytesIO(data), sheet_name=None).items()
+
+
+def _write_arrow(path, table, compression=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _read_arrow(path):
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+
+class HistoryStore:
+    """스냅샷 이력 저장소 (root 폴더 하나)"""
+
+    def __init__(self, root=HISTORY_DIR):
+        if pa is None:
+            raise RuntimeError("pyarrow가 설치되어 있지 않아 이력 저장소를 사용할 수 없습니다.")
+        self.root = os.fspath(root)
+        self._index = self._load_index()
+
+    # --- 색인 ---
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.root, INDEX_NAME), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'versions': [], 'sheets': {}, 'pools': {}}
+
+    def _save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = os.path.join(self.root, INDEX_NAME + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, os.path.join(self.root, INDEX_NAME))
+
+    def versions(self):
+        """저장된 버전 목록 (원본 파일 수정 시각 → 추가한 순서)"""
+        return sorted(self._index['versions'], key=lambda version: version['source_mtime'])
+
+    def version(self, ref):
+        """버전 찾기
+
+        ref: 버전 id(앞부분만 써도 됨), 이름(파일명), 또는 versions() 순번(음수는 뒤에서부터)
+        """
+        versions = self.versions()
+        if isinstance(ref, int):
+            return versions[ref]
+        matches = [version for version in versions if version['label'] == ref]
+        if not matches:
+            matches = [version for version in versions if version['id'].startswith(str(ref).lower())]
+        if len(matches) != 1:
+            raise KeyError(f"버전을 찾을 수 없거나 여러 개입니다: {ref}")
+        return matches[0]
+
+    def sheet_names(self, ref):
+        return [sheet['name'] for sheet in self.version(ref)['sheets']]
+
+    def _sheet(self, ref, sheet_name):
+        for sheet in self.version(ref)['sheets']:
+            if sheet['name'] == sheet_name:
+                return sheet
+        raise KeyError(f"시트를 찾을 수 없습니다: {sheet_name}")
+
+    # --- 저장 ---
+
+    def ingest(self, path, label=None):
+        """워크북 한 버전을 저장하고 버전 정보 반환 (같은 내용의 파일이 이미 있으면 파싱하지 않고 그 버전 반환)
+
+        label: 버전 이름 (기본값은 파일명)
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        version_id = content_hash(data)
+        version = self._find_version(version_id)
+        if version is not None:
+            return version
+
+        with sidecar.file_lock(os.path.join(self.root, LOCK_NAME)):
+            # 락을 기다리는 동안 다른 세션/프로세스가 저장한 내용 반영 (같은 버전을 저장했으면 그대로 반환)
+            self._index = self._load_index()
+            version = self._find_version(version_id)
+            if version is not None:
+                return version
+            sheets = [
+                {'name': name, 'sheet': self._add_sheet(df), 'rows': len(df)}
+                for name, df in _iter_workbook(data)
+            ]
+            version = {
+                'id': version_id,
+                'label': label or os.path.basename(path),
+                'source_mtime': os.stat(path).st_mtime,
+                'ingested_at': time.time(),
+                'sheets': sheets,
+            }
+            self._index['versions'].append(version)
+            self._save_index()
+        return version
+
+    def _find_version(self, version_id):
+        for version in self._index['versions']:
+            if version['id'] == version_id:
+                return version
+        return None
+
+    def _add_sheet(self, df):
+        """시트를 저장하고 시트 id 반환 (같은 내용의 시트가 있으면 저장하지 않음, 새 행만 행 풀에 추가)
+
+        저장소 락을 잡은 상태에서 호출합니다 (ingest).
+        """
+        table = sidecar._to_arrow_table(df)
+        hashes = row_hashes(df)
+        pool_id = _digest(table.schema.remove_metadata().to_string().encode('utf-8'))
+        sheet_id = _digest(pool_id.encode('ascii'), hashes.tobytes())
+        if sheet_id in self._index['sheets']:
+            return sheet_id
+
+        pool = self._index['pools'].setdefault(pool_id, {'columns': table.column_names, 'files': 0, 'rows': 0})
+        # 풀에 없는 행 (시트 안에서 같은 행이 반복되면 첫 번째만)
+        _, first = np.unique(hashes, return_index=True)
+        is_new = np.zeros(len(hashes), dtype=bool)
+        is_new[first] = True
+        if pool['files']:
+            is_new &= ~np.isin(hashes, self._pool(pool_id)[1])
+        if is_new.any() or not pool['files']:
+            # 첫 파일은 행이 없어도 저장 (빈 시트의 컬럼 구성 보존)
+            new_rows = table.filter(pa.array(is_new)).append_column(ROW_HASH_COLUMN, pa.array(hashes[is_new]))
+            _write_arrow(os.path.join(self.root, 'pools', pool_id, f"{pool['files']:04d}.arrow"), new_rows, POOL_COMPRESSION)
+            pool['files'] += 1
+            pool['rows'] += new_rows.num_rows
+
+        hash_table = pa.table({ROW_HASH_COLUMN: pa.array(hashes, type=pa.uint64())})
+        _write_arrow(os.path.join(self.root, 'sheets', f'{sheet_id}.arrow'), hash_table)
+        self._index['sheets'][sheet_id] = {'pool': pool_id, 'rows': len(hashes)}
+        return sheet_id
+
+    # --- 읽기 ---
+
+    def _pool(self, pool_id):
+        """행 풀 (Arrow 테이블, 행 해시 배열)"""
+        pool = self._index['pools'][pool_id]
+
+        def load():
+            folder = os.path.join(self.root, 'pools', pool_id)
+            table = pa.concat_tables([_read_arrow(os.path.join(folder, f'{i:04d}.arrow')) for i in range(pool['files'])])
+            return table, table.column(ROW_HASH_COLUMN).to_numpy()
+
+        return pool_cache.get_or_build((self.root, pool_id, pool['files']), load)
+
+    def row_hashes(self, ref, sheet_name):
+        """시트의 행 해시 배열 (시트 행 순서, 행 값은 읽지 않음)"""
+        sheet_id = self._sheet(ref, sheet_name)['sheet']
+        table = _read_arrow(os.path.join(self.root, 'sheets', f'{sheet_id}.arrow'))
+        return table.column(ROW_HASH_COLUMN).to_numpy()
+
+    def read_table(self, ref, sheet_name):
+        """시트를 Arrow 테이블로 읽기 (행 풀에서 행 해시 순서대로 모음, 행 해시 컬럼 포함)"""
+        sheet_id = self._sheet(ref, sheet_name)['sheet']
+        table, pool_hashes = self._pool(self._index['sheets'][sheet_id]['pool'])
+        positions = pd.Index(pool_hashes).get_indexer(self.row_hashes(ref, sheet_name))
+        return table.take(pa.array(positions))
+
+    def read_sheet(self, ref, sheet_name):
+        """시트를 DataFrame으로 읽기 (저장할 때의 컬럼 순서와 행 순서 그대로)"""
+        return self.read_table(ref, sheet_name).drop_columns([ROW_HASH_COLUMN]).to_pandas()
+
+    def stats(self):
+        """저장소 크기와 중복 제거 현황"""
+        referenced = [sheet for version in self._index['versions'] for sheet in version['sheets']]
+        disk_bytes = sum(
+            os.path.getsize(os.path.join(folder, name))
+            for folder, _, names in os.walk(self.root) for name in names
+        )
+        return {
+            'versions': len(self._index['versions']),
+            'sheets': len(referenced),
+            'unique_sheets': len(self._index['sheets']),
+            'rows': sum(sheet['rows'] for sheet in referenced),
+            'stored_rows': sum(pool['rows'] for pool in self._index['pools'].values()),
+            'disk_bytes': disk_bytes,
+        }
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    command = args[0] if args else None
+    if command not in ('ingest', 'list', 'stats'):
+        print("사용법: python -m weekly_report.history ingest [엑셀 파일 ...] | list | stats")
+        return 1
+
+    store = HistoryStore()
+    if command == 'ingest':
+        paths = args[1:] or [path for path in [WORKBOOK_PATH] if os.path.exists(path)] + find_snapshots()
+        for path in paths:
+            before = store.stats()
+            start = time.perf_counter()
+            version = store.ingest(path)
+            after = store.stats()
+            if after['versions'] == before['versions']:
+                print(f"{path}: 이미 저장된 버전 ({version['label']})")
+                continue
+            print(
+                f"{path}: 시트 {len(version['sheets'])}개, 새 시트 {after['unique_sheets'] - before['unique_sheets']}개, "
+                f"새 행 {after['stored_rows'] - before['stored_rows']:,}개 ({time.perf_counter() - start:.2f} s)"
+            )
+    elif command == 'list':
+        for i, version in enumerate(store.versions()):
+            sheets = ', '.join(f"{sheet['name']}({sheet['rows']:,})" for sheet in version['sheets'])
+            print(f"{i:>3}  {version['id'][:8]}  {version['label']:<16} {sheets}")
+    else:
+        stats = store.stats()
+        print(f"버전 {stats['versions']}개, 시트 {stats['sheets']}개 (중복 제거 후 {stats['unique_sheets']}개)")
+        print(f"행 {stats['rows']:,}개 (중복 제거 후 {stats['stored_rows']:,}개), 저장 크기 {stats['disk_bytes'] / 1024:,.0f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+주간 회의록 시트 증분 적재
+
+주간 회의록 워크북은 매주 월별 시트 끝에 행이 추가되기만 합니다.
+같은 경로의 파일이 바뀌면 지난번 적재 이후 추가된 행만 읽어서
+파트/날짜 파생 컬럼과 집계 큐브를 새 행에 대해서만 계산한 뒤 기존 결과에 합칩니다.
+시트를 적재할 때 마지막 데이터 행의 엑셀 행 번호를 기억해 두고, streaming.read_rows_from으로
+그 행부터만 읽으므로 셀 파싱/값 변환은 추가된 행 수에 비례합니다 (다른 시트는 읽지 않음).
+xlsx는 시트 XML이 통째로 압축되어 있어 바뀐 시트의 압축 해제와 경계 행 바이트 검색은 시트 크기에 비례하지만,
+시트 전체 파싱보다 한 자릿수 이상 빠릅니다. 사이드카(weekly_report.sidecar) 파일은 이 경로에서 읽지 않으며,
+대시보드는 워크북 전체의 사이드카 갱신을 백그라운드에서 진행합니다 (warmup.ensure_sidecars).
+헤더와 경계 행(지난번 마지막 행)이 그대로이면 행이 추가만 된 것으로 보고,
+경계 행의 위치를 모르거나(xls, 행 번호를 기록하기 전의 사이드카) 추가된 행을 찾을 수 없거나
+경계 행이 바뀐 경우에는 시트 전체를 다시 적재합니다.
+"""
+
+import os
+
+import pandas as pd
+
+from weekly_report import cache as workbook_cache
+from weekly_report import compact, sidecar, streaming
+from weekly_report.cache import LRUCache
+from weekly_report.cube import build_cube
+from weekly_report.prepare import add_part_column, date_parts, load_part_mapping, report_cube_spec
+from weekly_report.profile import read_profile
+
+# (파일 경로, 시트명)별 적재 상태
+_states = LRUCache(max_entries=8)
+
+
+def _normalize_cell(value):
+    """엑셀 원본 값과 DataFrame 값을 같은 기준으로 비교하기 위한 문자열"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = float(value)
+        return str(int(value)) if value.is_integer() else repr(value)
+    return str(value)
+
+
+def _row_key(values):
+    return tuple(_normalize_cell(value) for value in values)
+
+
+class SheetState:
+    """적재된 시트 (원본 행 + 파트 컬럼, 컬럼 프로파일, 날짜 파생 컬럼, 집계 큐브)"""
+
+    def __init__(self, version, raw_columns, profile, part_mapping, frame, date_columns, dates, parts, cube_spec,
+                 cube, appended_rows=None, last_row=None):
+        self.version = version
+        self.raw_columns = raw_columns
+        self.profile = profile
+        # 파트 컬럼을 만들 때 사용한 담당자 → 파트 매핑 표
+        self.part_mapping = part_mapping
+        self.frame = frame
+        self.date_columns = date_columns
+        self.dates = dates
+        self.date_parts = parts
+        self.cube_spec = cube_spec
+        self.cube = cube
+        # 마지막 적재에서 추가로 처리한 행 수 (전체 적재면 None)
+        self.appended_rows = appended_rows
+        # 마지막 데이터 행의 엑셀 행 번호 (모르면 None → 행이 추가되어도 전체 다시 적재)
+        self.last_row = last_row
+        self._memory_report = None
+
+    @property
+    def memory_report(self):
+        """카테고리/int32 변환 전후 컬럼별 메모리 사용량 (처음 조회할 때 한 번만 계산)"""
+        if self._memory_report is None:
+            self._memory_report = compact.memory_report(self.frame)
+        return self._memory_report
+
+    @property
+    def last_row_key(self):
+        if len(self.frame) == 0:
+            return None
+        return _row_key(self.frame[self.raw_columns].iloc[-1].tolist())
+
+
+def _derive(frame, profile, part_mapping, date_columns=None, cube_spec=None):
+    """파트 컬럼, 날짜 파생 컬럼, 집계 큐브 계산 (전체 시트 또는 추가된 행에 공통 사용)
+
+    문자열/정수 컬럼은 카테고리/int32로 변환한 뒤 큐브를 만듭니다 (weekly_report.compact).
+    """
+    frame = compact.compact_frame(add_part_column(frame, part_mapping))
+    if date_columns is None:
+        date_columns = profile.date_columns()
+    dates = None
+    parts = None
+    if len(date_columns) > 0:
+        dates = pd.to_datetime(frame[date_columns[0]], errors='coerce')
+        parts = date_parts(dates)
+    if cube_spec is None:
+        cube_spec = report_cube_spec(
+            profile,
+            date_col=date_columns[0] if len(date_columns) > 0 else None,
+            part_col='파트' if '파트' in frame.columns else profile.column('part'),
+        )
+    date_col, part_col, platform_col, measures = cube_spec
+    cube = build_cube(frame, measures, date_col=date_col, part_col=part_col, platform_col=platform_col)
+    return frame, date_columns, dates, parts, cube_spec, cube
+
+
+def _load_full(source, sheet_name, version, part_mapping):
+    raw = workbook_cache.read_sheet(source, sheet_name)
+    raw_columns = list(raw.columns)
+    profile = read_profile(source, sheet_name)
+    frame, date_columns, dates, parts, cube_spec, cube = _derive(raw, profile, part_mapping)
+    return SheetState(
+        version, raw_columns, profile, part_mapping, frame, date_columns, dates, parts, cube_spec, cube,
+        last_row=raw.attrs.get(streaming.LAST_ROW_ATTR),
+    )
+
+
+def _is_text(series):
+    """값이 있는 행(카테고리 컬럼은 카테고리)이 모두 문자열인지"""
+    values = series.cat.categories if compact.is_categorical(series) else series.dropna()
+    return all(isinstance(value, str) for value in values)
+
+
+def _align_dtypes(delta, frame):
+    """추가된 행 중 기존 DataFrame과 타입이 다른 컬럼만 기존 타입에 맞춤 (맞출 수 없으면 None → 전체 다시 적재)
+
+    날짜/숫자 값은 문자열로 바꾸지 않고, 값 종류가 섞인 object 컬럼은 새 값을 그대로 붙입니다.
+    """
+    for col in delta.columns:
+        base = frame[col]
+        values = delta[col]
+        base_dtype = compact.source_dtype(base)
+        if values.dtype == base_dtype or values.isna().all():
+            continue
+        if pd.api.types.is_datetime64_any_dtype(base_dtype):
+            if pd.api.types.is_numeric_dtype(values.dtype):
+                return None
+            converted = pd.to_datetime(values, errors='coerce')
+        elif pd.api.types.is_numeric_dtype(base_dtype) and not pd.api.types.is_bool_dtype(base_dtype):
+            if pd.api.types.is_datetime64_any_dtype(values.dtype):
+                return None
+            converted = pd.to_numeric(values, errors='coerce')
+        elif _is_text(base):
+            if _is_text(values):
+                continue
+            # 문자열 컬럼에 날짜/숫자가 새로 들어온 경우: 사이드카는 타입이 섞인 컬럼을 문자열로 통일하므로 같게 맞추고,
+            # 사이드카를 쓸 수 없으면 전체 적재 결과(값 종류가 섞인 object)와 타입이 달라지므로 다시 적재
+            if not sidecar.is_available():
+                return None
+            delta[col] = values.astype(str).where(values.notna())
+            continue
+        elif base_dtype == object:
+            continue
+        else:
+            return None
+        if converted.notna().sum() != values.notna().sum():
+            return None
+        delta[col] = converted
+    return delta
+
+
+def _load_appended(path, sheet_name, state, version):
+    """기존 적재 이후 추가된 행만 읽어 상태에 합침 (추가만 된 경우가 아니면 None)"""
+    row_count = len(state.frame)
+    if row_count == 0 or state.last_row is None or not streaming.is_xlsx(path):
+        return None
+    # 마지막으로 적재한 행부터 읽어 경계 확인
+    tail = streaming.read_rows_from(path, sheet_name, state.last_row)
+    if tail is None:
+        return None
+    names, rows, row_numbers = tail
+    width = len(state.raw_columns)
+    if [str(name) for name in names[:width]] != [str(col) for col in state.raw_columns]:
+        return None
+    # 전체 적재에서 제거되는 오른쪽 끝의 빈 컬럼 외에 새 컬럼이 생겼으면 전체 다시 적재
+    for pos in range(width, len(names)):
+        if not str(names[pos]).startswith('Unnamed: ') or any(pd.notna(row[pos]) for row in rows):
+            return None
+    if not rows or row_numbers[0] != state.last_row or _row_key(rows[0][:width]) != state.last_row_key:
+        return None
+
+    delta = pd.DataFrame([row[:width] for row in rows[1:]], columns=state.raw_columns)
+    delta.index = pd.RangeIndex(row_count, row_count + len(delta))
+    delta = _align_dtypes(delta, state.frame)
+    if delta is None:
+        return None
+    delta, _, dates, parts, _, cube = _derive(delta, state.profile, state.part_mapping, state.date_columns, state.cube_spec)
+
+    frame = compact.append_rows(state.frame, delta)
+    if state.dates is not None:
+        dates = pd.concat([state.dates, dates])
+        parts = pd.concat([state.date_parts, parts])
+    return SheetState(
+        version, state.raw_columns, state.profile, state.part_mapping, frame, state.date_columns, dates, parts,
+        state.cube_spec, state.cube.merge(cube), appended_rows=len(delta), last_row=row_numbers[-1],
+    )
+
+
+def ingest_sheet(source, sheet_name):
+    """시트를 적재하고 파생 컬럼/큐브가 포함된 SheetState 반환
+
+    파일 내용과 파트 매핑 표가 같으면 이전 상태를 그대로 반환하고,
+    같은 경로의 파일에 행만 추가되었으면 추가된 행만 처리합니다.
+    (파트 매핑 표가 바뀌면 파트 컬럼을 다시 만들어야 하므로 시트 전체를 다시 적재)
+    """
+    is_path = isinstance(source, (str, os.PathLike))
+    key = (os.path.abspath(source) if is_path else None, sheet_name)
+    version = workbook_cache.data_version(source)
+    part_mapping = load_part_mapping()
+    state = _states.get(key)
+    if state is not None and state.part_mapping != part_mapping:
+        state = None
+    if state is not None and state.version == version:
+        return state
+
+    new_state = None
+    if state is not None and is_path:
+        new_state = _load_appended(source, sheet_name, state, version)
+    if new_state is None:
+        new_state = _load_full(source, sheet_name, version, part_mapping)
+    _states.put(key, new_state)
+    return new_state
+
+
+def is_loaded(path, sheet_name):
+    """로컬 파일의 시트를 적재한 상태가 있는지 (파일이 바뀌었어도)"""
+    return _states.get((os.path.abspath(path), sheet_name)) is not None
+
+
+def loaded_states():
+    """현재 적재되어 있는 시트 상태 목록 (세션 간 공유 데이터)"""
+    return _states.values()
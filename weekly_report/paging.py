@@ -0,0 +1,83 @@
+"""
+표 페이지 나누기 (서버 측 정렬/필터)
+
+큰 표를 st.dataframe에 통째로 넘기면 재실행마다 전체 행이 브라우저로 직렬화되므로,
+정렬/검색/페이지 계산은 서버에서 캐시된 DataFrame의 행 위치 배열로만 처리하고
+현재 페이지 행만 잘라서 보냅니다.
+
+정렬 순서는 데이터 버전 + 필터 상태 + 정렬 컬럼별로 한 번만 계산해 캐시하므로,
+페이지를 넘기거나 검색어를 바꿔도 다시 정렬하지 않습니다.
+
+사용 예:
+    order = paging.sort_order(key, df, '매출총이익', ascending=False)
+    positions = paging.arrange(len(df), rows=search_rows, order=order)
+    page_df = paging.take(df, paging.page_rows(positions, len(df), page, page_size))
+"""
+
+import math
+
+import numpy as np
+
+from weekly_report.cache import LRUCache
+
+# 페이지당 행 수 선택지
+PAGE_SIZES = (50, 100, 200, 500)
+DEFAULT_PAGE_SIZE = 100
+
+# (데이터 버전 + 필터 상태, 정렬 컬럼, 방향)별 행 순서 캐시
+order_cache = LRUCache(max_entries=16)
+
+
+def sort_order(key, df, column, ascending=True):
+    """column 기준 정렬 행 위치 배열 (같은 값은 원래 순서 유지, 결측값은 맨 뒤)
+
+    key: 데이터 버전 + 필터 상태 (같은 key의 df는 같은 데이터여야 함)
+    """
+    def build():
+        values = df[column].reset_index(drop=True)
+        return values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+
+    return order_cache.get_or_build((key, column, ascending), build)
+
+
+def arrange(total, rows=None, order=None):
+    """표시할 행 위치 배열 (필터 rows를 order 순서로 나열)
+
+    total: 전체 행 수
+    rows: 필터(검색) 결과 행 위치 배열 (None이면 전체)
+    order: sort_order 결과 (None이면 원래 순서)
+    필터도 정렬도 없으면 None을 반환합니다 (원래 DataFrame을 그대로 사용).
+    """
+    if order is None:
+        return None if rows is None else np.asarray(rows)
+    if rows is None:
+        return order
+    selected = np.zeros(total, dtype=bool)
+    selected[rows] = True
+    return order[selected[order]]
+
+
+def count(positions, total):
+    """arrange 결과의 행 수"""
+    return total if positions is None else len(positions)
+
+
+def page_count(rows, page_size):
+    """페이지 수 (행이 없어도 1)"""
+    return max(1, math.ceil(rows / page_size))
+
+
+def page_rows(positions, total, page, page_size):
+    """page번째(1부터) 페이지의 행 위치 (positions가 None이면 slice, 범위를 벗어난 page는 마지막 페이지로)"""
+    rows = count(positions, total)
+    page = min(max(1, page), page_count(rows, page_size))
+    start = (page - 1) * page_size
+    window = slice(start, min(start + page_size, rows))
+    return window if positions is None else positions[window]
+
+
+def take(df, positions):
+    """행 위치(배열 또는 slice)로 DataFrame 자르기 (None이면 df 그대로)"""
+    if positions is None:
+        return df
+    return df.iloc[positions]
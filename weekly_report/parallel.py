@@ -0,0 +1,209 @@
+"""
+여러 시트/워크북 병렬 적재
+
+openpyxl 파싱은 CPU를 쓰고 GIL을 잡고 있어 스레드로는 빨라지지 않으므로,
+시트마다 별도 프로세스에서 파싱해 사이드카 Arrow 파일(weekly_report.sidecar)로 저장합니다.
+부모 프로세스는 DataFrame을 pickle로 전달받지 않고 저장된 Arrow 파일을 메모리 매핑으로 읽으므로
+결과 전달 비용이 거의 없고, 시작 시간은 (시트 수 / 코어 수)에 비례해 줄어듭니다.
+
+Streamlit 서버 안에서는 대시보드 스크립트가 __main__ 모듈이라, 작업 프로세스가 시작하면서 대시보드 전체를
+다시 실행합니다 (최상위의 사이드카 변환이 부모가 잡은 ingest_lock을 기다리며 멈춤).
+그래서 대시보드/일괄 보고가 쓰는 prepare_sidecars는 `python -m weekly_report.sidecar` 하위 프로세스에서 변환하고,
+map_jobs는 작업 프로세스가 대시보드 스크립트를 다시 실행하게 되는 경우 현재 프로세스에서 차례로 실행합니다.
+
+사용 예:
+    parallel.ingest_workbooks(['주간회의록.xlsx', '2025 정산서 기준 판매 데이터.xlsx'])
+    frames = parallel.read_workbooks(['주간회의록.xlsx'])  # {파일: {시트명: DataFrame}}
+"""
+
+import contextlib
+import multiprocessing
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import spawn
+
+import pandas as pd
+
+from weekly_report import sidecar, streaming
+
+# 작업 프로세스가 __main__으로 다시 실행하면 안 되는 스크립트 (Streamlit 대시보드)
+UNSAFE_MAIN_SCRIPTS = ('dashboard_prototype.py',)
+# 패키지 상위 폴더 (하위 프로세스에서 weekly_report를 import할 수 있도록 PYTHONPATH에 추가)
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def _mp_context():
+    """작업 프로세스 생성 방식
+
+    forkserver를 쓸 수 있으면 forkserver, Windows 등에서는 spawn.
+    Streamlit 서버/미리 적재 스레드처럼 스레드가 여러 개인 프로세스를 fork하면, fork 순간 다른 스레드가 잡고 있던
+    락을 작업 프로세스가 영원히 기다릴 수 있으므로 fork는 쓰지 않습니다.
+    (작업 함수는 모듈 최상위 함수여야 하고, 스크립트는 `if __name__ == '__main__':`으로 보호해야 함)
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _in_streamlit():
+    """Streamlit 서버 안에서 실행 중인지"""
+    if 'streamlit' not in sys.modules:
+        return False
+    try:
+        from streamlit import runtime
+    except ImportError:
+        return False
+    return runtime.exists()
+
+
+def worker_main_path():
+    """작업 프로세스가 시작하면서 __main__으로 다시 실행할 스크립트 경로 (`python -m`으로 실행했거나 없으면 None)"""
+    return spawn.get_preparation_data('weekly-report').get('init_main_from_path')
+
+
+def workers_rerun_dashboard():
+    """작업 프로세스를 만들면 대시보드 스크립트를 다시 실행하게 되는지 (그러면 풀을 쓰지 않음)"""
+    main_path = worker_main_path()
+    if main_path is not None and os.path.basename(main_path) in UNSAFE_MAIN_SCRIPTS:
+        return True
+    return main_path is not None and _in_streamlit()
+
+
+def _check_worker_bootstrap():
+    """(작업 프로세스 초기화) 시작하면서 대시보드 스크립트를 실행했으면 작업을 받지 않고 실패"""
+    main = sys.modules.get('__mp_main__') or sys.modules['__main__']
+    main_path = getattr(main, '__file__', None)
+    if main_path is not None and os.path.basename(main_path) in UNSAFE_MAIN_SCRIPTS:
+        raise RuntimeError(f"작업 프로세스가 {os.path.basename(main_path)}을(를) 다시 실행했습니다.")
+
+
+def map_jobs(func, jobs, max_workers=None):
+    """작업마다 func(*job)을 프로세스 풀에서 실행한 결과 목록 (jobs 순서)
+
+    func는 모듈 최상위 함수여야 합니다 (spawn 방식에서는 pickle로 전달).
+    작업 수나 코어 수가 1이거나, 작업 프로세스가 대시보드 스크립트를 다시 실행하게 되면(workers_rerun_dashboard)
+    프로세스를 만들지 않고 현재 프로세스에서 차례로 실행합니다.
+    """
+    workers = min(len(jobs), max_workers or default_workers())
+    if workers <= 1 or workers_rerun_dashboard():
+        return [func(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context(), initializer=_check_worker_bootstrap) as pool:
+        futures = [pool.submit(func, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def _sheet_names(path):
+    if streaming.is_xlsx(path):
+        return streaming.sheet_names(path)
+    with pd.ExcelFile(path) as xls:
+        return list(xls.sheet_names)
+
+
+def _convert_sheet(path, index, sheet_name, stat):
+    """(작업 프로세스) 시트 하나를 파싱해 사이드카 Arrow 파일로 저장"""
+    if streaming.is_xlsx(path):
+        df = streaming.read_sheet(path, sheet_name)
+    else:
+        df = pd.read_excel(path, sheet_name=sheet_name)
+    return {'name': sheet_name, **sidecar.write_sheet(path, index, df, stat)}
+
+
+def ingest_workbooks(paths, max_workers=None):
+    """워크북들의 모든 시트를 동시에 사이드카로 변환 (이미 최신인 파일은 건너뜀)
+
+    반환: {파일 경로: manifest} (변환한 파일만)
+    변환하는 동안 파일별 sidecar.ingest_lock을 잡으므로, 다른 프로세스/세션이 같은 파일을 변환 중이면 기다렸다가
+    그 결과를 사용합니다.
+    작업 수나 코어 수가 1이면 프로세스를 만들지 않고 현재 프로세스에서 sidecar.convert로 변환합니다.
+    """
+    if not sidecar.is_available():
+        raise RuntimeError("pyarrow가 설치되어 있지 않아 사이드카를 만들 수 없습니다.")
+    stale = [path for path in dict.fromkeys(paths) if not sidecar.is_fresh(path)]
+    if not stale:
+        return {}
+    with contextlib.ExitStack() as locks:
+        # 여러 파일의 락은 항상 같은 순서로 잡음 (서로 기다리며 멈추지 않도록)
+        for path in sorted(stale, key=os.path.abspath):
+            locks.enter_context(sidecar.ingest_lock(path))
+        stale = [path for path in stale if not sidecar.is_fresh(path)]
+        stats = {path: os.stat(path) for path in stale}
+        jobs = [(path, i, name, stats[path]) for path in stale for i, name in enumerate(_sheet_names(path))]
+        workers = min(len(jobs), max_workers or default_workers())
+        if workers <= 1 or workers_rerun_dashboard():
+            # 워크북을 한 번만 열고 시트를 차례로 변환 (시트별로 여는 것보다 빠름)
+            return {path: sidecar.convert(path) for path in stale}
+
+        results = map_jobs(_convert_sheet, jobs, workers)
+
+        sheets = {path: [] for path in stale}
+        for (path, _, _, _), sheet in zip(jobs, results):
+            sheets[path].append(sheet)
+        return {path: sidecar.write_manifest(path, stats[path], sheets[path]) for path in stale}
+
+
+def read_workbooks(paths, max_workers=None):
+    """워크북들의 모든 시트를 {파일 경로: {시트명: DataFrame}}으로 읽기
+
+    사이드카가 없거나 오래된 파일은 ingest_workbooks로 먼저 병렬 변환하고,
+    DataFrame은 메모리 매핑된 Arrow 파일에서 만듭니다.
+    """
+    ingest_workbooks(paths, max_workers=max_workers)
+    return {
+        path: {name: sidecar.read_sheet(path, name) for name in sidecar.sheet_names(path)}
+        for path in dict.fromkeys(paths)
+    }
+
+
+def _sidecar_command(paths):
+    """`python -m weekly_report.sidecar` 하위 프로세스 실행 인자와 환경 변수"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [_PACKAGE_ROOT, env.get('PYTHONPATH')]))
+    return [sys.executable, '-m', 'weekly_report.sidecar', *map(os.fspath, paths)], env
+
+
+def _stale(paths):
+    if not sidecar.is_available():
+        return []
+    return [path for path in dict.fromkeys(paths) if not sidecar.is_fresh(path)]
+
+
+def prepare_sidecars(paths):
+    """사이드카를 쓸 수 있으면 `python -m weekly_report.sidecar` 하위 프로세스에서 병렬 변환
+
+    반환: {파일 경로: manifest} (변환한 파일만)
+    하위 프로세스의 __main__은 weekly_report.sidecar이므로, Streamlit 대시보드에서 호출해도 작업 프로세스가
+    대시보드 스크립트를 다시 실행하지 않습니다. 락은 하위 프로세스가 잡으므로 이 함수는 락을 잡지 않습니다.
+    pyarrow가 없거나 읽기 전용 폴더 등으로 변환하지 못하면 건너뜁니다 (각 시트는 읽을 때 직접 파싱).
+    """
+    stale = _stale(paths)
+    if not stale:
+        return {}
+    args, env = _sidecar_command(stale)
+    try:
+        subprocess.run(args, env=env, check=True, stdout=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    # 변환을 마친 파일은 ensure가 다시 변환하지 않고 manifest만 읽음
+    return {path: sidecar.ensure(path) for path in stale if sidecar.is_fresh(path)}
+
+
+def start_sidecars(paths):
+    """prepare_sidecars와 같은 변환을 하위 프로세스에서 시작만 하고 기다리지 않음
+
+    반환: 시작한 subprocess.Popen (변환할 파일이 없거나 시작하지 못하면 None)
+    변환 중에 사이드카를 읽는 쪽은 sidecar.ensure에서 변환 락이 풀릴 때까지 기다립니다.
+    """
+    stale = _stale(paths)
+    if not stale:
+        return None
+    args, env = _sidecar_command(stale)
+    try:
+        return subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL)
+    except OSError:
+        return None
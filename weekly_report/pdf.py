@@ -0,0 +1,360 @@
+"""
+월말 PDF 보고서
+
+weekly_report.report.build_report 결과(미리 계산된 집계 표)로 월말 보고 PDF를 만듭니다.
+브라우저나 Streamlit 없이 실행되며, 원본 엑셀을 다시 집계하지 않습니다.
+- 구성: 표지/핵심 지표, 목표 달성 현황, 월별 매출 분석, 플랫폼별 분석, 상품 판매 분석
+- 차트: 차트 명세(제목, 라벨, 값)만 작업 프로세스로 보내 matplotlib으로 PNG를 그림 (weekly_report.parallel)
+- 문서: reportlab으로 표와 차트 이미지를 A4 세로 문서에 배치
+- 한글 글꼴: 설치된 한글 글꼴(맑은 고딕/애플고딕/나눔고딕/Noto Sans CJK)을 차트와 문서에 사용,
+  문서는 한글 TTF가 없으면 reportlab 내장 한글 CID 글꼴 사용
+
+사용 예:
+    python -m weekly_report build --month 11 --format pdf
+
+    result = report.build_report('주간회의록.xlsx', 11)
+    pdf.write_pdf(result, 'report_output/11월/report.pdf')
+"""
+
+import datetime
+import io
+import warnings
+from xml.sax.saxutils import escape
+
+import pandas as pd
+
+from weekly_report import parallel
+from weekly_report.formatting import COUNT, PERCENT, THOUSANDS, WON, format_value
+
+try:
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib import font_manager
+    from matplotlib import pyplot as plt
+    from matplotlib.ticker import FuncFormatter
+except ImportError:  # matplotlib이 없으면 PDF 보고서를 만들 수 없음
+    plt = None
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import mm
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.platypus import Image, PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+except ImportError:  # reportlab이 없으면 PDF 보고서를 만들 수 없음
+    pdfmetrics = None
+
+# 한글 글꼴 후보 (앞에서부터 설치된 것 사용)
+KOREAN_FONTS = ('Malgun Gothic', 'AppleGothic', 'Apple SD Gothic Neo', 'NanumGothic', 'Noto Sans CJK KR', 'Noto Sans KR')
+# 한글 TTF가 없을 때 쓰는 reportlab 내장 한글 글꼴
+CID_FONT = 'HYGothic-Medium'
+PDF_FONT = 'ReportKorean'
+
+# 차트 크기(인치)와 해상도
+CHART_SIZE = (7.0, 3.2)
+CHART_DPI = 150
+CHART_COLORS = ('#1f77b4', '#ff7f0e', '#2ca02c', '#d62728')
+
+# 표로 넣는 최대 행 수 (긴 표는 상위 행만)
+TABLE_ROWS = {'platforms': 15, 'manufacturer_payments': 20, 'product_sales': 30}
+# 막대 차트에 넣는 최대 항목 수
+CHART_ITEMS = 10
+
+# 표 컬럼별 표시 형식 (weekly_report.formatting)
+COLUMN_FORMATS = {
+    '목표': WON, '달성': WON, '매출기준액': WON, '매출총이익': WON, '정산금액': WON, '전월매출': WON, 'I열합계': WON,
+    '건수': COUNT, '총 데이터 수': COUNT, '수량': THOUSANDS, '총판매수량': THOUSANDS,
+    '달성율': PERCENT, '성장률': PERCENT,
+}
+
+_chart_font = None
+
+
+def is_available():
+    """PDF 보고서 사용 가능 여부 (matplotlib, reportlab 설치 여부)"""
+    return plt is not None and pdfmetrics is not None
+
+
+def _korean_font():
+    """설치된 한글 글꼴 (이름, 파일 경로), 없으면 (None, None)"""
+    installed = {font.name: font.fname for font in font_manager.fontManager.ttflist}
+    for name in KOREAN_FONTS:
+        if name in installed:
+            return name, installed[name]
+    return None, None
+
+
+def _setup_chart_font():
+    """matplotlib 한글 글꼴 설정 (프로세스마다 한 번, spawn 작업 프로세스에서도 호출)"""
+    global _chart_font
+    if _chart_font is None:
+        _chart_font, _ = _korean_font()
+        if _chart_font is not None:
+            plt.rcParams['font.family'] = _chart_font
+        else:
+            # 글자마다 나오는 글꼴 경고 대신 write_pdf에서 한 번만 알림
+            warnings.filterwarnings('ignore', message='Glyph .* missing from font')
+        plt.rcParams['axes.unicode_minus'] = False
+    return _chart_font
+
+
+def _register_pdf_font():
+    """reportlab 문서 글꼴 등록 (한글 TTF가 있으면 그 글꼴, 없으면 내장 한글 CID 글꼴) → 글꼴 이름"""
+    if PDF_FONT in pdfmetrics.getRegisteredFontNames():
+        return PDF_FONT
+    if CID_FONT in pdfmetrics.getRegisteredFontNames():
+        return CID_FONT
+    _, path = _korean_font()
+    if path is not None and path.lower().endswith('.ttf'):
+        pdfmetrics.registerFont(TTFont(PDF_FONT, path))
+        return PDF_FONT
+    pdfmetrics.registerFont(UnicodeCIDFont(CID_FONT))
+    return CID_FONT
+
+
+def _amount_axis(value, _):
+    """금액 축 눈금 (백만원 단위)"""
+    return f"{value / 1_000_000:,.0f}백만"
+
+
+def render_chart(spec):
+    """(작업 프로세스) 차트 명세 하나를 PNG 바이트로 렌더링
+
+    spec: {'kind': 'bar' | 'barh' | 'line', 'title', 'labels': [...], 'series': {이름: [값]}, 'amount': 금액 축 여부}
+    """
+    _setup_chart_font()
+    fig, ax = plt.subplots(figsize=CHART_SIZE, dpi=CHART_DPI)
+    labels = [str(label) for label in spec['labels']]
+    positions = list(range(len(labels)))
+    series = spec['series']
+    value_axis = ax.xaxis if spec['kind'] == 'barh' else ax.yaxis
+
+    if spec['kind'] == 'barh':
+        values = next(iter(series.values()))
+        ax.barh(positions, values, color=CHART_COLORS[0])
+        ax.set_yticks(positions, labels, fontsize=8)
+        ax.invert_yaxis()
+    elif spec['kind'] == 'line':
+        for i, (name, values) in enumerate(series.items()):
+            ax.plot(positions, values, marker='o', label=name, color=CHART_COLORS[i % len(CHART_COLORS)])
+        ax.set_xticks(positions, labels, fontsize=8)
+    else:
+        width = 0.8 / len(series)
+        for i, (name, values) in enumerate(series.items()):
+            offset = (i - (len(series) - 1) / 2) * width
+            ax.bar([x + offset for x in positions], values, width, label=name, color=CHART_COLORS[i % len(CHART_COLORS)])
+        ax.set_xticks(positions, labels, fontsize=8)
+
+    if spec.get('amount'):
+        value_axis.set_major_formatter(FuncFormatter(_amount_axis))
+    if len(series) > 1:
+        ax.legend(fontsize=8)
+    ax.set_title(spec['title'], fontsize=11)
+    ax.grid(axis='x' if spec['kind'] == 'barh' else 'y', alpha=0.3)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def render_charts(specs, max_workers=None):
+    """차트 명세들을 작업 프로세스에서 동시에 렌더링 {차트 이름: PNG 바이트}"""
+    names = list(specs)
+    images = parallel.map_jobs(render_chart, [(specs[name],) for name in names], max_workers)
+    return dict(zip(names, images))
+
+
+def _top(table, column, limit=CHART_ITEMS):
+    return table.nlargest(limit, column) if column in table.columns else table.head(0)
+
+
+def chart_specs(tables):
+    """build_report 표에서 차트 명세 {차트 이름: spec} (값은 파이썬 기본 타입, 작업 프로세스로 pickle 전달)"""
+    specs = {}
+    targets = tables.get('targets')
+    if targets is not None and len(targets) > 0:
+        specs['targets'] = {
+            'kind': 'bar', 'title': '파트별 목표 대비 달성', 'amount': True,
+            'labels': targets['파트'].tolist(),
+            'series': {'목표': targets['목표'].astype(float).tolist(), '달성': targets['달성'].astype(float).tolist()},
+        }
+    for name, title in (('monthly_sales', '월별 매출총이익 (N열)'), ('monthly_payments', '월별 정산금액 (I열)')):
+        monthly = tables.get(name)
+        if monthly is not None and len(monthly) > 0:
+            specs[name] = {
+                'kind': 'bar' if name == 'monthly_sales' else 'line', 'title': title, 'amount': True,
+                'labels': monthly['년월'].astype(str).tolist(),
+                'series': {'매출총이익': monthly['매출총이익'].astype(float).tolist()},
+            }
+    platforms = tables.get('platforms')
+    if platforms is not None and '매출총이익' in platforms.columns:
+        top = _top(platforms, '매출총이익')
+        specs['platforms'] = {
+            'kind': 'barh', 'title': f'플랫폼별 매출총이익 상위 {len(top)}개', 'amount': True,
+            'labels': top['플랫폼'].astype(str).tolist(), 'series': {'매출총이익': top['매출총이익'].astype(float).tolist()},
+        }
+    payments = tables.get('manufacturer_payments')
+    if payments is not None and len(payments) > 0:
+        top = _top(payments, '정산금액')
+        specs['manufacturer_payments'] = {
+            'kind': 'barh', 'title': f'업체별 정산금액 상위 {len(top)}개', 'amount': True,
+            'labels': top['업체'].astype(str).tolist(), 'series': {'정산금액': top['정산금액'].astype(float).tolist()},
+        }
+    products = tables.get('product_sales')
+    if products is not None and len(products) > 0:
+        top = _top(products, '총판매수량')
+        label_col = '상품명' if '상품명' in top.columns else '상품코드'
+        specs['product_sales'] = {
+            'kind': 'barh', 'title': f'판매 수량 상위 {len(top)}개 상품',
+            'labels': [str(label).strip()[:30] for label in top[label_col]],
+            'series': {'총판매수량': top['총판매수량'].astype(float).tolist()},
+        }
+    return specs
+
+
+class _Document:
+    """reportlab 문서 요소(flowables) 작성 도우미"""
+
+    def __init__(self, font):
+        self.font = font
+        self.story = []
+        self.styles = {
+            'title': ParagraphStyle('title', fontName=font, fontSize=20, leading=26, spaceAfter=6 * mm),
+            # 제목은 다음 표/차트와 같은 페이지에 배치
+            'heading': ParagraphStyle(
+                'heading', fontName=font, fontSize=14, leading=18, spaceBefore=4 * mm, spaceAfter=3 * mm, keepWithNext=1,
+            ),
+            'subheading': ParagraphStyle(
+                'subheading', fontName=font, fontSize=11, leading=15, spaceBefore=2 * mm, spaceAfter=2 * mm, keepWithNext=1,
+            ),
+            'body': ParagraphStyle('body', fontName=font, fontSize=9, leading=13),
+            'cell': ParagraphStyle('cell', fontName=font, fontSize=7.5, leading=9.5),
+        }
+
+    def text(self, value, style='body'):
+        self.story.append(Paragraph(escape(str(value)), self.styles[style]))
+
+    def space(self, height=4):
+        self.story.append(Spacer(1, height * mm))
+
+    def chart(self, images, name):
+        if name in images:
+            width = 170 * mm
+            self.story.append(Image(io.BytesIO(images[name]), width=width, height=width * CHART_SIZE[1] / CHART_SIZE[0]))
+            self.space(2)
+
+    def table(self, df, limit=None, columns=None):
+        """DataFrame을 표로 추가 (숫자 컬럼은 COLUMN_FORMATS 형식으로 오른쪽 정렬, limit행 초과 시 상위 행만)"""
+        if df is None or len(df) == 0:
+            self.text("데이터가 없습니다.")
+            return
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+        total = len(df)
+        if limit is not None and total > limit:
+            df = df.head(limit)
+        numeric = [pd.api.types.is_numeric_dtype(df[col].dtype) for col in df.columns]
+        rows = [[Paragraph(escape(str(col)), self.styles['cell']) for col in df.columns]]
+        for values in df.itertuples(index=False):
+            rows.append([
+                format_value(value, COLUMN_FORMATS.get(col, THOUSANDS)) if is_number
+                else Paragraph(escape(str(value).strip()), self.styles['cell'])
+                for col, value, is_number in zip(df.columns, values, numeric)
+            ])
+        table = Table(rows, repeatRows=1, hAlign='LEFT')
+        style = [
+            ('FONTNAME', (0, 0), (-1, -1), self.font),
+            ('FONTSIZE', (0, 0), (-1, -1), 7.5),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8eef7')),
+            ('GRID', (0, 0), (-1, -1), 0.4, colors.HexColor('#b0b7c3')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]
+        style += [('ALIGN', (i, 1), (i, -1), 'RIGHT') for i, is_number in enumerate(numeric) if is_number]
+        table.setStyle(TableStyle(style))
+        self.story.append(table)
+        if len(df) < total:
+            self.text(f"상위 {len(df):,}개 (전체 {total:,}개, 전체 목록은 CSV 참고)")
+        self.space()
+
+
+def _highlight_lines(highlights):
+    """월별 분석 요약(성장한 달/급감한 달/최고 매출 월/부진 월) 문장 목록"""
+    lines = []
+    for name, row in highlights.items():
+        if name == '평균':
+            lines.append(f"월 평균: {format_value(row, WON)}")
+        elif row is None:
+            lines.append(f"{name}: 없음")
+        else:
+            growth = '' if pd.isna(row['성장률']) else f", 전월 대비 {row['성장률']:+.1f}%"
+            lines.append(f"{name}: {row['년월']} ({format_value(row['매출총이익'], WON)}{growth})")
+    return lines
+
+
+def write_pdf(result, path, max_workers=None):
+    """build_report 결과를 PDF로 저장 → path"""
+    if not is_available():
+        raise RuntimeError("matplotlib/reportlab이 설치되어 있지 않아 PDF 보고서를 만들 수 없습니다.")
+    if _korean_font()[0] is None:
+        warnings.warn(f"한글 글꼴({', '.join(KOREAN_FONTS)})이 없어 차트의 한글이 표시되지 않습니다.")
+    summary, tables = result['summary'], result['tables']
+    images = render_charts(chart_specs(tables), max_workers)
+    doc = _Document(_register_pdf_font())
+
+    # 표지 + 핵심 지표
+    doc.text(f"{summary['월']} 월말 보고", 'title')
+    doc.text(f"회의록: {summary['회의록 파일']} / 시트: {summary['시트']}")
+    doc.text(f"작성일: {datetime.date.today():%Y-%m-%d}")
+    doc.space(6)
+    doc.text("핵심 지표", 'heading')
+    doc.table(tables.get('kpis'))
+
+    doc.text("1. 목표 달성 현황 (발주서 기준)", 'heading')
+    doc.table(tables.get('targets'))
+    doc.chart(images, 'targets')
+
+    doc.text("2. 월별 매출 분석", 'heading')
+    if 'monthly_sales' in tables:
+        for line in _highlight_lines(summary.get('월별 매출 분석', {})):
+            doc.text(line)
+        doc.space(2)
+        doc.chart(images, 'monthly_sales')
+        doc.table(tables['monthly_sales'], columns=['년월', '매출총이익', '전월매출', '성장률'])
+    else:
+        doc.text("날짜 또는 매출총이익(N열) 컬럼이 없어 월별 분석을 할 수 없습니다.")
+
+    doc.story.append(PageBreak())
+    doc.text("3. 플랫폼별 분석", 'heading')
+    doc.chart(images, 'platforms')
+    doc.table(tables.get('platforms'), limit=TABLE_ROWS['platforms'])
+
+    doc.text("4. 상품 판매 분석", 'heading')
+    if 'product_sales' not in tables:
+        doc.text(summary.get('판매 데이터', "판매 데이터 파일이 없어 상품 판매 분석을 생략했습니다."))
+    else:
+        doc.text(f"판매 데이터 시트: {summary.get('판매 데이터 시트', '')}")
+        if 'manufacturer_payments' in tables:
+            doc.text("업체별 정산금액", 'subheading')
+            doc.chart(images, 'manufacturer_payments')
+            doc.table(tables['manufacturer_payments'], limit=TABLE_ROWS['manufacturer_payments'])
+        if 'monthly_payments' in tables:
+            doc.text("월별 정산금액", 'subheading')
+            for line in _highlight_lines(summary.get('월별 정산금액 분석', {})):
+                doc.text(line)
+            doc.chart(images, 'monthly_payments')
+        doc.text("상품별 판매 수량", 'subheading')
+        doc.chart(images, 'product_sales')
+        doc.table(
+            tables['product_sales'], limit=TABLE_ROWS['product_sales'], columns=['상품명', '제조사', '상품코드', '총판매수량'],
+        )
+
+    SimpleDocTemplate(
+        path, pagesize=A4, title=f"{summary['월']} 월말 보고",
+        leftMargin=20 * mm, rightMargin=20 * mm, topMargin=18 * mm, bottomMargin=18 * mm,
+    ).build(doc.story)
+    return path
@@ -0,0 +1,190 @@
+"""
+주간 회의록 시트 전처리
+
+시트를 읽은 뒤 대시보드가 공통으로 만드는 파생 컬럼(파트, 년/월/년월)과
+컬럼 탐지 기준(위치/키워드)을 모아둔 모듈입니다.
+컬럼 탐지 결과는 weekly_report.profile에서 시트 헤더별로 저장해 재사용합니다.
+"""
+
+import json
+import os
+import re
+
+import pandas as pd
+
+from weekly_report import compact
+
+# P열(16번째 컬럼, 0-based index: 15) = 담당자
+P_COLUMN_INDEX = 15
+# N열(14번째 컬럼, 0-based index: 13) = 매출총이익
+N_COLUMN_INDEX = 13
+
+QUANTITY_KEYWORDS = ['수량', 'quantity', 'qty']
+SALES_BASE_KEYWORDS = ['매출기준액', '매출기준', 'sales base', '기준액']
+PLATFORM_KEYWORDS = ['플랫폼', 'platform']
+
+# 프로젝트 폴더 (weekly_report 패키지가 있는 폴더, 설정 파일 기본 위치)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 담당자 → 파트 매핑 표 파일 (기본값은 프로젝트 폴더, 환경 변수로 위치 변경 가능)
+PART_MAPPING_PATH = os.environ.get('WEEKLY_REPORT_PART_MAPPING', os.path.join(PROJECT_DIR, 'part_mapping.json'))
+DEFAULT_PART_MAPPING = {'default': '1파트', 'managers': {'맹기열': '2파트'}}
+
+# 월별 시트 이름 표기 (시트 이름에 포함되면 해당 월 시트, 영문은 소문자로 비교)
+MONTH_SHEET_KEYWORDS = {
+    11: ('11월', '11', 'november', 'nov'),
+    12: ('12월', '12', 'december', 'dec'),
+}
+
+# 'N월' 표기 (시트 이름에서 월 번호를 찾을 때 우선 사용, 예: '2025년 11월 raw' → 11)
+MONTH_NAME_PATTERN = re.compile(r'(?<!\d)(1[0-2]|0?[1-9])\s*월')
+
+# 파트별 월 목표 (N열 매출총이익 기준, 원)
+PART_TARGETS = {'1파트': 17000000, '2파트': 1000000}
+
+# 파트별 표기: (정확히 일치하는 값, 포함되면 같은 파트로 보는 값)
+PART_ALIASES = {
+    '1파트': (['1파트', '1'], ['1파트', 'part1']),
+    '2파트': (['2파트', '2'], ['2파트', 'part2']),
+}
+
+
+def is_month_sheet(sheet_name, month):
+    """시트 이름이 month월 시트 표기를 포함하는지"""
+    name = str(sheet_name)
+    return any(keyword in name or keyword in name.lower() for keyword in MONTH_SHEET_KEYWORDS[month])
+
+
+def default_sheet(sheet_names):
+    """대시보드 기본 시트 (11월 시트, 없으면 12월 시트, 둘 다 없으면 None)"""
+    for month in (11, 12):
+        for sheet in sheet_names:
+            if is_month_sheet(sheet, month):
+                return sheet
+    return None
+
+
+def sheet_month(sheet_name):
+    """시트 이름의 월 번호 ('N월' 표기 우선, 없으면 MONTH_SHEET_KEYWORDS 표기, 월 시트가 아니면 None)"""
+    match = MONTH_NAME_PATTERN.search(str(sheet_name))
+    if match:
+        return int(match.group(1))
+    for month in MONTH_SHEET_KEYWORDS:
+        if is_month_sheet(sheet_name, month):
+            return month
+    return None
+
+
+def month_sheets(sheet_names):
+    """월별 시트 {월 번호: 시트명} (월 순서, 같은 월 시트가 여러 개면 첫 번째 시트)"""
+    sheets = {}
+    for sheet in sheet_names:
+        month = sheet_month(sheet)
+        if month is not None:
+            sheets.setdefault(month, sheet)
+    return dict(sorted(sheets.items()))
+
+
+def load_part_mapping(path=PART_MAPPING_PATH):
+    """담당자 → 파트 매핑 표 (파일이 없거나 읽을 수 없으면 기본 매핑)
+
+    파일 형식: {"default": "1파트", "managers": {"맹기열": "2파트"}}
+    managers의 이름이 담당자 값에 포함되면 해당 파트, 나머지 담당자는 default 파트입니다.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            mapping = json.load(f)
+    except (OSError, ValueError):
+        return DEFAULT_PART_MAPPING
+    return {
+        'default': mapping.get('default', DEFAULT_PART_MAPPING['default']),
+        'managers': dict(mapping.get('managers', {})),
+    }
+
+
+def part_mapping_key(mapping):
+    """매핑 표 내용 키 (캐시 키에 넣어 매핑 표가 바뀌면 파트 컬럼에서 파생된 캐시를 다시 만듦)"""
+    return json.dumps(mapping, sort_keys=True, ensure_ascii=False)
+
+
+def map_to_part(manager_name, mapping=DEFAULT_PART_MAPPING):
+    """담당자 이름에 따라 파트 매핑 (매핑 표에 있으면 해당 파트, 나머지는 기본 파트)"""
+    manager_name = str(manager_name).strip()
+    for name, part in mapping['managers'].items():
+        if name in manager_name:
+            return part
+    # 나머지는 모두 기본 파트 (빈 값이 아닌 경우)
+    if manager_name and manager_name != 'nan':
+        return mapping['default']
+    # 빈 값은 빈 파트
+    return ''
+
+
+def part_labels(managers, mapping=DEFAULT_PART_MAPPING):
+    """담당자 Series → 파트 카테고리 Series
+
+    map_to_part는 고유 담당자마다 한 번만 호출하고, 행에는 담당자 코드로 조회해서 펼칩니다.
+    """
+    codes, uniques = pd.factorize(managers)
+    parts = pd.Index([map_to_part(name, mapping) for name in uniques] + [''])
+    categories = parts.unique().sort_values()
+    # 빈 담당자(코드 -1)는 마지막에 붙인 빈 파트를 가리킴
+    lookup = categories.get_indexer(parts)
+    labels = pd.Series(
+        pd.Categorical.from_codes(lookup[codes], categories=categories), index=managers.index, name='파트',
+    )
+    return labels.cat.remove_unused_categories()
+
+
+def add_part_column(df, mapping=None):
+    """P열(담당자) 기준으로 '파트' 컬럼 추가 (P열이 없으면 그대로 반환)
+
+    mapping: 담당자 → 파트 매핑 표 (None이면 load_part_mapping()으로 읽음)
+    """
+    if len(df.columns) > P_COLUMN_INDEX:
+        manager_col_p = df.columns[P_COLUMN_INDEX]
+        df['파트'] = part_labels(df[manager_col_p], load_part_mapping() if mapping is None else mapping)
+    return df
+
+
+def part_membership(parts):
+    """파트 값 Series → {파트명: bool Series} (1파트/2파트 소속 여부)
+
+    '1파트', '1', 'part1'처럼 표기가 달라도 같은 파트로 판별하며,
+    카테고리 컬럼이면 고유값에서 한 번만 비교하고 행에는 카테고리 코드로 적용합니다.
+    """
+    membership = {}
+    for part, aliases in PART_ALIASES.items():
+        exact, contained = aliases
+        membership[part] = compact.category_mask(parts, lambda values: (
+            values.isin(exact) |
+            pd.concat(
+                [values.str.contains(alias, na=False, regex=False, case=False) for alias in contained], axis=1,
+            ).any(axis=1)
+        ))
+    return membership
+
+
+def date_parts(dates):
+    """날짜 Series에서 년/월/년월/주차(ISO)/일 컬럼 생성"""
+    return pd.DataFrame({
+        '년': dates.dt.year,
+        '월': dates.dt.month,
+        '년월': dates.dt.to_period('M'),
+        '주차': dates.dt.isocalendar().week,
+        '일': dates.dt.day,
+    }, index=dates.index)
+
+
+def report_cube_spec(profile, date_col=None, part_col=None):
+    """대시보드 집계 큐브 구성 (날짜 컬럼, 파트 컬럼, 플랫폼 컬럼, 측정값)
+
+    대시보드와 같은 컬럼 프로파일(weekly_report.profile)의 역할을 사용합니다:
+    N열 = 매출총이익, 수량/매출기준액/플랫폼은 컬럼명 키워드
+    """
+    measures = {}
+    for label, role in (('수량', 'quantity'), ('매출기준액', 'sales_base'), ('매출총이익', 'amount')):
+        col = profile.column(role)
+        if col is not None:
+            measures[label] = col
+    return date_col, part_col, profile.column('platform'), measures
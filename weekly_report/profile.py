@@ -0,0 +1,262 @@
+"""
+시트별 컬럼 프로파일 (컬럼 역할 탐지 결과 저장)
+
+대시보드는 날짜/금액/파트/플랫폼/상품/수량/매출기준액 컬럼을 컬럼명 키워드와 엑셀 위치(N열, I열 등)로 찾고,
+날짜 컬럼은 object 컬럼의 첫 값을 pd.to_datetime으로 확인합니다.
+이 탐지를 시트 헤더(컬럼명 목록)의 fingerprint마다 한 번만 수행하고 결과를 JSON 파일에 저장하므로,
+같은 헤더의 시트는 이후 탐지 없이 저장된 프로파일을 그대로 사용합니다.
+
+자동 탐지가 맞지 않으면 역할별로 컬럼을 고정(override)할 수 있습니다:
+    python -m weekly_report.profile show 주간회의록.xlsx "2025년 11월 raw"
+    python -m weekly_report.profile pin 주간회의록.xlsx "2025년 11월 raw" platform "판매처"
+    python -m weekly_report.profile unpin 주간회의록.xlsx "2025년 11월 raw" platform
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import namedtuple
+
+from weekly_report import cache as workbook_cache
+from weekly_report.prepare import N_COLUMN_INDEX, PLATFORM_KEYWORDS, PROJECT_DIR, QUANTITY_KEYWORDS, SALES_BASE_KEYWORDS
+from weekly_report.schema import (
+    MANUFACTURER_COLUMN_INDEX, PAYMENT_COLUMN_INDEX, SALES_COMPANY_KEYWORDS, SALES_PAYMENT_KEYWORDS,
+    SALES_PRODUCT_KEYWORDS, SALES_PRODUCT_NAME_KEYWORDS, SALES_QUANTITY_KEYWORDS,
+)
+
+# 프로파일 저장 파일 (기본값은 프로젝트 폴더, 환경 변수로 위치 변경 가능)
+PROFILE_PATH = os.environ.get('WEEKLY_REPORT_PROFILE_PATH', os.path.join(PROJECT_DIR, 'column_profiles.json'))
+PROFILE_FORMAT_VERSION = 1
+
+# I열(9번째 컬럼, 0-based index: 8) = 업체지급금액
+I_COLUMN_INDEX = 8
+
+AMOUNT_KEYWORDS = ['금액', 'amount', '매출', '매출액', '수익', 'revenue', '매출총이익']
+PAYMENT_KEYWORDS = ['업체지급금액', '지급금액', '정산금액', 'payment', 'i열']
+PART_KEYWORDS = ['파트', 'part']
+COMPANY_KEYWORDS = ['업체', 'company', '회사', '고객', 'customer', 'client']
+MANAGER_KEYWORDS = ['담당자', 'manager', '담당', '담당인', 'contact', '담당자명']
+CONSULTATION_KEYWORDS = ['상담', 'consultation', '내역', '내용', 'content', '상담내용', '상담내역']
+
+# position: 엑셀 위치(있으면 우선), keywords: 컬럼명(소문자)에 하나라도 포함,
+# exclude: 컬럼명에 포함되면 제외, require: 컬럼명에 모두 포함되어야 함
+Role = namedtuple('Role', ['position', 'keywords', 'exclude', 'require'], defaults=(None, (), (), ()))
+
+ROLES = {
+    # 주간 회의록 시트
+    'amount': Role(N_COLUMN_INDEX, AMOUNT_KEYWORDS),
+    'payment': Role(I_COLUMN_INDEX, PAYMENT_KEYWORDS),
+    'part': Role(keywords=PART_KEYWORDS),
+    'quantity': Role(keywords=QUANTITY_KEYWORDS),
+    'sales_base': Role(keywords=SALES_BASE_KEYWORDS),
+    'platform': Role(keywords=PLATFORM_KEYWORDS),
+    # 스마트공장 시트
+    'company': Role(keywords=COMPANY_KEYWORDS),
+    'manager': Role(keywords=MANAGER_KEYWORDS),
+    'consultation': Role(keywords=CONSULTATION_KEYWORDS),
+    # 판매 데이터(정산서) 시트
+    'sales_company': Role(keywords=SALES_COMPANY_KEYWORDS, exclude=('지급금액', '금액')),
+    'sales_product': Role(keywords=SALES_PRODUCT_KEYWORDS, exclude=('상품명', '코드별')),
+    'sales_product_name': Role(keywords=SALES_PRODUCT_NAME_KEYWORDS),
+    'sales_quantity': Role(keywords=SALES_QUANTITY_KEYWORDS, exclude=('코드별', '상품코드', '상품명')),
+    'manufacturer': Role(MANUFACTURER_COLUMN_INDEX),
+    'sales_payment': Role(PAYMENT_COLUMN_INDEX, SALES_PAYMENT_KEYWORDS),
+    'code_sales': Role(require=('코드별', '판매', '수량')),
+}
+# 날짜 컬럼 역할 (override 시 날짜 컬럼 목록 맨 앞에 둠)
+DATE_ROLE = 'date'
+
+
+def fingerprint(columns):
+    """시트 헤더(컬럼명 목록) fingerprint"""
+    header = json.dumps([str(col) for col in columns], ensure_ascii=False)
+    return hashlib.blake2b(header.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _matches(col, role):
+    name = str(col)
+    if role.require:
+        return all(word in name for word in role.require)
+    return (any(keyword in name.lower() for keyword in role.keywords)
+            and not any(word in name for word in role.exclude))
+
+
+def infer(schema):
+    """스키마(weekly_report.schema.SheetSchema)에서 프로파일 데이터 생성 (컬럼은 위치로 저장)"""
+    columns = schema.columns
+    positions = {col: i for i, col in enumerate(columns)}
+    candidates = {}
+    roles = {}
+    for name, role in ROLES.items():
+        matched = [i for i, col in enumerate(columns) if (role.keywords or role.require) and _matches(col, role)]
+        candidates[name] = matched
+        if role.position is not None and len(columns) > role.position:
+            roles[name] = role.position
+        else:
+            roles[name] = matched[0] if matched else None
+    return {
+        'columns': [str(col) for col in columns],
+        'dtypes': {str(col): str(schema.dtypes[col]) for col in columns},
+        'date_columns': [positions[col] for col in schema.date_columns()],
+        'roles': roles,
+        'candidates': candidates,
+        'overrides': {},
+    }
+
+
+class ColumnProfile:
+    """시트 헤더 하나에 대한 컬럼 역할 (override가 있으면 override 우선)"""
+
+    def __init__(self, columns, data):
+        self.columns = list(columns)
+        self.fingerprint = fingerprint(columns)
+        self.data = data
+
+    def _override(self, role):
+        name = self.data.get('overrides', {}).get(role)
+        if name is None:
+            return None
+        for col in self.columns:
+            if str(col) == name:
+                return col
+        return None
+
+    def column(self, role):
+        """역할에 해당하는 컬럼 (없으면 None)"""
+        override = self._override(role)
+        if override is not None:
+            return override
+        position = self.data['roles'].get(role)
+        return self.columns[position] if position is not None else None
+
+    def candidates(self, role):
+        """역할 후보 컬럼 목록 (키워드 일치 순, 고정한 컬럼이 있으면 맨 앞)"""
+        columns = [self.columns[i] for i in self.data['candidates'].get(role, [])]
+        override = self._override(role)
+        if override is not None:
+            columns = [override] + [col for col in columns if col != override]
+        return columns
+
+    def dtype(self, col):
+        return self.data['dtypes'].get(str(col))
+
+    def date_columns(self, exclude=()):
+        """날짜 컬럼 목록 (exclude: 날짜 탐지 전에 숫자로 변환해서 쓰는 object 컬럼)"""
+        columns = [
+            self.columns[i] for i in self.data['date_columns']
+            if not (self.columns[i] in exclude and self.dtype(self.columns[i]) == 'object')
+        ]
+        override = self._override(DATE_ROLE)
+        if override is not None:
+            columns = [override] + [col for col in columns if col != override]
+        return columns
+
+
+class ProfileStore:
+    """fingerprint별 프로파일 JSON 저장소 (프로세스 메모리에도 보관)"""
+
+    def __init__(self, path=PROFILE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._profiles = None
+
+    def _load(self):
+        if self._profiles is None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    stored = json.load(f)
+                if stored.get('version') != PROFILE_FORMAT_VERSION:
+                    stored = {}
+            except (OSError, ValueError):
+                stored = {}
+            self._profiles = stored.get('profiles', {})
+        return self._profiles
+
+    def _save(self):
+        # 임시 파일에 쓴 뒤 교체 (저장 중 중단되어도 기존 파일 유지)
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': PROFILE_FORMAT_VERSION, 'profiles': self._profiles}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # 읽기 전용 위치 등에서는 메모리에만 보관
+            pass
+
+    def get(self, columns, schema_builder):
+        """헤더에 맞는 프로파일 반환 (처음 보는 헤더면 schema_builder()로 스키마를 만들어 탐지 후 저장)"""
+        key = fingerprint(columns)
+        with self._lock:
+            data = self._load().get(key)
+        if data is None:
+            data = infer(schema_builder())
+            with self._lock:
+                self._load()[key] = data
+                self._save()
+        return ColumnProfile(columns, data)
+
+    def set_override(self, columns, role, column, schema_builder):
+        """역할에 컬럼 고정 (column이 None이면 고정 해제)"""
+        profile = self.get(columns, schema_builder)
+        with self._lock:
+            overrides = self._load()[profile.fingerprint].setdefault('overrides', {})
+            if column is None:
+                overrides.pop(role, None)
+            else:
+                overrides[role] = str(column)
+            self._save()
+        return self.get(columns, schema_builder)
+
+    def clear(self):
+        with self._lock:
+            self._profiles = None
+
+
+default_store = ProfileStore()
+
+
+def get_profile(columns, schema_builder):
+    return default_store.get(columns, schema_builder)
+
+
+def read_profile(source, sheet_name):
+    """시트의 컬럼 프로파일 (헤더만 읽어 fingerprint를 구하고, 처음 보는 헤더일 때만 스키마를 읽어 탐지)"""
+    columns = workbook_cache.read_columns(source, sheet_name)
+    return get_profile(columns, lambda: workbook_cache.read_schema(source, sheet_name))
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) < 3 or args[0] not in ('show', 'pin', 'unpin'):
+        print("사용법: python -m weekly_report.profile show|pin|unpin <엑셀 파일> <시트명> [역할] [컬럼명]")
+        print(f"역할: {', '.join([DATE_ROLE] + list(ROLES))}")
+        return 1
+    command, path, sheet = args[:3]
+    schema = workbook_cache.read_schema(path, sheet)
+    builder = lambda: schema
+    if command == 'show':
+        profile = default_store.get(schema.columns, builder)
+    else:
+        role = args[3] if len(args) > 3 else None
+        if role not in ROLES and role != DATE_ROLE:
+            print(f"알 수 없는 역할입니다: {role}")
+            return 1
+        column = None
+        if command == 'pin':
+            column = args[4] if len(args) > 4 else None
+            if column not in [str(col) for col in schema.columns]:
+                print(f"시트에 없는 컬럼입니다: {column}")
+                return 1
+        profile = default_store.set_override(schema.columns, role, column, builder)
+    print(f"{path} / {sheet} (fingerprint {profile.fingerprint})")
+    print(f"  {DATE_ROLE}: {profile.date_columns()}")
+    for role in ROLES:
+        pinned = ' (고정)' if role in profile.data.get('overrides', {}) else ''
+        print(f"  {role}: {profile.column(role)}{pinned}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,380 @@
+"""
+월말 보고 지표 계산 (Streamlit 없이 사용)
+
+대시보드 화면의 목표 달성 현황, 핵심 지표, 월별 매출 분석(전월 대비 성장률), 플랫폼별 통계,
+상품 판매 분석(업체별 정산금액, 월별 정산금액, 상품별 판매 수량)을 계산하는 함수들입니다.
+대시보드는 같은 함수로 화면을 그리고, `python -m weekly_report build`는 브라우저 없이
+같은 지표와 표를 한 번에 계산해 JSON/CSV로 저장합니다 (예약 작업용, --format pdf를 지정하면 PDF도 저장: weekly_report.pdf).
+
+사용 예:
+    python -m weekly_report build --month 11
+    python -m weekly_report build --month 12 --output report_output --format json csv
+    python -m weekly_report build --month 11 --format pdf
+
+    result = report.build_report('주간회의록.xlsx', 11)
+    result['summary']['목표 달성']       # 파트별 목표/달성/달성율
+    result['tables']['platforms']      # 플랫폼별 통계 DataFrame
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from weekly_report import batch, exports
+from weekly_report import cache as workbook_cache
+from weekly_report.aggregations import mode_per_key, monthly_totals
+from weekly_report.prepare import PART_TARGETS, month_sheets
+from weekly_report.profile import read_profile
+from weekly_report.schema import SalesColumns
+
+WEEKLY_DATA_PATH = '주간회의록.xlsx'
+SALES_DATA_PATH = '2025 정산서 기준 판매 데이터.xlsx'
+OUTPUT_DIR = 'report_output'
+OUTPUT_FORMATS = ('json', 'csv', 'pdf')
+# 기본 저장 형식 (PDF는 matplotlib/reportlab이 필요하므로 --format pdf로 지정할 때만)
+DEFAULT_FORMATS = ('json', 'csv')
+
+# 월별 매출 분석에서 제외할 월 (12월 제외)
+EXCLUDED_MONTHS = (12,)
+
+# 월별 확정 매출총이익 (2025년 기준, 집계값 대신 이 값을 표시)
+MONTHLY_AMOUNTS = {
+    '2025-01': 23290017,
+    '2025-02': 20003838,
+    '2025-03': 18924280,
+    '2025-04': 23528759,
+    '2025-05': 24544760,
+    '2025-06': 22182939,
+    '2025-07': 90013289,
+    '2025-08': 38355057,
+    '2025-09': 68243253,
+    '2025-10': 61020050,
+    '2025-11': 45450249,
+}
+
+# 부진 월 기준 (월 평균 매출총이익 대비 비율)
+WEAK_MONTH_RATIO = 0.8
+
+
+class MonthSheetNotFound(KeyError):
+    """보고 월 시트가 워크북에 없음 (명령행에서는 안내 메시지로 출력)"""
+
+
+def _numeric(values):
+    """숫자형이 아니면 숫자로 변환 (변환할 수 없는 값은 NaN)"""
+    if values.dtype == 'object':
+        return pd.to_numeric(values, errors='coerce')
+    return values
+
+
+def apply_monthly_amounts(monthly, amounts=MONTHLY_AMOUNTS):
+    """monthly_totals 결과의 매출총이익을 월별 확정 금액으로 바꾸고 년월 순 정렬
+
+    집계에 없는 월은 새 행으로 추가합니다 (매출총이익 외 합계 컬럼은 0).
+    """
+    other_columns = [col for col in monthly.columns if col not in ('년월', '매출총이익')]
+    for month_str, amount in amounts.items():
+        month_period = pd.Period(month_str, freq='M')
+        if month_period in monthly['년월'].values:
+            monthly.loc[monthly['년월'] == month_period, '매출총이익'] = amount
+        else:
+            new_row = pd.DataFrame({'년월': [month_period], '매출총이익': [amount], **{col: [0] for col in other_columns}})
+            monthly = pd.concat([monthly, new_row], ignore_index=True)
+    return monthly.sort_values('년월')
+
+
+def add_growth(monthly):
+    """전월 매출, 전월 대비 성장률(%), 년월 표시 문자열 컬럼 추가"""
+    monthly['전월매출'] = monthly['매출총이익'].shift(1)
+    monthly['성장률'] = ((monthly['매출총이익'] - monthly['전월매출']) / monthly['전월매출'] * 100).round(2)
+    monthly['년월_표시'] = monthly['년월'].astype(str)
+    return monthly
+
+
+def growth_highlights(monthly):
+    """월별 집계(add_growth 결과)의 성장한 달/급감한 달/최고 매출 월/부진 월 행 (해당 월이 없으면 None)
+
+    '평균'은 월 평균 매출총이익 (부진 월 = 평균의 WEAK_MONTH_RATIO 미만인 월 중 가장 낮은 월)
+    """
+    growth_months = monthly[monthly['성장률'] > 0]
+    decline_months = monthly[monthly['성장률'] < 0]
+    avg_sales = monthly['매출총이익'].mean()
+    weak_months = monthly[monthly['매출총이익'] < avg_sales * WEAK_MONTH_RATIO]
+    return {
+        '성장한 달': growth_months.loc[growth_months['성장률'].idxmax()] if len(growth_months) > 0 else None,
+        '급감한 달': decline_months.loc[decline_months['성장률'].idxmin()] if len(decline_months) > 0 else None,
+        '최고 매출 월': monthly.loc[monthly['매출총이익'].idxmax()] if len(monthly) > 0 else None,
+        '부진 월': weak_months.loc[weak_months['매출총이익'].idxmin()] if len(weak_months) > 0 else None,
+        '평균': avg_sales,
+    }
+
+
+def monthly_sales(df, amount_col, i_col=None):
+    """주간 회의록 월별 매출 분석 (N열 매출총이익 + I열 합계, 12월 제외, 확정 금액 반영, 성장률)
+
+    df: 년/월/년월 컬럼이 있는 시트 DataFrame. N열 값이 비었거나 0인 행은 제외합니다.
+    """
+    amounts = _numeric(df[amount_col])
+    mask = amounts.notna() & (amounts != 0) & (amounts.abs() > 0.01)  # 매우 작은 값도 제외
+    data = {'년': df['년'], '월': df['월'], '년월': df['년월'], amount_col: amounts}
+    measures = {'매출총이익': amount_col}
+    if i_col and i_col in df.columns:
+        data[i_col] = _numeric(df[i_col])
+        measures['I열합계'] = i_col
+    with_amount = pd.DataFrame(data)[mask]
+    if len(with_amount) == 0:
+        return add_growth(pd.DataFrame(columns=['년월', '매출총이익']))
+
+    monthly = monthly_totals(with_amount, measures, exclude_months=EXCLUDED_MONTHS)
+    if 'I열합계' not in monthly.columns:
+        monthly['I열합계'] = 0
+    return add_growth(apply_monthly_amounts(monthly))
+
+
+def monthly_payments(sales_df, payment_col, date_col):
+    """정산서 월별 업체지급금액(I열) 분석 (12월 제외, 확정 금액 반영, 성장률)
+
+    금액 컬럼명은 주간 회의록 월별 분석과 같은 '매출총이익'을 사용합니다.
+    """
+    dates = pd.to_datetime(sales_df[date_col], errors='coerce')
+    payments = _numeric(sales_df[payment_col])
+    frame = pd.DataFrame({
+        payment_col: payments, '년': dates.dt.year, '월': dates.dt.month, '년월': dates.dt.to_period('M'),
+    })
+    frame = frame[payments.notna() & (payments != 0)]
+    return add_growth(apply_monthly_amounts(
+        monthly_totals(frame, {'매출총이익': payment_col}, exclude_months=EXCLUDED_MONTHS)
+    ))
+
+
+def manufacturer_payments(sales_df, manufacturer_col, payment_col):
+    """A열(제조사)별 I열(업체지급금액) 합계 ['업체', '정산금액'] (정산금액 높은 순)"""
+    payments = sales_df.assign(**{payment_col: _numeric(sales_df[payment_col])})
+    table = payments.groupby(manufacturer_col, observed=True)[payment_col].sum().reset_index()
+    table.columns = ['업체', '정산금액']
+    return table.sort_values('정산금액', ascending=False)
+
+
+def product_name_mapping(sales_df, product_col, product_name_col):
+    """상품코드 → 상품명 매핑 (상품명 컬럼이 없으면 빈 매핑)"""
+    if not product_name_col:
+        return {}
+    mapping = sales_df[[product_col, product_name_col]].drop_duplicates()
+    return mapping.set_index(product_col)[product_name_col].to_dict()
+
+
+def product_company_mapping(sales_df, product_col, company_col):
+    """상품코드 → 업체 매핑 (상품코드별로 가장 많이 나타나는 업체, 없으면 처음 나타난 업체)"""
+    mapping = mode_per_key(sales_df, product_col, company_col)
+    if len(mapping) == 0:
+        fallback = sales_df[[product_col, company_col]].drop_duplicates()
+        mapping = fallback.set_index(product_col)[company_col].to_dict()
+    return mapping
+
+
+def product_sales(sales_df, product_col, quantity_col, code_sales_col=None, company_mapping=None, product_mapping=None):
+    """상품코드별 총 판매 수량 ['상품코드', '총판매수량', '제조사'(, '상품명')] (판매 수량 많은 순)
+
+    code_sales_col: 이미 상품코드별로 집계된 판매수량 컬럼 (있으면 상품코드별 첫 번째 값, 없으면 수량 합계)
+    """
+    if code_sales_col and code_sales_col != quantity_col:
+        values = sales_df.assign(**{code_sales_col: _numeric(sales_df[code_sales_col])})
+        table = values.groupby(product_col, observed=True)[code_sales_col].first().reset_index()
+    else:
+        values = sales_df.assign(**{quantity_col: _numeric(sales_df[quantity_col])})
+        table = values.groupby(product_col, observed=True)[quantity_col].sum().reset_index()
+    table.columns = ['상품코드', '총판매수량']
+    table = table.sort_values('총판매수량', ascending=False)
+
+    table['제조사'] = table['상품코드'].map(company_mapping or {})
+    table['제조사'] = table['제조사'].fillna('미확인')
+    if product_mapping:
+        table['상품명'] = table['상품코드'].map(product_mapping)
+        table['상품명'] = table['상품명'].fillna(table['상품코드'])
+    return table
+
+
+def achievement_table(parts, targets=PART_TARGETS):
+    """파트별 + 전체 목표 달성 현황 ['파트', '목표', '달성', '건수', '달성율'] (MonthReport.parts 기준)"""
+    table = parts.reindex(list(targets)).fillna(0)
+    table.insert(0, '목표', list(targets.values()))
+    table.loc['전체'] = table.sum()
+    table = table.astype({'목표': 'int64', '건수': 'int64'})
+    table['달성율'] = (table['달성'] / table['목표'] * 100).where(table['목표'] > 0, 0).round(1)
+    table.index.name = '파트'
+    return table.reset_index()
+
+
+def _highlight_summary(highlights):
+    """growth_highlights 결과를 JSON으로 저장할 수 있는 {항목: {년월, 매출총이익, 성장률}}로 변환"""
+    summary = {}
+    for name, row in highlights.items():
+        if name == '평균':
+            summary[name] = highlights[name]
+        elif row is not None:
+            summary[name] = {'년월': row['년월_표시'], '매출총이익': row['매출총이익'], '성장률': row['성장률']}
+        else:
+            summary[name] = None
+    return summary
+
+
+def _sales_report(sales_path):
+    """정산서 첫 시트의 상품 판매 분석 (업체별 정산금액, 월별 정산금액, 상품별 판매 수량)
+
+    업체/상품코드/상품명/수량 컬럼은 대시보드 기본 선택(후보 중 첫 번째)을 사용합니다.
+    반환: ({요약 항목: 값}, {표 이름: DataFrame})
+    """
+    sheet = workbook_cache.sheet_names(sales_path)[0]
+    columns = SalesColumns(read_profile(sales_path, sheet))
+    company_col, product_col, product_name_col, quantity_col = (
+        candidates[0] if candidates else None for candidates in (
+            columns.company_candidates, columns.product_candidates,
+            columns.product_name_candidates, columns.quantity_candidates,
+        )
+    )
+    if not (company_col and product_col and quantity_col):
+        return {'판매 데이터': f"{sales_path}: 업체/상품코드/판매 수량 컬럼을 찾지 못했습니다."}, {}
+    sales_df = workbook_cache.read_sheet(
+        sales_path, sheet, columns=columns.projection(company_col, product_col, product_name_col, quantity_col),
+    )
+
+    summary = {'판매 데이터 시트': sheet}
+    tables = {}
+    if columns.manufacturer_col and columns.payment_col:
+        tables['manufacturer_payments'] = manufacturer_payments(sales_df, columns.manufacturer_col, columns.payment_col)
+        date_col = columns.date_column(quantity_col)
+        if date_col is not None:
+            payments = monthly_payments(sales_df, columns.payment_col, date_col)
+            tables['monthly_payments'] = payments.drop(columns='년월_표시')
+            summary['월별 정산금액 분석'] = _highlight_summary(growth_highlights(payments))
+    products = product_sales(
+        sales_df, product_col, quantity_col, columns.code_sales_col,
+        company_mapping=product_company_mapping(sales_df, product_col, company_col),
+        product_mapping=product_name_mapping(sales_df, product_col, product_name_col),
+    )
+    tables['product_sales'] = products
+    summary['상품 수'] = len(products)
+    summary['판매 수량 TOP 10'] = products.head(10)['상품명' if '상품명' in products.columns else '상품코드'].tolist()
+    return summary, tables
+
+
+def build_report(weekly_path=WEEKLY_DATA_PATH, month=11, sales_path=SALES_DATA_PATH):
+    """month월 시트의 보고 지표와 표 {'summary': {...}, 'tables': {이름: DataFrame}}
+
+    sales_path가 없거나 파일이 없으면 상품 판매 분석은 건너뜁니다.
+    month월 시트가 없으면 MonthSheetNotFound(KeyError)를 발생시킵니다.
+    month월 시트만 적재합니다 (월별 매출 분석의 전월 대비 성장률도 같은 시트의 날짜별 행으로 계산).
+    """
+    sheets = month_sheets(workbook_cache.sheet_names(weekly_path))
+    if month not in sheets:
+        found = ', '.join(batch.month_label(found) for found in sheets) or '없음'
+        raise MonthSheetNotFound(f"{weekly_path}에 {batch.month_label(month)} 시트가 없습니다 (월별 시트: {found})")
+    months = batch.load_months(weekly_path, [sheets[month]])
+    sheet, state = months[month]
+    month_report = batch.month_reports(weekly_path, {month: months[month]})[0]
+
+    achievement = achievement_table(month_report.parts)
+    summary = {
+        '월': batch.month_label(month),
+        '시트': sheet,
+        '회의록 파일': weekly_path,
+        '목표 달성': achievement.set_index('파트')[['목표', '달성', '달성율']].to_dict('index'),
+        '핵심 지표': month_report.kpis,
+    }
+    tables = {'targets': achievement, 'kpis': pd.DataFrame([month_report.kpis])}
+    if month_report.platforms is not None:
+        platforms = month_report.platforms
+        if '매출총이익' in platforms.columns:
+            platforms = platforms.sort_values('매출총이익', ascending=False)
+        tables['platforms'] = platforms.reset_index()
+
+    # 월별 매출 분석 (시트 전체 행 기준, 날짜 컬럼이 있을 때)
+    amount_col = state.profile.column('amount')
+    if amount_col is not None and state.date_parts is not None:
+        frame = state.frame.assign(**{col: state.date_parts[col] for col in ('년', '월', '년월')})
+        sales = monthly_sales(frame, amount_col, state.profile.column('payment'))
+        tables['monthly_sales'] = sales.drop(columns='년월_표시')
+        summary['월별 매출 분석'] = _highlight_summary(growth_highlights(sales))
+
+    if sales_path and os.path.exists(sales_path):
+        sales_summary, sales_tables = _sales_report(sales_path)
+        summary.update(sales_summary)
+        tables.update(sales_tables)
+    return {'summary': summary, 'tables': tables}
+
+
+def _json_value(value):
+    """numpy 스칼라/Period 등 JSON 기본 타입이 아닌 값 변환"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _records(df):
+    """DataFrame → JSON 레코드 목록 (Period/카테고리 컬럼과 object 컬럼의 Period 값은 문자열)"""
+    df = df.copy()
+    for col in df.columns:
+        if isinstance(df[col].dtype, (pd.PeriodDtype, pd.CategoricalDtype)):
+            df[col] = df[col].astype(str)
+    return json.loads(df.to_json(orient='records', force_ascii=False, date_format='iso', default_handler=str))
+
+
+def write_report(result, output_dir, formats=DEFAULT_FORMATS, max_workers=None):
+    """build_report 결과 저장 (json: report.json 하나, csv: 표마다 <표 이름>.csv, pdf: report.pdf) → 저장한 파일 목록"""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    if 'json' in formats:
+        path = os.path.join(output_dir, 'report.json')
+        document = {
+            'summary': result['summary'],
+            'tables': {name: _records(table) for name, table in result['tables'].items()},
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, indent=2, default=_json_value)
+        paths.append(path)
+    if 'csv' in formats:
+        for name, table in result['tables'].items():
+            path = os.path.join(output_dir, f'{name}.csv')
+            with open(path, 'wb') as f:
+                exports.write_csv(table, f)
+            paths.append(path)
+    if 'pdf' in formats:
+        # matplotlib/reportlab은 PDF를 만들 때만 import (대시보드 시작 시간에 영향 없음)
+        from weekly_report import pdf
+        paths.append(pdf.write_pdf(result, os.path.join(output_dir, 'report.pdf'), max_workers))
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m weekly_report', description="주간 회의록 월말 보고 생성 (브라우저 없이 실행)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="월 보고 지표와 표를 JSON/CSV로 저장 (--format pdf: PDF 보고서)")
+    build.add_argument('--month', type=int, required=True, help="보고 월 (시트 이름의 'N월')")
+    build.add_argument('--input', default=WEEKLY_DATA_PATH, help=f"주간 회의록 파일 (기본값: {WEEKLY_DATA_PATH})")
+    build.add_argument('--sales', default=SALES_DATA_PATH, help="정산서 판매 데이터 파일 (없으면 상품 판매 분석 생략)")
+    build.add_argument('--output', default=OUTPUT_DIR, help=f"저장 폴더 (기본값: {OUTPUT_DIR}/<월>)")
+    build.add_argument('--format', nargs='+', choices=OUTPUT_FORMATS, default=list(DEFAULT_FORMATS),
+                       help="저장 형식 (기본값: json csv, pdf는 matplotlib/reportlab 필요)")
+    build.add_argument('--workers', type=int, default=None, help="PDF 차트 렌더링 프로세스 수 (기본값: CPU 코어 수)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        result = build_report(args.input, args.month, args.sales)
+    except MonthSheetNotFound as e:
+        print(e.args[0], file=sys.stderr)
+        return 1
+    output_dir = os.path.join(args.output, batch.month_label(args.month))
+    try:
+        paths = write_report(result, output_dir, args.format, args.workers)
+    except RuntimeError as e:
+        print(e.args[0], file=sys.stderr)
+        return 1
+    for path in paths:
+        print(path)
+    print(f"{batch.month_label(args.month)} 보고 생성 완료 ({time.perf_counter() - start:.1f}초)")
+    return 0
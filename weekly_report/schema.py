@@ -0,0 +1,94 @@
+"""
+시트 스키마와 화면별 사용 컬럼
+
+시트 데이터를 읽기 전에 컬럼명/타입(스키마)과 컬럼 프로파일만 보고 각 화면이 사용하는 컬럼을 정한 뒤,
+그 컬럼만 리더와 캐시에 넘겨 읽습니다 (weekly_report.cache.read_sheet의 columns).
+사이드카가 있으면 스키마는 Arrow 파일 헤더에서 바로 얻으므로 시트 전체를 읽지 않습니다.
+"""
+
+import pandas as pd
+
+# 판매 데이터(정산서) 위치 기준 컬럼
+MANUFACTURER_COLUMN_INDEX = 0  # A열 = 제조사
+PAYMENT_COLUMN_INDEX = 8  # I열 = 업체지급금액
+
+SALES_COMPANY_KEYWORDS = ['업체', 'company', '회사', '고객', 'customer', '제조사', 'manufacturer', 'maker']
+SALES_PRODUCT_KEYWORDS = ['상품', 'product', '코드', 'code', '상품코드']
+SALES_PRODUCT_NAME_KEYWORDS = ['상품명', 'product name', '품명', 'name', '제품명', '상품이름']
+SALES_QUANTITY_KEYWORDS = ['수량', 'quantity', '판매', 'sales', 'qty']
+SALES_PAYMENT_KEYWORDS = ['업체지급금액', '지급금액', '정산금액', 'payment']
+
+
+def _has_keyword(col, keywords):
+    return any(keyword in str(col).lower() for keyword in keywords)
+
+
+class SheetSchema:
+    """시트 컬럼명, 컬럼 타입, object 컬럼의 첫 번째 값 (날짜 컬럼 탐지용)"""
+
+    def __init__(self, dtypes, first_values):
+        self.dtypes = dtypes
+        self.columns = list(dtypes.index)
+        self.first_values = first_values
+
+    @classmethod
+    def from_frame(cls, df):
+        first_values = {}
+        for col in df.columns:
+            if df[col].dtype == 'object':
+                values = df[col].dropna()
+                first_values[col] = values.iloc[0] if len(values) > 0 else None
+        return cls(df.dtypes, first_values)
+
+    def column_at(self, index):
+        """위치 기준 컬럼명 (없으면 None)"""
+        return self.columns[index] if len(self.columns) > index else None
+
+    def find_columns(self, keywords):
+        """컬럼명에 키워드가 포함된 컬럼 목록"""
+        return [col for col in self.columns if _has_keyword(col, keywords)]
+
+    def date_columns(self, exclude=()):
+        """날짜 컬럼 목록 (datetime 컬럼 + 첫 값이 날짜로 변환되는 object 컬럼, 대시보드 기존 규칙과 동일)
+
+        exclude: 날짜 탐지 전에 숫자로 변환해서 쓰는 object 컬럼 (후보에서 제외)
+        """
+        columns = [col for col in self.columns if pd.api.types.is_datetime64_any_dtype(self.dtypes[col])]
+        for col in self.columns:
+            if self.dtypes[col] == 'object' and col not in exclude:
+                try:
+                    if pd.notna(pd.to_datetime(self.first_values.get(col), errors='coerce')):
+                        columns.append(col)
+                except Exception:
+                    pass
+        return columns
+
+
+class SalesColumns:
+    """판매 분석 화면이 사용하는 컬럼 (시트 컬럼 프로파일(weekly_report.profile)로 결정, 헤더만 사용)"""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.columns = profile.columns
+        # 선택 상자 후보
+        self.company_candidates = profile.candidates('sales_company')
+        self.product_candidates = profile.candidates('sales_product')
+        self.product_name_candidates = profile.candidates('sales_product_name')
+        self.quantity_candidates = profile.candidates('sales_quantity')
+        # 위치/이름으로 정해지는 컬럼 (I열이 없으면 업체지급금액 키워드)
+        self.manufacturer_col = profile.column('manufacturer')
+        self.payment_col = profile.column('sales_payment')
+        self.code_sales_col = profile.column('code_sales')
+
+    def date_column(self, quantity_col):
+        """월별 분석 날짜 컬럼 (수량/업체지급금액 컬럼은 날짜 탐지 전에 숫자로 변환되므로 후보에서 제외)"""
+        date_columns = self.profile.date_columns(exclude=(quantity_col, self.payment_col))
+        return date_columns[0] if date_columns else None
+
+    def projection(self, company_col, product_col, product_name_col, quantity_col):
+        """선택된 컬럼(업체/상품코드/상품명/수량)과 화면에서 쓰는 고정 컬럼 목록 (원본 순서, 빈 값 제외)"""
+        used = {
+            company_col, product_col, product_name_col, quantity_col,
+            self.manufacturer_col, self.payment_col, self.code_sales_col, self.date_column(quantity_col),
+        }
+        return [col for col in self.columns if col in used]
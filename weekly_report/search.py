@@ -0,0 +1,79 @@
+"""
+상세 데이터 검색용 역색인
+
+키 입력마다 DataFrame 전체를 문자열로 바꿔 정규식으로 훑는 대신,
+데이터 버전마다 한 번 셀 문자열의 글자 bigram(한글은 두 글자 단위) 역색인을 만들어 두고
+검색어의 bigram 목록에 모두 포함된 셀 값만 확인합니다.
+같은 값이 여러 행에 반복되는 경우가 많으므로 색인은 고유 셀 값 기준으로 만들고,
+셀 위치별 고유 값 번호 배열로 행을 찾습니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from weekly_report.cache import LRUCache
+
+# 데이터 버전 + 필터 상태별 검색 색인 캐시
+index_cache = LRUCache(max_entries=8)
+
+
+def _grams(text):
+    """검색 단위 (글자 bigram, 한 글자면 그 글자)"""
+    if len(text) < 2:
+        return {text}
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class SearchIndex:
+    """DataFrame 셀 값 부분 문자열 검색 색인
+
+    `df.astype(str)` 값에 대해 대소문자 구분 없이 검색어를 포함하는 셀이 있는 행을 찾습니다.
+    (기존 `str.contains(검색어, case=False)`와 같지만 검색어는 정규식이 아닌 일반 문자열로 취급)
+    """
+
+    def __init__(self, df, columns=None):
+        columns = list(df.columns) if columns is None else list(columns)
+        cells = df[columns].astype(str).to_numpy()
+        codes, values = pd.factorize(cells.ravel())
+        # 행 × 컬럼 위치별 고유 값 번호
+        self._codes = codes.reshape(cells.shape)
+        self._values = [str(value).lower() for value in values]
+
+        postings = {}
+        for value_id, value in enumerate(self._values):
+            for gram in _grams(value) | set(value):
+                postings.setdefault(gram, []).append(value_id)
+        self._postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()}
+
+    def matching_values(self, term):
+        """검색어를 포함하는 고유 셀 값 번호 목록"""
+        term = term.lower()
+        candidates = None
+        for gram in sorted(_grams(term), key=lambda gram: len(self._postings.get(gram, ()))):
+            ids = self._postings.get(gram)
+            if ids is None:
+                return []
+            candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+            if len(candidates) == 0:
+                return []
+        if len(term) <= 2:
+            # 검색어 자체가 색인 단위이므로 확인 불필요
+            return candidates
+        # bigram이 모두 포함되어도 순서가 다를 수 있으므로 실제 포함 여부 확인
+        return [value_id for value_id in candidates if term in self._values[value_id]]
+
+    def search(self, term):
+        """검색어를 포함하는 셀이 있는 행 번호(0부터, 위치 기준) 배열 (오름차순)
+
+        빈 검색어면 전체 행을 반환합니다. 결과는 `df.iloc[rows]`로 잘라서 사용합니다.
+        """
+        if not term:
+            return np.arange(len(self._codes))
+        matched = np.zeros(len(self._values), dtype=bool)
+        matched[self.matching_values(term)] = True
+        return np.flatnonzero(matched[self._codes].any(axis=1))
+
+
+def get_index(key, df, columns=None):
+    """데이터 버전/필터 상태 key 기준으로 캐시된 검색 색인 반환 (없으면 생성)"""
+    return index_cache.get_or_build(key, lambda: SearchIndex(df, columns))
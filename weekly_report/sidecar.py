@@ -0,0 +1,326 @@
+"""
+엑셀 원본 옆에 저장하는 Arrow IPC 사이드카
+
+엑셀 파일의 각 시트를 한 번만 파싱하여 `<원본파일명>.sidecar/` 폴더에
+Arrow IPC(Feather V2, 비압축) 파일로 저장합니다.
+사이드카가 원본 엑셀보다 최신이면 openpyxl 파싱 없이 바로 읽으며,
+비압축 Arrow 파일은 메모리 매핑(zero-copy)으로 열 수 있습니다.
+
+여러 프로세스/세션이 같은 워크북을 동시에 변환하지 않도록 변환 중에는 락 파일을 잡고,
+시트 파일은 원본 버전이 들어간 이름으로 저장한 뒤 manifest를 마지막에 기록합니다
+(읽는 쪽은 manifest가 가리키는 같은 버전의 시트 파일만 읽음).
+
+사용 예:
+    python -m weekly_report.sidecar 주간회의록.xlsx "2025 정산서 기준 판매 데이터.xlsx"
+"""
+
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from weekly_report import streaming
+from weekly_report.schema import SheetSchema
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow가 없으면 사이드카 없이 엑셀을 직접 파싱
+    pa = None
+
+SIDECAR_SUFFIX = '.sidecar'
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = 'ingest.lock'
+# 이보다 오래된 락 파일은 변환 중 비정상 종료로 남은 것으로 보고 제거 (초)
+LOCK_STALE_SECONDS = 600
+LOCK_POLL_SECONDS = 0.1
+
+
+def is_available():
+    """사이드카 사용 가능 여부 (pyarrow 설치 여부)"""
+    return pa is not None
+
+
+def sidecar_dir(path):
+    return os.fspath(path) + SIDECAR_SUFFIX
+
+
+def _load_manifest(path):
+    manifest_path = os.path.join(sidecar_dir(path), MANIFEST_NAME)
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _fresh_manifest(path):
+    """현재 엑셀 파일 기준으로 최신인 manifest (manifest가 가리키는 시트 파일이 모두 기록된 크기로 있어야 함, 아니면 None)"""
+    manifest = _load_manifest(path)
+    if manifest is None:
+        return None
+    stat = os.stat(path)
+    if manifest.get('source_mtime_ns') != stat.st_mtime_ns or manifest.get('source_size') != stat.st_size:
+        return None
+    out_dir = sidecar_dir(path)
+    for sheet in manifest.get('sheets', []):
+        try:
+            if os.path.getsize(os.path.join(out_dir, sheet['file'])) != sheet.get('bytes'):
+                return None
+        except (OSError, KeyError):
+            return None
+    return manifest
+
+
+def exists(path):
+    """사이드카 manifest가 있는지 (원본 엑셀보다 오래되었어도)"""
+    return _load_manifest(path) is not None
+
+
+def is_fresh(path):
+    """사이드카가 현재 엑셀 파일 기준으로 최신인지 확인"""
+    return _fresh_manifest(path) is not None
+
+
+@contextlib.contextmanager
+def file_lock(lock_path):
+    """락 파일 (다른 프로세스/스레드가 잡고 있으면 풀릴 때까지 대기, LOCK_STALE_SECONDS보다 오래된 락은 제거)"""
+    os.makedirs(os.path.dirname(lock_path) or '.', exist_ok=True)
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > LOCK_STALE_SECONDS:
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                # 기다리는 사이 락이 풀림
+                continue
+            time.sleep(LOCK_POLL_SECONDS)
+    try:
+        yield
+    finally:
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+
+def ingest_lock(path):
+    """사이드카 변환 락 (사이드카 폴더의 락 파일, 다른 프로세스/스레드가 변환 중이면 끝날 때까지 대기)
+
+    락을 잡은 뒤에는 is_fresh를 다시 확인해 먼저 끝난 변환 결과를 그대로 쓰도록 합니다.
+    """
+    return file_lock(os.path.join(sidecar_dir(path), LOCK_NAME))
+
+
+def _version_tag(stat):
+    """시트 파일 이름에 넣는 원본 버전 (수정시각 + 크기)"""
+    return f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+
+
+def _write_atomic(out_dir, file_name, write):
+    """out_dir에 고유한 임시 파일로 쓴 뒤 file_name으로 교체 (다른 쓰기와 임시 파일을 공유하지 않음)"""
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, prefix=file_name + '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, os.path.join(out_dir, file_name))
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def _to_arrow_table(df):
+    """DataFrame을 Arrow 테이블로 변환 (타입이 섞인 object 컬럼은 문자열로 통일)"""
+    df = df.copy(deep=False)
+    # Arrow 컬럼명은 문자열이어야 함
+    df.columns = [str(col) for col in df.columns]
+    for col in df.columns:
+        if df[col].dtype == 'object':
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # 예: 주문번호 컬럼에 숫자와 문자열이 섞여 있는 경우
+                df[col] = df[col].astype(str).where(df[col].notna())
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _iter_frames(path):
+    """시트별 (시트명, DataFrame)을 하나씩 읽음 (xlsx는 스트리밍 리더로 한 시트씩만 메모리에 유지)"""
+    if streaming.is_xlsx(path):
+        yield from streaming.iter_sheets(path)
+    else:
+        yield from pd.read_excel(path, sheet_name=None).items()
+
+
+def write_sheet(path, index, df, stat):
+    """시트 하나를 사이드카 Arrow 파일로 저장하고 manifest 항목 반환 (이름 제외)
+
+    stat: 변환을 시작할 때의 원본 파일 os.stat 결과 (파일 이름에 원본 버전을 넣어 이전 manifest의 파일을 덮어쓰지 않음)
+    """
+    out_dir = sidecar_dir(path)
+    os.makedirs(out_dir, exist_ok=True)
+    file_name = f'{index:03d}.{_version_tag(stat)}.arrow'
+    table = _to_arrow_table(df)
+
+    def write(tmp_path):
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    _write_atomic(out_dir, file_name, write)
+    return {
+        'file': file_name, 'rows': table.num_rows, 'bytes': os.path.getsize(os.path.join(out_dir, file_name)),
+        # 마지막 데이터 행의 엑셀 행 번호 (추가된 행만 읽을 때 경계, weekly_report.incremental)
+        'last_row': df.attrs.get(streaming.LAST_ROW_ATTR),
+    }
+
+
+def _remove_unused(out_dir, manifest):
+    """manifest에 없는 이전 버전 시트 파일/남은 임시 파일 삭제 (락을 잡은 상태에서 호출)
+
+    다른 프로세스가 메모리 매핑 중이라 지울 수 없는 파일(Windows)은 다음 변환 때 다시 시도합니다.
+    """
+    keep = {sheet['file'] for sheet in manifest['sheets']}
+    for name in os.listdir(out_dir):
+        if (name.endswith('.arrow') and name not in keep) or name.endswith('.tmp'):
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(out_dir, name))
+
+
+def write_manifest(path, stat, sheets):
+    """시트별 Arrow 파일을 모두 저장한 뒤 manifest 기록 (ingest_lock을 잡은 상태에서 호출)
+
+    stat: 변환을 시작할 때의 원본 파일 os.stat 결과
+    (manifest는 마지막에 기록하므로 중간에 실패하면 사이드카는 최신이 아닌 상태로 남음)
+    """
+    manifest = {
+        'source': os.path.basename(path),
+        'source_mtime_ns': stat.st_mtime_ns,
+        'source_size': stat.st_size,
+        'sheets': sheets,
+    }
+    out_dir = sidecar_dir(path)
+    missing = [sheet['file'] for sheet in sheets if not os.path.exists(os.path.join(out_dir, sheet['file']))]
+    if missing:
+        raise OSError(f"사이드카 시트 파일이 없습니다: {', '.join(missing)}")
+
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    _write_atomic(out_dir, MANIFEST_NAME, write)
+    _remove_unused(out_dir, manifest)
+    return manifest
+
+
+def convert(path, frames=None):
+    """엑셀 파일의 모든 시트를 차례로 사이드카로 변환 (ingest_lock을 잡은 상태에서 호출)"""
+    stat = os.stat(path)
+    frames = _iter_frames(path) if frames is None else frames.items()
+    sheets = [{'name': sheet, **write_sheet(path, i, df, stat)} for i, (sheet, df) in enumerate(frames)]
+    return write_manifest(path, stat, sheets)
+
+
+def ingest(path, frames=None):
+    """엑셀 파일의 모든 시트를 사이드카로 변환 (시트를 차례로 변환, 병렬 변환은 weekly_report.parallel)
+
+    frames: 이미 읽어둔 {시트명: DataFrame}이 있으면 다시 파싱하지 않고 사용
+    락을 기다리는 동안 다른 프로세스가 같은 버전을 변환했으면 그 manifest를 반환합니다.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow가 설치되어 있지 않아 사이드카를 만들 수 없습니다.")
+    with ingest_lock(path):
+        manifest = _fresh_manifest(path)
+        if manifest is not None:
+            return manifest
+        return convert(path, frames)
+
+
+def ensure(path):
+    """사이드카가 없거나 오래되었으면 새로 만들고 manifest를 반환"""
+    manifest = _fresh_manifest(path)
+    if manifest is not None:
+        return manifest
+    return ingest(path)
+
+
+def sheet_names(path):
+    """사이드카 기준 시트 목록"""
+    manifest = ensure(path)
+    return [sheet['name'] for sheet in manifest['sheets']]
+
+
+def read_table(path, sheet_name, columns=None):
+    """시트를 메모리 매핑된 Arrow 테이블로 읽기 (zero-copy)
+
+    columns: 읽을 컬럼 위치(int) 또는 컬럼명 목록 (None이면 전체)
+    """
+    return _read_entry(path, _sheet_entry(path, sheet_name), columns)
+
+
+def _sheet_entry(path, sheet_name):
+    for sheet in ensure(path)['sheets']:
+        if sheet['name'] == sheet_name:
+            return sheet
+    raise KeyError(f"시트를 찾을 수 없습니다: {sheet_name}")
+
+
+def _read_entry(path, sheet, columns=None):
+    source = pa.memory_map(os.path.join(sidecar_dir(path), sheet['file']), 'r')
+    table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        names = table.column_names
+        table = table.select([names[pos] for pos in streaming.resolve_columns(names, columns)])
+    return table
+
+
+def read_sheet(path, sheet_name, columns=None):
+    """시트를 DataFrame으로 읽기 (사이드카가 최신이 아니면 먼저 변환)
+
+    attrs[streaming.LAST_ROW_ATTR]: 마지막 데이터 행의 엑셀 행 번호 (변환할 때 기록, 없으면 None)
+    """
+    sheet = _sheet_entry(path, sheet_name)
+    df = _read_entry(path, sheet, columns).to_pandas()
+    df.attrs[streaming.LAST_ROW_ATTR] = sheet.get('last_row')
+    return df
+
+
+def read_schema(path, sheet_name):
+    """시트 스키마 (컬럼명/타입은 Arrow 헤더에서, object 컬럼은 첫 번째 값만 읽음)"""
+    table = read_table(path, sheet_name)
+    dtypes = table.schema.empty_table().to_pandas().dtypes
+    first_values = {}
+    for col in dtypes.index[dtypes == 'object']:
+        column = table.column(col).drop_null()
+        first_values[col] = column.slice(0, 1).to_pandas().iloc[0] if len(column) > 0 else None
+    return SheetSchema(dtypes, first_values)
+
+
+def main(argv=None):
+    from weekly_report import parallel
+
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print("사용법: python -m weekly_report.sidecar <엑셀 파일> [...]")
+        return 1
+    stale = [path for path in paths if not is_fresh(path)]
+    for path in paths:
+        if path not in stale:
+            print(f"{path}: 최신 상태")
+    # 여러 파일/시트는 프로세스 풀에서 동시에 변환
+    for path, manifest in parallel.ingest_workbooks(stale).items():
+        for sheet in manifest['sheets']:
+            print(f"{path} / {sheet['name']}: {sheet['rows']}행 변환")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+세션 간 공유 데이터 저장소
+
+적재한 시트(weekly_report.cache), 파생 컬럼/집계 큐브가 포함된 시트 상태(weekly_report.incremental),
+필터별 큐브(weekly_report.cube)는 프로세스 전역 캐시에 한 벌만 두고 모든 Streamlit 세션이 함께 읽습니다.
+세션은 이 데이터를 복사하지 않고 Copy-on-Write 얕은 복사본(cache.detach)으로 참조하며,
+세션마다 따로 들고 있는 것은 위젯의 필터 상태와 필터/컬럼 변환으로 새로 만든 배열뿐입니다.
+
+session_memory는 세션이 만든 DataFrame들의 메모리 중 공유 데이터와 같은 버퍼를 가리키는 부분을 빼고
+세션이 새로 할당한 바이트만 계산합니다 (object 컬럼은 포인터 배열 크기 기준).
+"""
+
+import numpy as np
+import pandas as pd
+
+from weekly_report import cache as workbook_cache
+from weekly_report import incremental
+from weekly_report.cube import AggregateCube, cube_cache
+
+# pandas 2.1부터 NumpyExtensionArray (그 전에는 PandasArray)
+_NumpyArray = getattr(pd.arrays, 'NumpyExtensionArray', None) or pd.arrays.PandasArray
+
+
+def shared_objects():
+    """프로세스 전역 캐시에 보관 중인 DataFrame/Series 목록"""
+    objects = []
+    for value in workbook_cache.default_cache.values():
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            objects.append(value)
+    for state in incremental.loaded_states():
+        objects += [state.frame, state.dates, state.date_parts, state.cube.table]
+    for cube in cube_cache.values():
+        if isinstance(cube, AggregateCube):
+            objects.append(cube.table)
+    return [obj for obj in objects if obj is not None]
+
+
+def select_rows(df, mask):
+    """mask가 True인 행만 남긴 DataFrame (모든 행이 해당되면 새로 만들지 않고 df를 그대로 반환)
+
+    필터 기본값(전체 선택)에서는 행 필터가 시트 전체를 복사하지 않도록 합니다.
+    """
+    if bool(mask.all()):
+        return df
+    return df[mask]
+
+
+def _ndarray_buffer(array):
+    return array.__array_interface__['data'][0], array.nbytes
+
+
+def _array_buffers(array):
+    """pandas 배열이 사용하는 메모리 블록 (시작 주소, 바이트 수) 목록"""
+    if isinstance(array, np.ndarray):
+        return [_ndarray_buffer(array)]
+    if isinstance(array, pd.Categorical):
+        return [_ndarray_buffer(array.codes)] + _array_buffers(array.categories.array)
+    if hasattr(array, 'asi8'):
+        # 날짜/기간 컬럼은 int64 배열
+        return [_ndarray_buffer(array.asi8)]
+    if isinstance(array, _NumpyArray):
+        return [_ndarray_buffer(array.to_numpy())]
+    if isinstance(array, pd.arrays.ArrowExtensionArray):
+        # Arrow 문자열 컬럼 (메모리 매핑된 사이드카에서 읽은 경우 포함)
+        buffers = []
+        for chunk in array.__arrow_array__().chunks:
+            buffers += [(buffer.address, buffer.size) for buffer in chunk.buffers() if buffer is not None]
+        return buffers
+    # 그 밖의 배열은 같은 객체일 때만 공유로 봄
+    return [(id(array), array.nbytes)]
+
+
+def _buffers(obj):
+    if isinstance(obj, pd.DataFrame):
+        return [buffer for _, series in obj.items() for buffer in _array_buffers(series.array)]
+    return _array_buffers(obj.array)
+
+
+class _BufferRanges:
+    """메모리 블록 목록 (주소 범위가 겹치면 합침)"""
+
+    def __init__(self, buffers):
+        merged = []
+        for start, size in sorted((start, size) for start, size in buffers if size > 0):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], start + size)
+            else:
+                merged.append([start, start + size])
+        self._starts = np.array([start for start, _ in merged], dtype=np.uint64)
+        self._ends = np.array([end for _, end in merged], dtype=np.uint64)
+
+    @property
+    def nbytes(self):
+        return int((self._ends - self._starts).sum())
+
+    def contains(self, start, size):
+        """[start, start + size) 전체가 목록의 한 블록 안에 있는지"""
+        i = np.searchsorted(self._starts, np.uint64(start), side='right') - 1
+        return i >= 0 and start + size <= int(self._ends[i])
+
+
+def session_memory(frames):
+    """세션 메모리 사용량 (바이트)
+
+    frames: 세션에서 사용 중인 DataFrame/Series 목록 (None은 무시)
+    반환: {'session': 세션이 새로 할당한 바이트, 'shared': 공유 데이터 전체 바이트}
+    같은 버퍼를 여러 DataFrame이 함께 쓰면 한 번만 셉니다.
+    """
+    shared = _BufferRanges(buffer for obj in shared_objects() for buffer in _buffers(obj))
+    owned = {}
+    for obj in frames:
+        if obj is None:
+            continue
+        for start, size in _buffers(obj):
+            if size > 0 and not shared.contains(start, size):
+                owned[start] = max(owned.get(start, 0), size)
+    return {'session': _BufferRanges(owned.items()).nbytes, 'shared': shared.nbytes}
@@ -0,0 +1,444 @@
+"""
+메모리 사용량을 제한하는 엑셀 시트 스트리밍 리더
+
+pandas.read_excel은 시트의 모든 셀을 파이썬 객체 목록으로 만든 뒤 DataFrame을 생성하므로
+파일이 클수록 최대 메모리 사용량이 커집니다.
+이 모듈은 openpyxl read-only 모드의 iter_rows로 행을 읽어
+chunk_rows 행마다 필요한 컬럼만 타입이 정해진 컬럼(Series) 묶음으로 변환하므로,
+파싱 중 파이썬 객체로 들고 있는 셀 수는 파일 크기가 아니라 chunk 크기에 비례합니다.
+
+읽은 DataFrame의 attrs[LAST_ROW_ATTR]에는 마지막 데이터 행의 엑셀 행 번호를 기록해 두고,
+행이 추가된 시트는 read_rows_from으로 그 행부터만 읽습니다 (weekly_report.incremental).
+"""
+
+import posixpath
+import re
+import zipfile
+from io import BytesIO
+from xml.etree import ElementTree
+
+import openpyxl
+import pandas as pd
+
+# 한 번에 변환하는 행 수
+CHUNK_ROWS = 2_000
+# 마지막 데이터 행의 엑셀 행 번호를 기록하는 DataFrame.attrs 키 (헤더가 1행)
+LAST_ROW_ATTR = 'last_row'
+# 시트 XML을 압축 해제하면서 행 경계를 찾는 단위 (바이트)
+XML_CHUNK_BYTES = 1 << 20
+
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_PACKAGE_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_DOCUMENT_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+# 시트 XML의 행 요소 시작 태그 (그룹 1: 네임스페이스 접두어)
+_ROW_TAG = re.compile(rb'<((?:[A-Za-z_][\w.-]*:)?)row[\s/>]')
+_ROW_NUMBER = re.compile(rb'\sr="(\d+)"')
+# 공유 문자열 셀의 값 (그룹 2: 공유 문자열 번호)
+_SHARED_STRING_CELL = re.compile(rb'(<(?:[A-Za-z_][\w.-]*:)?c\s[^>]*?\bt="s"[^>]*>\s*<(?:[A-Za-z_][\w.-]*:)?v>)(\d+)(<)')
+# 공유 문자열 표의 항목
+_SHARED_STRING = re.compile(rb'<((?:[A-Za-z_][\w.-]*:)?)si(?:\s[^>]*)?(?:/>|>.*?</\1si>)', re.DOTALL)
+# 워크북의 정의된 이름 목록 (셀 값을 읽는 데 필요 없음)
+_DEFINED_NAMES = re.compile(rb'<((?:[A-Za-z_][\w.-]*:)?)definedNames\b.*?</\1definedNames>', re.DOTALL)
+
+# pandas.read_excel이 빈 값(NaN)으로 처리하는 문자열 (pandas 기본 na_values)
+NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+
+
+def _convert_cell(value):
+    """pandas.read_excel과 같은 셀 값 변환 (정수인 실수는 int로, 빈 셀/빈 값 문자열은 NaN)"""
+    if value is None or (isinstance(value, str) and value in NA_VALUES):
+        return float('nan')
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def column_names(header):
+    """엑셀 헤더 행 값을 pandas.read_excel과 같은 컬럼명으로 변환
+
+    빈 헤더는 'Unnamed: 위치', 중복된 이름은 '이름.1', '이름.2'...
+    """
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f'Unnamed: {i}' if value is None else value
+        if isinstance(name, float) and name.is_integer():
+            name = int(name)
+        if name in seen:
+            base = name
+            while name in seen:
+                seen[base] += 1
+                name = f'{base}.{seen[base]}'
+        seen[name] = 0
+        names.append(name)
+    return names
+
+
+def resolve_columns(names, columns=None):
+    """읽을 컬럼 위치 목록 (columns: 컬럼 위치(int) 또는 컬럼명, None이면 전체)
+
+    원본 시트의 컬럼 순서를 유지하며, 시트에 없는 컬럼명/위치는 무시합니다.
+    """
+    if columns is None:
+        return list(range(len(names)))
+    wanted = set()
+    for column in columns:
+        if isinstance(column, int) and not isinstance(column, bool):
+            if 0 <= column < len(names):
+                wanted.add(column)
+        elif column in names:
+            wanted.add(names.index(column))
+    return sorted(wanted)
+
+
+def is_xlsx(source):
+    """openpyxl로 읽을 수 있는 xlsx(zip) 파일인지 확인 (xls 등은 pandas.read_excel 사용)"""
+    if isinstance(source, bytes):
+        return source[:4] == b'PK\x03\x04'
+    return zipfile.is_zipfile(source)
+
+
+def _open_workbook(source):
+    # 외부 링크는 셀 값 읽기에 필요 없으므로 로딩하지 않음
+    return openpyxl.load_workbook(source, read_only=True, data_only=True, keep_links=False)
+
+
+def _open_sheet(source, sheet_name):
+    wb = _open_workbook(source)
+    ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+    return wb, ws
+
+
+def sheet_names(source):
+    """워크북의 시트 목록 (셀은 읽지 않음, workbook.xml의 시트 목록만 읽고 공유 문자열 표는 읽지 않음)"""
+    with zipfile.ZipFile(source) as archive:
+        found = _workbook_parts(archive)
+        if found is not None:
+            workbook_xml = _DEFINED_NAMES.sub(b'', archive.read(found[0]))
+            return [sheet.get('name') for sheet in ElementTree.fromstring(workbook_xml).iter(f'{_MAIN_NS}sheet')]
+    wb = _open_workbook(source)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def read_header(source, sheet_name):
+    """시트의 컬럼명 목록 (첫 행만 읽음)"""
+    wb, ws = _open_sheet(source, sheet_name)
+    try:
+        header = next(ws.iter_rows(max_row=1, values_only=True), ())
+    finally:
+        wb.close()
+    return column_names(header)
+
+
+def _to_chunk(names, positions, rows, start, last_row):
+    chunk = pd.DataFrame({
+        names[pos]: [_convert_cell(row[pos] if pos < len(row) else None) for row in rows]
+        for pos in positions
+    })
+    chunk.index = pd.RangeIndex(start, start + len(chunk))
+    chunk.attrs[LAST_ROW_ATTR] = last_row
+    return chunk
+
+
+def _iter_worksheet_chunks(ws, columns, chunk_rows):
+    """chunk_rows 행씩 DataFrame (attrs[LAST_ROW_ATTR]: chunk 마지막 행의 엑셀 행 번호, 행이 없으면 None)"""
+    rows = ws.iter_rows(values_only=True)
+    names = column_names(next(rows, ()))
+    positions = resolve_columns(names, columns)
+    buffer = []
+    start = 0
+    last_row = None
+    # read-only 워크시트는 빠진 행도 빈 행으로 채워서 1행부터 차례로 돌려줌 (헤더가 1행)
+    for row_number, row in enumerate(rows, start=2):
+        if all(value is None for value in row):
+            continue
+        buffer.append(row)
+        last_row = row_number
+        if len(buffer) >= chunk_rows:
+            chunk = _to_chunk(names, positions, buffer, start, last_row)
+            start += len(chunk)
+            buffer = []
+            yield chunk
+    if buffer or start == 0:
+        yield _to_chunk(names, positions, buffer, start, last_row)
+
+
+def iter_chunks(source, sheet_name, columns=None, chunk_rows=CHUNK_ROWS):
+    """시트를 chunk_rows 행씩 DataFrame으로 읽기 (columns로 지정한 컬럼만)
+
+    첫 행은 헤더로 사용하고, 모든 셀이 빈 행은 건너뜁니다 (pandas.read_excel과 동일).
+    각 chunk의 인덱스는 시트 전체 기준 행 번호(0부터)입니다.
+    """
+    wb, ws = _open_sheet(source, sheet_name)
+    try:
+        yield from _iter_worksheet_chunks(ws, columns, chunk_rows)
+    finally:
+        wb.close()
+
+
+def _infer_numeric(series):
+    """숫자와 숫자 형태의 문자열만 섞인 object 컬럼은 숫자 컬럼으로 변환 (pandas.read_excel과 동일)"""
+    values = series.dropna()
+    kinds = set(map(type, values))
+    if str not in kinds or not kinds <= {str, int, float}:
+        return series
+    converted = pd.to_numeric(series, errors='coerce')
+    if converted.notna().sum() != len(values):
+        return series
+    return converted
+
+
+def _combine(parts):
+    """chunk별 Series를 하나로 합침
+
+    값이 모두 비어 있는 chunk는 타입 추론에서 빼고 나머지 chunk의 타입으로 맞추므로,
+    시트 전체를 한 번에 읽었을 때와 같은 타입이 됩니다 (예: 날짜 컬럼이 object가 되지 않음).
+    """
+    filled = [part for part in parts if part.notna().any()]
+    if len(filled) == len(parts) or len(filled) == 0:
+        combined = pd.concat(parts)
+    else:
+        dtype = pd.concat(filled).dtype
+        if pd.api.types.is_integer_dtype(dtype):
+            dtype = 'float64'
+        elif pd.api.types.is_bool_dtype(dtype):
+            dtype = 'object'
+        combined = pd.concat([part if part.notna().any() else part.astype(dtype) for part in parts]).astype(dtype)
+    if combined.dtype == object:
+        combined = _infer_numeric(combined)
+    return combined
+
+
+def _read_worksheet(ws, columns, chunk_rows):
+    parts = {}
+    names = None
+    last_row = None
+    for chunk in _iter_worksheet_chunks(ws, columns, chunk_rows):
+        names = list(chunk.columns)
+        last_row = chunk.attrs[LAST_ROW_ATTR] or last_row
+        for name in names:
+            parts.setdefault(name, []).append(chunk[name])
+    # 컬럼별로 합친 뒤 chunk 조각은 바로 버림
+    df = pd.DataFrame({name: _combine(parts.pop(name)) for name in names}, copy=False)
+    # 오른쪽 끝의 헤더와 값이 모두 빈 컬럼 제거 (pandas.read_excel과 동일)
+    while len(df.columns) > 0:
+        last = df.columns[-1]
+        if not (isinstance(last, str) and last.startswith('Unnamed: ') and df[last].isna().all()):
+            break
+        df = df.drop(columns=last)
+    df.attrs[LAST_ROW_ATTR] = last_row
+    return df
+
+
+def read_sheet(source, sheet_name, columns=None, chunk_rows=CHUNK_ROWS):
+    """시트를 DataFrame으로 읽기 (columns로 지정한 컬럼만, chunk 단위 변환)
+
+    columns가 None이면 `pd.read_excel(source, sheet_name=sheet_name)`과 같은 결과입니다.
+    attrs[LAST_ROW_ATTR]: 마지막 데이터 행의 엑셀 행 번호 (데이터 행이 없으면 None)
+    """
+    wb, ws = _open_sheet(source, sheet_name)
+    try:
+        return _read_worksheet(ws, columns, chunk_rows)
+    finally:
+        wb.close()
+
+
+def _workbook_parts(archive):
+    """워크북 zip의 (workbook.xml 경로, 관계 파일 경로, {관계 id: (관계 종류, 대상 경로)}) (찾지 못하면 None)"""
+    def relationships(name):
+        return ElementTree.fromstring(archive.read(name)).iter(f'{_PACKAGE_REL_NS}Relationship')
+
+    workbook = next(
+        (rel.get('Target') for rel in relationships('_rels/.rels') if rel.get('Type', '').endswith('/officeDocument')),
+        None,
+    )
+    if workbook is None:
+        return None
+    workbook = workbook.lstrip('/')
+    folder, file_name = posixpath.split(workbook)
+    rels_name = posixpath.join(folder, '_rels', file_name + '.rels')
+    parts = {}
+    for rel in relationships(rels_name):
+        target = rel.get('Target', '')
+        target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(folder, target))
+        parts[rel.get('Id')] = (rel.get('Type', '').rsplit('/', 1)[-1], target)
+    return workbook, rels_name, parts
+
+
+def _sheet_member(workbook_xml, parts, sheet_name):
+    """워크북 zip 안의 시트 XML 경로 (workbook.xml의 시트 → 관계 파일의 대상, 찾지 못하면 None)"""
+    sheets = list(ElementTree.fromstring(workbook_xml).iter(f'{_MAIN_NS}sheet'))
+    if isinstance(sheet_name, int):
+        sheets = sheets[sheet_name:sheet_name + 1]
+    else:
+        sheets = [sheet for sheet in sheets if sheet.get('name') == sheet_name]
+    part = parts.get(sheets[0].get(f'{_DOCUMENT_REL_NS}id')) if sheets else None
+    return part[1] if part is not None else None
+
+
+def _read_until(stream, buffer, pattern, start=0):
+    """buffer[start:]에서 pattern을 찾을 때까지 stream을 이어 읽음 → (match, buffer), 끝까지 없으면 (None, buffer)"""
+    while True:
+        match = pattern.search(buffer, start)
+        if match is not None:
+            return match, buffer
+        chunk = stream.read(XML_CHUNK_BYTES)
+        if not chunk:
+            return None, buffer
+        buffer += chunk
+
+
+def _trim_sheet_xml(stream, first_row):
+    """시트 XML에서 헤더 행(1행)과 first_row행부터의 행만 남긴 XML (first_row행 요소가 없으면 None)
+
+    그 사이의 행은 XML로 파싱하지 않고 압축을 풀면서 first_row행의 시작 태그만 바이트 검색으로 찾습니다.
+    """
+    match, buffer = _read_until(stream, b'', _ROW_TAG)
+    if match is None:
+        return None
+    prefix = match.group(1)
+    head = buffer[:match.start()]
+    buffer = buffer[match.start():]
+    tag_end, buffer = _read_until(stream, buffer, re.compile(rb'>'))
+    if tag_end is None:
+        return None
+    number = _ROW_NUMBER.search(buffer, 0, tag_end.start())
+    if number is None:
+        # 행 번호가 없는 시트는 행 위치를 알 수 없음
+        return None
+    if int(number.group(1)) == 1:
+        # 헤더 행 요소 전체를 남김
+        if buffer[tag_end.start() - 1:tag_end.start()] == b'/':
+            header_end = tag_end.end()
+        else:
+            row_end, buffer = _read_until(stream, buffer, re.compile(b'</' + re.escape(prefix) + b'row>'))
+            if row_end is None:
+                return None
+            header_end = row_end.end()
+        head += buffer[:header_end]
+        buffer = buffer[header_end:]
+
+    boundary = re.compile(b'<' + re.escape(prefix) + rb'row\s[^>]*?\br="%d"' % first_row)
+    while True:
+        match = boundary.search(buffer)
+        if match is not None:
+            break
+        chunk = stream.read(XML_CHUNK_BYTES)
+        if not chunk:
+            return None
+        # 지나간 행은 버리되, 중간에 잘린 시작 태그는 다음 조각과 이어서 찾도록 마지막 '<'부터 남김
+        keep = buffer.rfind(b'<')
+        buffer = (buffer[keep:] if keep >= 0 else b'') + chunk
+    return head + buffer[match.start():] + stream.read()
+
+
+def _keep_shared_strings(sheet_xml, strings_xml):
+    """sheet_xml이 참조하는 공유 문자열만 남긴 (sheet_xml, strings_xml) (공유 문자열 번호는 새로 매김, 번호가 없으면 None)
+
+    openpyxl은 워크북을 열 때 공유 문자열 표 전체를 읽으므로, 남긴 행이 쓰는 문자열만 남겨 읽는 양을 줄입니다.
+    """
+    items = list(_SHARED_STRING.finditer(strings_xml))
+    renumbered = {}
+
+    def renumber(match):
+        index = int(match.group(2))
+        if index >= len(items):
+            raise IndexError(index)
+        new_index = renumbered.setdefault(index, len(renumbered))
+        return match.group(1) + str(new_index).encode('ascii') + match.group(3)
+
+    try:
+        sheet_xml = _SHARED_STRING_CELL.sub(renumber, sheet_xml)
+    except IndexError:
+        return None
+    head = strings_xml[:items[0].start()] if items else strings_xml[:strings_xml.rfind(b'</')]
+    tail = strings_xml[items[-1].end():] if items else strings_xml[strings_xml.rfind(b'</'):]
+    return sheet_xml, head + b''.join(items[index].group(0) for index in renumbered) + tail
+
+
+def _trimmed_workbook(source, sheet_name, first_row):
+    """시트를 _trim_sheet_xml로 줄인 xlsx 파일 내용 (시트를 찾지 못하면 None)
+
+    값을 읽는 데 필요한 부분(워크북/스타일/테마/공유 문자열)만 남기고, 다른 시트와 외부 링크는 빼며
+    워크북의 정의된 이름과 남긴 행이 쓰지 않는 공유 문자열도 뺍니다.
+    """
+    with zipfile.ZipFile(source) as archive:
+        found = _workbook_parts(archive)
+        if found is None:
+            return None
+        workbook, rels_name, parts = found
+        workbook_xml = _DEFINED_NAMES.sub(b'', archive.read(workbook))
+        member = _sheet_member(workbook_xml, parts, sheet_name)
+        names = set(archive.namelist())
+        if member is None or member not in names:
+            return None
+        with archive.open(member) as stream:
+            sheet_xml = _trim_sheet_xml(stream, first_row)
+        if sheet_xml is None:
+            return None
+
+        members = {
+            '[Content_Types].xml': archive.read('[Content_Types].xml'),
+            '_rels/.rels': archive.read('_rels/.rels'),
+            rels_name: archive.read(rels_name),
+            workbook: workbook_xml,
+        }
+        for kind, target in parts.values():
+            if kind in ('styles', 'theme') and target in names:
+                members[target] = archive.read(target)
+            elif kind == 'sharedStrings' and target in names:
+                kept = _keep_shared_strings(sheet_xml, archive.read(target))
+                if kept is None:
+                    return None
+                sheet_xml, members[target] = kept
+        members[member] = sheet_xml
+
+    output = BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_STORED) as trimmed:
+        for name, data in members.items():
+            trimmed.writestr(name, data)
+    return output.getvalue()
+
+
+def read_rows_from(source, sheet_name, first_row):
+    """시트의 엑셀 행 번호 first_row부터 데이터 행 값 목록 읽기 (read_sheet와 같은 셀 값 변환, 모든 셀이 빈 행은 건너뜀)
+
+    시트 XML에서 헤더 행과 first_row행부터만 남긴 워크북을 메모리에 만들어 읽으므로,
+    앞의 행은 압축만 풀고 파싱하지 않으며 다른 시트는 읽지 않습니다.
+    반환: (컬럼명 목록, 행 목록, 행별 엑셀 행 번호) - 오른쪽 끝의 빈 컬럼도 그대로 포함,
+    first_row행이 시트에 없거나 행 번호가 없는 시트면 None
+    """
+    data = _trimmed_workbook(source, sheet_name, first_row)
+    if data is None:
+        return None
+    wb, ws = _open_sheet(BytesIO(data), sheet_name)
+    try:
+        rows = ws.iter_rows(values_only=True)
+        names = column_names(next(rows, ()))
+        values = []
+        row_numbers = []
+        # 헤더와 first_row 사이의 빠진 행은 read-only 워크시트가 빈 행으로 채움
+        for row_number, row in enumerate(rows, start=2):
+            if row_number < first_row or all(value is None for value in row):
+                continue
+            values.append([_convert_cell(row[pos] if pos < len(row) else None) for pos in range(len(names))])
+            row_numbers.append(row_number)
+    finally:
+        wb.close()
+    return names, values, row_numbers
+
+
+def iter_sheets(source, chunk_rows=CHUNK_ROWS):
+    """워크북의 모든 시트를 (시트명, DataFrame)으로 하나씩 읽기 (워크북은 한 번만 열고, 한 시트씩 메모리에 유지)"""
+    wb = _open_workbook(source)
+    try:
+        for ws in wb.worksheets:
+            yield ws.title, _read_worksheet(ws, None, chunk_rows)
+    finally:
+        wb.close()
@@ -0,0 +1,182 @@
+"""
+서버 시작 시 캐시 미리 채우기
+
+월요일 아침 첫 접속자가 엑셀 파싱/집계를 기다리지 않도록, 대시보드가 처음 여는 화면에 필요한 데이터를
+첫 요청 전에 프로세스 전역 캐시에 적재해 둡니다.
+- 주간 회의록 기본 시트(11월, 없으면 12월 시트): 시트 + 파트/날짜 파생 컬럼 + 컬럼 프로파일 + 집계 큐브
+- 정산서 판매 데이터 첫 시트: 컬럼 프로파일 + 기본 선택 컬럼으로 잘라 읽은 시트
+- 두 파일의 Arrow 사이드카 (weekly_report.parallel, 파일 버전마다 한 번만 변환: ensure_sidecars,
+  대시보드 재실행 중 파일이 바뀌면 기존 사이드카는 백그라운드에서 갱신)
+
+Streamlit에는 서버 시작 훅이 없으므로, --serve로 실행하면 백그라운드 스레드에서 적재를 시작한 뒤
+같은 프로세스에서 Streamlit 서버를 띄웁니다 (대시보드는 같은 모듈 캐시를 그대로 사용).
+--serve 없이 실행하면 현재 프로세스에서 적재만 하고 단계별 시간을 출력합니다
+(사이드카와 컬럼 프로파일은 파일로 남으므로 워크북을 갱신한 뒤 미리 실행해 두면 다음 서버 시작이 빨라짐).
+
+사용 예:
+    python -m weekly_report.warmup --serve [dashboard_prototype.py] [Streamlit 옵션 ...]
+    python -m weekly_report.warmup
+"""
+
+import os
+import sys
+import threading
+import time
+
+from weekly_report import cache as workbook_cache
+from weekly_report import incremental, parallel, sidecar
+from weekly_report.cache import LRUCache
+from weekly_report.prepare import default_sheet
+from weekly_report.profile import read_profile
+from weekly_report.schema import SalesColumns
+
+WEEKLY_DATA_PATH = '주간회의록.xlsx'
+SALES_DATA_PATH = '2025 정산서 기준 판매 데이터.xlsx'
+DASHBOARD_SCRIPT = 'dashboard_prototype.py'
+
+_lock = threading.Lock()
+# 백그라운드 적재 스레드 (프로세스당 한 번만 시작)
+_thread = None
+# 마지막 적재 결과 {'steps': [(단계, 초)], 'error': 예외 또는 None}
+status = {'steps': [], 'error': None}
+# 사이드카 변환을 마친 파일 버전 ((경로, 수정시각, 크기), ...) → 변환 결과
+_prepared = LRUCache(max_entries=8)
+# 여러 세션이 같은 파일을 동시에 변환하지 않도록 변환은 한 번에 하나씩
+_prepare_lock = threading.Lock()
+# 백그라운드에서 사이드카를 갱신 중인 하위 프로세스 ((경로, 수정시각, 크기), ...) → subprocess.Popen
+_background = LRUCache(max_entries=8)
+
+
+def _first(candidates):
+    return candidates[0] if candidates else None
+
+
+def _file_version(path):
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def ensure_sidecars(paths, background=False):
+    """파일들의 사이드카를 하위 프로세스에서 병렬 변환 (파일 버전마다 한 번만, 이후 호출은 stat만 확인)
+
+    대시보드는 재실행마다 호출하지만 파일이 바뀌지 않았으면 하위 프로세스를 만들지 않습니다
+    (parallel.prepare_sidecars: 작업 프로세스가 대시보드 스크립트를 다시 실행하지 않도록 하위 프로세스에서 변환).
+    background=True면 이전 버전의 사이드카가 있는 파일은 변환을 시작만 하고 기다리지 않습니다.
+    행만 추가된 시트는 incremental이 추가된 행만 읽으므로, 재실행이 워크북 전체 변환을 기다리지 않습니다.
+    """
+    paths = [path for path in dict.fromkeys(paths) if path and os.path.exists(path)]
+    if not paths:
+        return {}
+    key = (tuple(_file_version(path) for path in paths), background)
+    prepared = _prepared.get(key)
+    if prepared is not None:
+        return prepared
+    with _prepare_lock:
+        return _prepared.get_or_build(key, lambda: _prepare(paths, background))
+
+
+def _prepare(paths, background):
+    if background:
+        pending = [path for path in paths if sidecar.exists(path) and not sidecar.is_fresh(path)]
+        if pending:
+            _background.put(tuple(_file_version(path) for path in pending), parallel.start_sidecars(pending))
+            paths = [path for path in paths if path not in pending]
+    return parallel.prepare_sidecars(paths)
+
+
+def warm_weekly(path=WEEKLY_DATA_PATH):
+    """주간 회의록 기본 시트 적재 (대시보드가 처음 선택하는 시트, 없으면 첫 시트)"""
+    sheet_names = workbook_cache.sheet_names(path)
+    sheet = default_sheet(sheet_names) or sheet_names[0]
+    state = incremental.ingest_sheet(path, sheet)
+    # 데이터 요약에 표시하는 컬럼별 메모리 사용량도 미리 계산
+    state.memory_report
+    return sheet
+
+
+def warm_sales(path=SALES_DATA_PATH):
+    """정산서 첫 시트를 대시보드 기본 선택 컬럼(각 후보의 첫 번째)으로 읽어 캐시"""
+    sheet = workbook_cache.sheet_names(path)[0]
+    columns = SalesColumns(read_profile(path, sheet))
+    company_col = _first(columns.company_candidates)
+    product_col = _first(columns.product_candidates)
+    quantity_col = _first(columns.quantity_candidates)
+    if company_col and product_col and quantity_col:
+        product_name_col = _first(columns.product_name_candidates)
+        workbook_cache.read_sheet(path, sheet, columns=columns.projection(company_col, product_col, product_name_col, quantity_col))
+    return sheet
+
+
+def warm(weekly_path=WEEKLY_DATA_PATH, sales_path=SALES_DATA_PATH):
+    """사이드카 → 주간 회의록 기본 시트 → 정산서 순서로 적재하고 단계별 (이름, 소요 시간) 목록 반환
+
+    파일이 없는 경로는 건너뜁니다.
+    """
+    paths = [path for path in (weekly_path, sales_path) if path and os.path.exists(path)]
+    steps = []
+
+    def timed(name, func, *args):
+        start = time.perf_counter()
+        func(*args)
+        steps.append((name, time.perf_counter() - start))
+
+    timed('사이드카', ensure_sidecars, paths)
+    if weekly_path in paths:
+        timed('주간 회의록 기본 시트', warm_weekly, weekly_path)
+    if sales_path in paths:
+        timed('정산서', warm_sales, sales_path)
+    return steps
+
+
+def _run(weekly_path, sales_path):
+    try:
+        status['steps'] = warm(weekly_path, sales_path)
+    except Exception as e:
+        # 미리 적재하지 못해도 대시보드는 요청 시 직접 적재하므로 오류만 기록
+        status['error'] = e
+        print(f"캐시 미리 적재 실패: {e}", file=sys.stderr)
+
+
+def start(weekly_path=WEEKLY_DATA_PATH, sales_path=SALES_DATA_PATH):
+    """백그라운드 스레드에서 warm 시작 (이미 시작했으면 그 스레드를 반환)"""
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, args=(weekly_path, sales_path), name='weekly-report-warmup', daemon=True)
+            _thread.start()
+        return _thread
+
+
+def wait(timeout=None):
+    """백그라운드 적재가 진행 중이면 끝날 때까지 대기 (시작하지 않았으면 바로 반환)
+
+    대시보드가 적재 중인 시트를 동시에 다시 파싱하지 않도록 첫 요청에서 호출합니다.
+    """
+    with _lock:
+        thread = _thread
+    if thread is not None:
+        thread.join(timeout)
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    if args and args[0] == '--serve':
+        from streamlit.web import cli as streamlit_cli
+
+        script = args[1] if len(args) > 1 and args[1].endswith('.py') else DASHBOARD_SCRIPT
+        options = args[2:] if script in args[1:2] else args[1:]
+        start()
+        return streamlit_cli.main(['run', script, *options], prog_name='streamlit')
+    if args:
+        print("사용법: python -m weekly_report.warmup [--serve [대시보드 스크립트] [Streamlit 옵션 ...]]")
+        return 1
+    for name, elapsed in warm():
+        print(f"{name:<16} {elapsed:6.2f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    # `python -m`으로 실행하면 이 파일은 __main__ 모듈이므로, 대시보드가 import하는
+    # weekly_report.warmup 모듈의 스레드 상태를 쓰도록 그 모듈의 main을 실행
+    from weekly_report.warmup import main as package_main
+    sys.exit(package_main())